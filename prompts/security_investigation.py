@@ -94,6 +94,8 @@ CommonSecurityLog
 | sort by ConnectionCount desc
 ```
 
+Tip: these queries are independent, so you can run them together in a single `sentinel_logs_search_batch` call (one named query each) instead of one `sentinel_logs_search` call at a time.
+
 Let me know if you need any more specific queries or if you want to dive deeper into any of these areas.
 """
             ),
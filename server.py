@@ -19,9 +19,10 @@ import sys
 import signal
 import asyncio
 import tempfile
+import threading
 from contextlib import asynccontextmanager
 from collections.abc import AsyncIterator
-from dataclasses import dataclass
+from dataclasses import dataclass, field
 from typing import Optional, Dict, Any
 from azure.identity import DefaultAzureCredential
 from azure.monitor.query import LogsQueryClient, MetricsQueryClient
@@ -29,6 +30,18 @@ from azure.mgmt.securityinsight import SecurityInsights
 from azure.mgmt.loganalytics import LogAnalyticsManagementClient
 from mcp.server.fastmcp import FastMCP
 from utilities.path_utils import find_file
+from utilities.cache import cache_manager
+from utilities.client_registry import (
+    CLIENT_LOGANALYTICS,
+    CLIENT_LOGS,
+    CLIENT_METRICS,
+    CLIENT_SECURITYINSIGHT,
+    client_registry,
+)
+from utilities.executors import executors
+from utilities.http_session import async_http_session, http_session
+from utilities.rate_limiter import rate_limiters
+from utilities.workspaces import parse_workspaces
 
 # Import and configure logging FIRST
 from utilities.logging import get_server_logger
@@ -38,6 +51,10 @@ log_dir = tempfile.gettempdir()
 log_file = os.path.join(log_dir, "sentinel_mcp_server.log")
 logger = get_server_logger(log_file=log_file)
 
+# Sessions whose lifespan is currently running (one per SSE connection)
+_active_sessions = 0
+_sessions_lock = threading.Lock()
+
 
 @dataclass
 class AzureServicesContext:
@@ -53,6 +70,8 @@ class AzureServicesContext:
     subscription_id: str
     resource_group: str
     config: Dict[str, Any]
+    # Queryable workspaces (alias -> workspace ID), primary first
+    workspaces: Dict[str, str] = field(default_factory=dict)
 
 
 @asynccontextmanager
@@ -72,6 +91,12 @@ async def azure_services_lifespan(
         "tenant_id": os.environ.get("AZURE_TENANT_ID", ""),
         "workspace_name": os.environ.get("AZURE_WORKSPACE_NAME", ""),
     }
+    # Optional additional workspaces for fan-out queries
+    workspaces = parse_workspaces(
+        config["workspace_id"],
+        config["workspace_name"],
+        os.environ.get("AZURE_WORKSPACE_IDS", ""),
+    )
 
     # Log non-secret Azure environment variables on server startup
     logger.info("AZURE_TENANT_ID: %s", os.environ.get("AZURE_TENANT_ID", ""))
@@ -82,6 +107,7 @@ async def azure_services_lifespan(
     logger.info("AZURE_RESOURCE_GROUP: %s", os.environ.get("AZURE_RESOURCE_GROUP", ""))
     logger.info("AZURE_WORKSPACE_NAME: %s", os.environ.get("AZURE_WORKSPACE_NAME", ""))
     logger.info("AZURE_WORKSPACE_ID: %s", os.environ.get("AZURE_WORKSPACE_ID", ""))
+    logger.info("Queryable workspaces: %s", ", ".join(workspaces) or "none")
     # Only log presence of secret, not its value
     logger.info(
         "AZURE_CLIENT_SECRET set: %s",
@@ -94,23 +120,22 @@ async def azure_services_lifespan(
         logger.warning("Missing environment variables: %s", ", ".join(missing_vars))
         logger.warning("Some functionality may be limited.")
 
+    _session_started()
     try:
-        # Create the credential once and reuse it
-        credential = DefaultAzureCredential()
-
-        # Create the Azure Monitor clients
-        logs_client = LogsQueryClient(credential)
-        metrics_client = MetricsQueryClient(credential)
-
-        # Create the Security Insights client
-        security_insights_client = SecurityInsights(
-            credential=credential, subscription_id=config["subscription_id"]
+        # The credential and clients come from the process-wide registry, so
+        # concurrent sessions share them and none of them closes them on exit.
+        # Every SDK client uses the shared throttling-aware retry policy.
+        credential = client_registry.get_credential()
+        logs_client = client_registry.get_client(CLIENT_LOGS)
+        metrics_client = client_registry.get_client(CLIENT_METRICS)
+        security_insights_client = client_registry.get_client(
+            CLIENT_SECURITYINSIGHT, config["subscription_id"]
         )
 
         # Create the Log Analytics Management client if available
         try:
-            loganalytics_client = LogAnalyticsManagementClient(
-                credential=credential, subscription_id=config["subscription_id"]
+            loganalytics_client = client_registry.get_client(
+                CLIENT_LOGANALYTICS, config["subscription_id"]
             )
             logger.info("Successfully initialized Log Analytics Management client")
         except ImportError:
@@ -122,8 +147,7 @@ async def azure_services_lifespan(
             logger.error(msg, e)
             loganalytics_client = None
 
-        # Yield the context with all necessary clients
-        yield AzureServicesContext(
+        services_ctx = AzureServicesContext(
             credential=credential,
             logs_client=logs_client,
             metrics_client=metrics_client,
@@ -134,7 +158,11 @@ async def azure_services_lifespan(
             subscription_id=config["subscription_id"],
             resource_group=config["resource_group"],
             config=config,
+            workspaces=workspaces,
         )
+
+        # Yield the context with all necessary clients
+        yield services_ctx
     except Exception as e:
         logger.error("Failed to initialize Azure services: %s", e)
         logger.info("Creating minimal context with empty clients")
@@ -151,20 +179,65 @@ async def azure_services_lifespan(
             subscription_id=config["subscription_id"],
             resource_group=config["resource_group"],
             config=config,
+            workspaces=workspaces,
         )
     finally:
-        # Cleanup on shutdown
-        logger.info("Shutting down Azure service clients...")
+        # Under SSE the lifespan runs once per connection; the shared clients,
+        # pools and executors are only torn down when the last session ends.
+        if _session_ended():
+            await _shutdown_shared_resources()
 
-        # Clean up any running tasks
-        try:
-            # Import here to avoid import errors if not found
-            # pylint: disable=import-outside-toplevel
-            from utilities.task_manager import cleanup_tasks
 
-            await cleanup_tasks()
-        except Exception as e:
-            logger.error("Error during task cleanup: %s", e)
+def _session_started() -> None:
+    """Count a session whose lifespan has started."""
+    global _active_sessions  # pylint: disable=global-statement
+    with _sessions_lock:
+        _active_sessions += 1
+
+
+def _session_ended() -> bool:
+    """Count a finished session; return True if it was the last active one."""
+    global _active_sessions  # pylint: disable=global-statement
+    with _sessions_lock:
+        _active_sessions -= 1
+        return _active_sessions == 0
+
+
+async def _shutdown_shared_resources() -> None:
+    """Release the process-wide clients, pools, executors and disk cache."""
+    logger.info("Shutting down Azure service clients...")
+
+    # Clean up any running tasks
+    try:
+        # Import here to avoid import errors if not found
+        # pylint: disable=import-outside-toplevel
+        from utilities.task_manager import cleanup_tasks
+
+        await cleanup_tasks()
+    except Exception as e:
+        logger.error("Error during task cleanup: %s", e)
+
+    # Drop queued blocking work before the clients it would use are closed
+    logger.info("Executor usage: %s", executors.stats())
+    executors.shutdown()
+
+    # Release shared SDK clients and their connection pools
+    try:
+        client_registry.close()
+    except Exception as e:
+        logger.error("Error closing Azure clients: %s", e)
+
+    # Close the pooled REST session after reporting how it was used
+    try:
+        logger.info("HTTP pool usage: %s", http_session.stats())
+        http_session.close()
+        logger.info("Async HTTP pool usage: %s", async_http_session.stats())
+        await async_http_session.aclose()
+    except Exception as e:
+        logger.error("Error closing HTTP session: %s", e)
+    logger.info("Rate limiter usage: %s", rate_limiters.stats())
+    logger.info("Cache usage: %s", cache_manager.stats())
+    cache_manager.close()
 
 
 def load_instructions() -> str:
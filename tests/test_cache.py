@@ -0,0 +1,211 @@
+"""Tests for utilities/cache.py."""
+
+import asyncio
+
+import httpx
+import pytest
+
+import utilities.cache as cache_module
+from tools.table_tools import _classify_schema, _classify_tables
+from utilities.cache import (
+    REGION_TABLES,
+    RESULT_ERROR,
+    RESULT_NOT_FOUND,
+    RESULT_OK,
+    RESULT_RETRYABLE,
+    CacheManager,
+    is_transient_error,
+)
+
+
+class FakeClock:
+    """Stands in for the time module so entries can be aged at will."""
+
+    def __init__(self):
+        self.now = 1000.0
+
+    def monotonic(self):
+        return self.now
+
+    def time(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    fake = FakeClock()
+    monkeypatch.setattr(cache_module, "time", fake)
+    return fake
+
+
+@pytest.fixture
+def region(monkeypatch, clock):
+    monkeypatch.delenv("MCP_DISK_CACHE", raising=False)
+    return CacheManager().region(REGION_TABLES, ttl=60)
+
+
+def test_category_ttls(region, clock):
+    region.set("ok", "value")
+    region.set("missing", "nothing here", category=RESULT_NOT_FOUND)
+    region.set("failed", "boom", category=RESULT_ERROR)
+    assert not region.set("throttled", "429", category=RESULT_RETRYABLE)
+
+    clock.now += region.error_ttl + 1
+    assert region.get("failed") is None
+    assert region.get("ok") == "value"
+    clock.now += 60
+    assert region.get("ok") is None
+    assert region.get("missing") == "nothing here"
+    clock.now += region.not_found_ttl
+    assert region.get("missing") is None
+    assert region.get("throttled") is None
+
+    stats = region.stats()
+    assert stats["negative_stores"] == 2
+    assert stats["retryable_skips"] == 1
+
+
+def test_unknown_category_is_rejected(region):
+    with pytest.raises(ValueError):
+        region.set("key", "value", category="maybe")
+
+
+def test_transient_errors():
+    request = httpx.Request("GET", "https://management.azure.com/")
+    throttled = httpx.HTTPStatusError(
+        "throttled", request=request, response=httpx.Response(429, request=request)
+    )
+    forbidden = httpx.HTTPStatusError(
+        "forbidden", request=request, response=httpx.Response(403, request=request)
+    )
+    assert is_transient_error(throttled)
+    assert is_transient_error(asyncio.TimeoutError())
+    assert not is_transient_error(forbidden)
+    assert not is_transient_error(ValueError("bad"))
+
+
+@pytest.mark.asyncio
+async def test_transient_loader_failures_are_not_cached(region):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        raise asyncio.TimeoutError()
+
+    def on_error(error):
+        return {"error": "timed out"}
+
+    for _ in range(2):
+        assert await region.get_or_load("key", loader, on_error=on_error) == {
+            "error": "timed out"
+        }
+    assert len(calls) == 2
+
+
+@pytest.mark.asyncio
+async def test_classified_failures_are_cached_briefly(region, clock):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        return {"error": "Failed to list tables"}
+
+    for _ in range(2):
+        await region.get_or_load("key", loader, classify=_classify_tables)
+    assert len(calls) == 1
+    clock.now += region.error_ttl + 1
+    await region.get_or_load("key", loader, classify=_classify_tables)
+    assert len(calls) == 2
+
+
+def test_table_list_classification():
+    assert _classify_tables({"found": 2, "tables": ["A", "B"]}) == RESULT_OK
+    # No tables may mean no access; it must not be pinned as "not found"
+    assert (
+        _classify_tables({"found": 0, "tables": [], "error": "No tables found."})
+        == RESULT_ERROR
+    )
+    assert _classify_tables({"error": "Failed to list tables: 403"}) == RESULT_ERROR
+
+
+def test_schema_classification():
+    assert _classify_schema({"schema": []}) == RESULT_OK
+    assert (
+        _classify_schema({"error": "No schema found for table 'Nope'"})
+        == RESULT_NOT_FOUND
+    )
+    assert _classify_schema({"error": "Failed to resolve table 'X'"}) == (
+        RESULT_NOT_FOUND
+    )
+    assert _classify_schema({"error": "Query failed"}) == RESULT_ERROR
+
+
+async def _settle(region):
+    """Wait for background refreshes of region to finish."""
+    for _ in range(100):
+        if not region._refreshing:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError("refresh did not finish")
+
+
+def _sequence(*results):
+    calls = []
+
+    async def loader():
+        calls.append(1)
+        result = results[min(len(calls), len(results)) - 1]
+        if isinstance(result, Exception):
+            raise result
+        return result
+
+    return loader, calls
+
+
+@pytest.mark.asyncio
+async def test_stale_value_is_served_while_refreshing(region, clock):
+    loader, calls = _sequence({"tables": ["A"]}, {"tables": ["A", "B"]})
+    await region.get_or_load("key", loader, classify=_classify_tables)
+    clock.now += 61
+
+    # Concurrent stale reads share a single background refresh
+    stale = await asyncio.gather(
+        *(
+            region.get_or_load("key", loader, classify=_classify_tables)
+            for _ in range(3)
+        )
+    )
+    assert stale == [{"tables": ["A"]}] * 3
+    await _settle(region)
+    assert len(calls) == 2
+    assert region.get("key") == {"tables": ["A", "B"]}
+
+    stats = region.stats()
+    assert stats["stale_hits"] == 3
+    assert stats["refreshes"] == 1
+
+
+@pytest.mark.asyncio
+async def test_failed_refresh_keeps_the_stale_value(region, clock):
+    loader, calls = _sequence(
+        {"tables": ["A"]}, {"error": "Failed to list tables"}, TimeoutError()
+    )
+    await region.get_or_load("key", loader, classify=_classify_tables)
+    for _ in range(2):
+        clock.now += 61
+        value = await region.get_or_load("key", loader, classify=_classify_tables)
+        assert value == {"tables": ["A"]}
+        await _settle(region)
+    assert len(calls) == 3
+    assert region.stats()["refresh_failures"] == 2
+
+
+@pytest.mark.asyncio
+async def test_errors_are_not_served_stale(region, clock):
+    loader, calls = _sequence({"error": "Failed to list tables"}, {"tables": ["A"]})
+    await region.get_or_load("key", loader, classify=_classify_tables)
+    clock.now += region.error_ttl + 1
+    value = await region.get_or_load("key", loader, classify=_classify_tables)
+    assert value == {"tables": ["A"]}
+    assert len(calls) == 2
+    assert region.stats()["stale_hits"] == 0
@@ -0,0 +1,69 @@
+"""Tests for utilities/disk_cache.py and the disk tier of utilities/cache.py."""
+
+import asyncio
+import os
+
+import pytest
+
+from utilities.cache import REGION_SCHEMAS, RESULT_NOT_FOUND, CacheManager
+from utilities.disk_cache import DiskCache
+
+
+@pytest.fixture
+def cache_path(tmp_path):
+    os.chmod(tmp_path, 0o700)
+    return str(tmp_path / "cache.sqlite3")
+
+
+async def _flushed(disk, key):
+    """Wait for a queued write of key to reach the file."""
+    for _ in range(100):
+        if disk.get(REGION_SCHEMAS, key) is not None:
+            return
+        await asyncio.sleep(0.01)
+    raise AssertionError(f"{key} was not written to disk")
+
+
+@pytest.mark.asyncio
+async def test_entries_survive_a_restart(cache_path):
+    disk = DiskCache(cache_path)
+    schemas = CacheManager(disk=disk).region(REGION_SCHEMAS)
+    schemas.set("ws:SecurityEvent", {"schema": [{"name": "Account"}]})
+    await _flushed(disk, "ws:SecurityEvent")
+    disk.close()
+
+    restarted = CacheManager(disk=DiskCache(cache_path)).region(REGION_SCHEMAS)
+    # get() stays in memory so it never blocks the event loop on the file
+    assert restarted.get("ws:SecurityEvent") is None
+    assert await restarted.get_async("ws:SecurityEvent") == {
+        "schema": [{"name": "Account"}]
+    }
+    assert restarted.get("ws:SecurityEvent") == {"schema": [{"name": "Account"}]}
+    assert restarted.stats()["disk_hits"] == 1
+
+
+@pytest.mark.asyncio
+async def test_negative_results_stay_in_memory(cache_path):
+    disk = DiskCache(cache_path)
+    schemas = CacheManager(disk=disk).region(REGION_SCHEMAS)
+    schemas.set("ws:Nope", {"error": "No schema found"}, category=RESULT_NOT_FOUND)
+    schemas.set("ws:SecurityEvent", {"schema": []})
+    await _flushed(disk, "ws:SecurityEvent")
+    assert schemas.get("ws:Nope") == {"error": "No schema found"}
+    assert disk.get(REGION_SCHEMAS, "ws:Nope") is None
+
+
+def test_shared_directory_is_refused(tmp_path):
+    os.chmod(tmp_path, 0o777)
+    disk = DiskCache(str(tmp_path / "cache.sqlite3"), max_bytes=0)
+    assert disk.get(REGION_SCHEMAS, "key") is None
+    assert disk.stats()["enabled"] is False
+    assert not os.path.exists(tmp_path / "cache.sqlite3")
+
+
+def test_readable_file_is_refused(cache_path):
+    with open(cache_path, "w"):
+        pass
+    os.chmod(cache_path, 0o644)
+    disk = DiskCache(cache_path)
+    assert disk.stats()["enabled"] is False
@@ -0,0 +1,108 @@
+"""Tests for utilities/kql_slicing.py."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utilities.kql_slicing import (
+    MAX_SLICES,
+    SlicePlan,
+    merge_slice_rows,
+    plan_slices,
+    time_slices,
+)
+
+
+@pytest.mark.parametrize(
+    "query",
+    [
+        "SecurityEvent",
+        "SecurityEvent | where EventID == 4625 | project TimeGenerated, Account",
+        "SigninLogs | extend Day = bin(TimeGenerated, 1d) | mv-expand Tags",
+        "SecurityEvent | where Account has '| summarize'",
+    ],
+)
+def test_row_queries_are_sliceable(query):
+    plan, reason = plan_slices(query)
+    assert reason is None
+    assert plan.mode == "rows"
+    assert not plan.approximate
+
+
+def test_summarize_plan_lists_aggregates_in_order():
+    plan, reason = plan_slices(
+        "SecurityEvent | where EventID == 4625 "
+        "| summarize Failures = count(), Last = max(TimeGenerated) by Account"
+    )
+    assert reason is None
+    assert plan.mode == "summarize"
+    assert plan.aggregates == ["count", "max"]
+    assert not plan.approximate
+
+
+def test_dcount_plan_is_approximate():
+    plan, _ = plan_slices("SigninLogs | summarize dcount(IPAddress) by UserId")
+    assert plan.aggregates == ["dcount"]
+    assert plan.approximate
+
+
+@pytest.mark.parametrize(
+    "query, reason_part",
+    [
+        ("let t = 1d; SecurityEvent", "single table name"),
+        ("union SecurityEvent, SigninLogs", "single table name"),
+        ("SecurityEvent | take 10", "'take'"),
+        ("SecurityEvent | sort by TimeGenerated desc", "'sort'"),
+        ("SecurityEvent | join (SigninLogs) on Account", "'join'"),
+        ("SecurityEvent | summarize avg(Duration) by Account", "avg()"),
+        ("SecurityEvent | summarize count() by Account | where count_ > 1", "last"),
+        ("SecurityEvent | summarize count() + 1 by Account", "cannot be merged"),
+    ],
+)
+def test_unsliceable_queries_explain_why(query, reason_part):
+    plan, reason = plan_slices(query)
+    assert plan is None
+    assert reason_part in reason
+
+
+def test_time_slices_cover_the_window_oldest_first():
+    end = datetime(2026, 1, 8, tzinfo=timezone.utc)
+    slices = time_slices(end, timedelta(days=7), 7)
+    assert len(slices) == 7
+    assert slices[0][0] == end - timedelta(days=7)
+    assert slices[-1][1] == end
+    for (_, previous_end), (next_start, _) in zip(slices, slices[1:]):
+        assert previous_end == next_start
+
+
+def test_time_slices_are_capped():
+    end = datetime(2026, 1, 8, tzinfo=timezone.utc)
+    assert len(time_slices(end, timedelta(days=7), 1000)) == MAX_SLICES
+    assert len(time_slices(end, timedelta(days=7), 0)) == 1
+
+
+def test_merge_rows_concatenates_in_slice_order():
+    merged = merge_slice_rows(SlicePlan("rows"), [[[1, "a"]], [], [[2, "b"], [3, "c"]]])
+    assert merged == [[1, "a"], [2, "b"], [3, "c"]]
+
+
+def test_merge_summarize_combines_groups():
+    plan = SlicePlan("summarize", ["count", "min", "max"])
+    merged = merge_slice_rows(
+        plan,
+        [
+            [["alice", 2, 5, 9], ["bob", 1, 3, 3]],
+            [["alice", 3, 1, 4], ["carol", 4, None, 7]],
+        ],
+    )
+    assert sorted(merged) == [
+        ["alice", 5, 1, 9],
+        ["bob", 1, 3, 3],
+        ["carol", 4, None, 7],
+    ]
+
+
+def test_merge_summarize_accepts_unhashable_group_keys():
+    plan = SlicePlan("summarize", ["count"])
+    merged = merge_slice_rows(plan, [[[["x", "y"], 1]], [[["x", "y"], 2]]])
+    assert merged == [[["x", "y"], 3]]
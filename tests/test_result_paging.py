@@ -0,0 +1,144 @@
+"""Tests for utilities/result_paging.py and result budgets in sentinel_logs_search."""
+
+import base64
+import json
+import re
+from datetime import datetime, timezone
+from types import SimpleNamespace
+
+import pytest
+
+from tools.query_tools import SentinelLogsSearchTool
+from utilities.result_paging import (
+    ResultCursor,
+    cap_query,
+    page_query,
+    result_limits,
+    rows_within_budget,
+)
+
+START = datetime(2026, 1, 1, tzinfo=timezone.utc)
+END = datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+
+def test_cursor_round_trip():
+    cursor = ResultCursor("SecurityEvent | sort by TimeGenerated", START, END, 250)
+    decoded = ResultCursor.decode(cursor.encode())
+    assert decoded.query == cursor.query
+    assert decoded.timespan == (START, END)
+    assert decoded.offset == 250
+
+
+@pytest.mark.parametrize(
+    "token",
+    [
+        "not a cursor",
+        base64.urlsafe_b64encode(b'{"v": 99}').decode(),
+        base64.urlsafe_b64encode(b'{"v": 1, "q": "T"}').decode(),
+        ResultCursor("T", START, END, 0).encode()[:-4],
+        ResultCursor("T", END, START, 0).encode(),
+        ResultCursor("T", START, END, -1).encode(),
+    ],
+)
+def test_malformed_cursors_are_rejected(token):
+    with pytest.raises(ValueError):
+        ResultCursor.decode(token)
+
+
+def test_row_budget_cut():
+    rows = [[idx] for idx in range(10)]
+    assert rows_within_budget(rows, 4, 0) == (4, "row budget of 4 rows")
+    assert rows_within_budget(rows, 10, 0) == (10, None)
+    assert rows_within_budget(rows, 0, 0) == (10, None)
+
+
+def test_byte_budget_cut_keeps_the_first_row():
+    rows = [["x" * 100] for _ in range(5)]
+    row_bytes = len(json.dumps(rows[0]))
+    kept, reason = rows_within_budget(rows, 0, row_bytes * 2)
+    assert kept == 2
+    assert reason == f"byte budget of {row_bytes * 2} bytes"
+    assert rows_within_budget(rows, 0, 10)[0] == 1
+    # Per-row overhead counts toward the byte budget
+    assert rows_within_budget(rows, 0, row_bytes * 2, row_overhead=1)[0] == 1
+
+
+def test_result_limits_from_environment(monkeypatch):
+    monkeypatch.setenv("MCP_RESULT_MAX_ROWS", "100")
+    monkeypatch.setenv("MCP_RESULT_MAX_BYTES", "invalid")
+    rows, max_bytes = result_limits()
+    assert rows == 100
+    assert max_bytes > 0
+
+
+def test_page_and_cap_queries():
+    paged = page_query("SecurityEvent // comment;", 10, 5)
+    assert paged.startswith("SecurityEvent // comment\n| serialize")
+    assert "_rn > 10 and _rn <= 15" in paged
+    assert paged.endswith("| project-away _rn")
+    assert cap_query("SecurityEvent;", 6) == "SecurityEvent\n| take 6"
+
+
+ROWS = [[f"event-{idx}"] for idx in range(5)]
+
+
+class FakeLogsClient:
+    """Answers paging and take queries over ROWS, recording each query."""
+
+    def __init__(self):
+        self.queries = []
+
+    def query_workspace(self, workspace_id, query, timespan=None, **_):
+        self.queries.append(query)
+        rows = ROWS
+        window = re.search(r"_rn > (\d+) and _rn <= (\d+)", query)
+        if window:
+            rows = rows[int(window.group(1)) : int(window.group(2))]
+        take = re.search(r"\| take (\d+)$", query)
+        if take:
+            rows = rows[: int(take.group(1))]
+        table = SimpleNamespace(columns=["Event"], column_types=["string"], rows=rows)
+        return SimpleNamespace(tables=[table], statistics=None)
+
+
+def _context(client):
+    services = SimpleNamespace(
+        logs_client=client,
+        workspace_id="ws-primary",
+        workspace_name="primary",
+        workspaces={"primary": "ws-primary", "eu": "ws-eu"},
+    )
+    return SimpleNamespace(request_context=SimpleNamespace(lifespan_context=services))
+
+
+@pytest.mark.asyncio
+async def test_first_page_is_limited_by_the_service():
+    client = FakeLogsClient()
+    tool = SentinelLogsSearchTool()
+    first = await tool.run(_context(client), query="SecurityEvent", max_rows=2)
+    # Only one row past the budget is requested, never the whole result
+    assert "_rn > 0 and _rn <= 3" in client.queries[0]
+    assert first["result_count"] == 2
+    assert first["truncated"] is True
+    assert [row["Event"] for row in first["rows"]] == ["event-0", "event-1"]
+
+    second = await tool.run(_context(client), cursor=first["next_cursor"], max_rows=2)
+    assert "_rn > 2 and _rn <= 5" in client.queries[1]
+    assert second["row_offset"] == 2
+    assert [row["Event"] for row in second["rows"]] == ["event-2", "event-3"]
+
+    last = await tool.run(_context(client), cursor=second["next_cursor"], max_rows=2)
+    assert [row["Event"] for row in last["rows"]] == ["event-4"]
+    assert last["truncated"] is False
+    assert last["next_cursor"] is None
+
+
+@pytest.mark.asyncio
+async def test_fan_out_queries_are_capped():
+    client = FakeLogsClient()
+    result = await SentinelLogsSearchTool().run(
+        _context(client), query="SecurityEvent", workspaces="all", max_rows=3
+    )
+    assert client.queries == ["SecurityEvent\n| take 4"] * 2
+    assert result["result_count"] == 3
+    assert result["truncated"] is True
@@ -0,0 +1,132 @@
+"""Tests for utilities/retry.py."""
+
+import httpx
+import pytest
+import requests
+
+from utilities.retry import (
+    RetryPolicy,
+    is_replay_safe,
+    is_retryable,
+    parse_retry_after,
+    retry_async,
+    retry_call,
+)
+
+ARM_URL = "https://management.azure.com/subscriptions/s/providers/x"
+QUERY_URL = "https://api.loganalytics.io/v1/workspaces/w/query"
+
+
+def _status_error(status):
+    request = httpx.Request("POST", ARM_URL)
+    response = httpx.Response(status, request=request)
+    return httpx.HTTPStatusError("failed", request=request, response=response)
+
+
+@pytest.mark.parametrize(
+    "method, url, expected",
+    [
+        ("GET", ARM_URL, True),
+        ("put", ARM_URL, True),
+        ("DELETE", ARM_URL, True),
+        ("POST", ARM_URL, False),
+        ("PATCH", ARM_URL, False),
+        ("POST", QUERY_URL, True),
+        ("POST", "", False),
+    ],
+)
+def test_is_replay_safe(method, url, expected):
+    assert is_replay_safe(method, url) is expected
+
+
+@pytest.mark.parametrize("status", [408, 500, 503])
+def test_server_errors_only_retried_when_replay_safe(status):
+    assert is_retryable(_status_error(status))
+    assert not is_retryable(_status_error(status), replay_safe=False)
+
+
+def test_throttling_is_always_retryable():
+    assert is_retryable(_status_error(429), replay_safe=False)
+    assert not is_retryable(_status_error(400))
+
+
+def test_transport_errors_when_not_replay_safe():
+    # The request may already have reached the service
+    assert is_retryable(httpx.ReadTimeout("slow"))
+    assert not is_retryable(httpx.ReadTimeout("slow"), replay_safe=False)
+    assert not is_retryable(requests.exceptions.ReadTimeout(), replay_safe=False)
+    # The request was never sent
+    assert is_retryable(httpx.ConnectError("refused"), replay_safe=False)
+    assert is_retryable(requests.exceptions.ConnectTimeout(), replay_safe=False)
+
+
+def test_parse_retry_after():
+    assert parse_retry_after({"Retry-After": "3"}) == 3.0
+    assert parse_retry_after({"retry-after-ms": "1500"}) == 1.5
+    assert parse_retry_after({"x-ms-retry-after-ms": "250"}) == 0.25
+    assert parse_retry_after({"Retry-After": "soon"}) is None
+    assert parse_retry_after({}) is None
+
+
+def test_policy_prefers_retry_after_and_stops_at_max_attempts():
+    policy = RetryPolicy(max_attempts=3, base_delay=0.5, max_delay=4)
+    assert policy.next_delay(1, {"Retry-After": "2"}) == 2.0
+    assert 0.25 <= policy.next_delay(1) <= 0.5
+    assert policy.next_delay(3) is None
+
+
+def _failing(errors, result="ok"):
+    calls = []
+
+    def call():
+        calls.append(1)
+        if len(calls) <= len(errors):
+            raise errors[len(calls) - 1]
+        return result
+
+    return call, calls
+
+
+NO_WAIT = RetryPolicy(max_attempts=3, base_delay=0, max_delay=0)
+
+
+def test_retry_call_replays_safe_requests():
+    call, calls = _failing([_status_error(503)])
+    assert retry_call(call, policy=NO_WAIT) == "ok"
+    assert len(calls) == 2
+
+
+def test_retry_call_does_not_replay_unsafe_requests():
+    call, calls = _failing([_status_error(503)])
+    with pytest.raises(httpx.HTTPStatusError):
+        retry_call(call, policy=NO_WAIT, replay_safe=is_replay_safe("POST", ARM_URL))
+    assert len(calls) == 1
+
+
+def test_retry_call_retries_throttled_unsafe_requests():
+    call, calls = _failing([_status_error(429), _status_error(429)])
+    assert retry_call(call, policy=NO_WAIT, replay_safe=False) == "ok"
+    assert len(calls) == 3
+
+
+def test_retry_call_gives_up_after_max_attempts():
+    call, calls = _failing([_status_error(503)] * 5)
+    with pytest.raises(httpx.HTTPStatusError):
+        retry_call(call, policy=NO_WAIT)
+    assert len(calls) == 3
+
+
+@pytest.mark.asyncio
+async def test_retry_async_respects_replay_safety():
+    call, calls = _failing([httpx.ReadTimeout("slow")])
+
+    async def send():
+        return call()
+
+    with pytest.raises(httpx.ReadTimeout):
+        await retry_async(send, policy=NO_WAIT, replay_safe=False)
+    assert len(calls) == 1
+
+    call, calls = _failing([httpx.ReadTimeout("slow")])
+    assert await retry_async(send, policy=NO_WAIT) == "ok"
+    assert len(calls) == 2
@@ -0,0 +1,104 @@
+"""Tests for utilities/timespan.py."""
+
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from utilities.timespan import (
+    describe_timespan,
+    parse_timespan,
+    timespan_bounds,
+    timespan_window,
+)
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("30m", timedelta(minutes=30)),
+        ("7d", timedelta(days=7)),
+        ("2w", timedelta(weeks=2)),
+        ("1d12h", timedelta(days=1, hours=12)),
+        ("1h30m15s", timedelta(hours=1, minutes=30, seconds=15)),
+        (" 12H ", timedelta(hours=12)),
+        ("PT6H", timedelta(hours=6)),
+        ("P1DT12H", timedelta(days=1, hours=12)),
+        ("P2W", timedelta(weeks=2)),
+        ("PT1.5H", timedelta(minutes=90)),
+    ],
+)
+def test_relative_forms(text, expected):
+    assert parse_timespan(text) == expected
+
+
+def test_absolute_range_defaults_to_utc():
+    start, end = parse_timespan("2026-01-01T00:00:00/2026-01-02T00:00:00Z")
+    assert start == datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert end == datetime(2026, 1, 2, tzinfo=timezone.utc)
+
+
+def test_range_with_duration_on_either_side():
+    start = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    assert parse_timespan("2026-01-01T00:00:00Z/PT6H") == (
+        start,
+        start + timedelta(hours=6),
+    )
+    assert parse_timespan("2026-01-01T00:00:00Z/1d") == (
+        start,
+        start + timedelta(days=1),
+    )
+    assert parse_timespan("P1D/2026-01-02T00:00:00Z") == (
+        start,
+        start + timedelta(days=1),
+    )
+
+
+@pytest.mark.parametrize(
+    "text",
+    [
+        "",
+        "   ",
+        "yesterday",
+        "0d",
+        "P1M",
+        "P1Y",
+        "PT",
+        "5000w",
+        "2026-01-02T00:00:00Z/2026-01-01T00:00:00Z",
+        "2026-13-01T00:00:00Z/1d",
+    ],
+)
+def test_invalid_forms(text):
+    with pytest.raises(ValueError):
+        parse_timespan(text)
+
+
+def test_non_string_is_rejected():
+    with pytest.raises(ValueError):
+        parse_timespan(None)
+
+
+def test_window_and_bounds():
+    now = datetime(2026, 1, 2, tzinfo=timezone.utc)
+    relative = parse_timespan("1d")
+    assert timespan_window(relative) == timedelta(days=1)
+    assert timespan_bounds(relative, now) == (now - timedelta(days=1), now)
+    absolute = parse_timespan("2026-01-01T00:00:00Z/2026-01-01T06:00:00Z")
+    assert timespan_window(absolute) == timedelta(hours=6)
+    assert timespan_bounds(absolute, now) == absolute
+
+
+@pytest.mark.parametrize(
+    "text, expected",
+    [
+        ("30d", "in the last 30 days"),
+        ("1d12h", "in the last 1 day 12 hours"),
+        ("90s", "in the last 1 minute 30 seconds"),
+        (
+            "2026-01-01T00:00:00Z/2026-01-02T00:00:00Z",
+            "between 2026-01-01T00:00:00+00:00 and 2026-01-02T00:00:00+00:00",
+        ),
+    ],
+)
+def test_describe_timespan(text, expected):
+    assert describe_timespan(parse_timespan(text)) == expected
@@ -0,0 +1,68 @@
+"""Tests for utilities/workspaces.py."""
+
+from types import SimpleNamespace
+
+import pytest
+
+from utilities.workspaces import (
+    WORKSPACE_COLUMN,
+    merge_workspace_tables,
+    parse_workspaces,
+    resolve_workspaces,
+)
+
+
+def test_parse_workspaces_primary_first():
+    workspaces = parse_workspaces(
+        "id-primary", "sentinel-prod", " eu=id-eu, id-us ,,us2 = id-us2"
+    )
+    assert list(workspaces.items()) == [
+        ("sentinel-prod", "id-primary"),
+        ("eu", "id-eu"),
+        ("id-us", "id-us"),
+        ("us2", "id-us2"),
+    ]
+
+
+def test_parse_workspaces_defaults_and_duplicates():
+    assert parse_workspaces("id-primary") == {"primary": "id-primary"}
+    assert parse_workspaces("id-primary", "", "again=id-primary") == {
+        "primary": "id-primary"
+    }
+    assert parse_workspaces("", "", "eu=id-eu") == {"eu": "id-eu"}
+
+
+CONFIGURED = {"prod": "id-prod", "eu": "id-eu", "us": "id-us"}
+
+
+def test_resolve_all():
+    assert resolve_workspaces("ALL", CONFIGURED) == list(CONFIGURED.items())
+
+
+def test_resolve_aliases_and_ids_without_duplicates():
+    assert resolve_workspaces("eu, id-us, id-eu", CONFIGURED) == [
+        ("eu", "id-eu"),
+        ("us", "id-us"),
+    ]
+    assert resolve_workspaces(["prod"], CONFIGURED) == [("prod", "id-prod")]
+
+
+def test_resolve_unknown_workspace():
+    with pytest.raises(ValueError, match="Unknown workspace 'apac'"):
+        resolve_workspaces("eu,apac", CONFIGURED)
+
+
+def _table(columns, rows, column_types=None):
+    return SimpleNamespace(columns=columns, rows=rows, column_types=column_types or [])
+
+
+def test_merge_workspace_tables_aligns_columns_by_name():
+    merged = merge_workspace_tables(
+        [
+            ("eu", _table(["Account", "Count"], [["a", 1]], ["string", "long"])),
+            ("us", _table(["Count", "Host"], [[2, "h"]], ["long", "string"])),
+        ]
+    )
+    assert merged.columns == [WORKSPACE_COLUMN, "Account", "Count", "Host"]
+    assert merged.column_types == ["string", "string", "long", "string"]
+    assert merged.rows == [["eu", "a", 1, None], ["us", None, 2, "h"]]
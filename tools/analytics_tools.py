@@ -23,6 +23,7 @@ from azure.core.exceptions import HttpResponseError, ResourceNotFoundError
 from mcp.server.fastmcp import Context
 
 from tools.base import MCPToolBase
+from utilities.task_manager import run_in_thread
 
 
 class SentinelAnalyticsRuleListTool(MCPToolBase):
@@ -58,9 +59,12 @@ class SentinelAnalyticsRuleListTool(MCPToolBase):
         errors = []
         try:
             client = self.get_securityinsight_client(subscription_id)
-            rules = client.alert_rules.list(
-                resource_group_name=resource_group,
-                workspace_name=workspace,
+            rules = await run_in_thread(
+                list,
+                client.alert_rules.list(
+                    resource_group_name=resource_group,
+                    workspace_name=workspace,
+                ),
             )
         except (HttpResponseError, ResourceNotFoundError) as e:
             logger.error("Azure SDK error listing analytics rules: %s", e)
@@ -140,7 +144,8 @@ class SentinelAnalyticsRuleGetTool(MCPToolBase):
             return {"error": "No rule_name provided."}
         try:
             client = self.get_securityinsight_client(subscription_id)
-            rule = client.alert_rules.get(
+            rule = await run_in_thread(
+                client.alert_rules.get,
                 resource_group_name=resource_group,
                 workspace_name=workspace,
                 rule_id=rule_name,
@@ -206,7 +211,9 @@ class SentinelAnalyticsRuleTemplatesListTool(MCPToolBase):
             return [{"error": "Missing Azure Sentinel context."}]
         try:
             client = self.get_securityinsight_client(subscription_id)
-            templates = client.alert_rule_templates.list(resource_group, workspace)
+            templates = await run_in_thread(
+                list, client.alert_rule_templates.list(resource_group, workspace)
+            )
         except Exception as e:
             logger.error("Error listing analytics rule templates: %s", e)
             # pylint: disable=consider-using-f-string
@@ -271,8 +278,8 @@ class SentinelAnalyticsRuleTemplateGetTool(MCPToolBase):
         # Get client
         client = self.get_securityinsight_client(subscription_id)
         try:
-            template = client.alert_rule_templates.get(
-                resource_group, workspace, template_id
+            template = await run_in_thread(
+                client.alert_rule_templates.get, resource_group, workspace, template_id
             )
             template_dict = (
                 template.as_dict() if hasattr(template, "as_dict") else dict(template)
@@ -380,9 +387,12 @@ class SentinelAnalyticsRulesCountByTacticTool(MCPToolBase):
         client = self.get_securityinsight_client(subscription_id)
         tactic_map = {}
         try:
-            rules = client.alert_rules.list(
-                resource_group_name=resource_group,
-                workspace_name=workspace,
+            rules = await run_in_thread(
+                list,
+                client.alert_rules.list(
+                    resource_group_name=resource_group,
+                    workspace_name=workspace,
+                ),
             )
             for rule in rules:
                 rule_dict = rule.as_dict() if hasattr(rule, "as_dict") else dict(rule)
@@ -441,7 +451,9 @@ class SentinelAnalyticsRuleTemplatesCountByTacticTool(MCPToolBase):
         client = self.get_securityinsight_client(subscription_id)
         tactic_map = {}
         try:
-            templates = client.alert_rule_templates.list(resource_group, workspace)
+            templates = await run_in_thread(
+                list, client.alert_rule_templates.list(resource_group, workspace)
+            )
             for template in templates:
                 template_dict = (
                     template.as_dict()
@@ -504,9 +516,12 @@ class SentinelAnalyticsRulesCountByTechniqueTool(MCPToolBase):
         client = self.get_securityinsight_client(subscription_id)
         technique_map = {}
         try:
-            rules = client.alert_rules.list(
-                resource_group_name=resource_group,
-                workspace_name=workspace,
+            rules = await run_in_thread(
+                list,
+                client.alert_rules.list(
+                    resource_group_name=resource_group,
+                    workspace_name=workspace,
+                ),
             )
             for rule in rules:
                 rule_dict = rule.as_dict() if hasattr(rule, "as_dict") else dict(rule)
@@ -563,7 +578,9 @@ class SentinelAnalyticsRuleTemplatesCountByTechniqueTool(MCPToolBase):
         client = self.get_securityinsight_client(subscription_id)
         technique_map = {}
         try:
-            templates = client.alert_rule_templates.list(resource_group, workspace)
+            templates = await run_in_thread(
+                list, client.alert_rule_templates.list(resource_group, workspace)
+            )
             for template in templates:
                 template_dict = (
                     template.as_dict()
@@ -32,6 +32,7 @@ from azure.core.exceptions import (
 )
 from mcp.server.fastmcp import Context
 from tools.base import MCPToolBase
+from utilities.task_manager import run_in_thread
 
 READ_PATTERNS = [r"reader", r"read", r"monitor.*read"]
 SENTINEL_READ_ROLES = {"Microsoft Sentinel Reader", "Security Reader"}
@@ -168,7 +169,9 @@ class SentinelAuthorizationSummaryTool(MCPToolBase):
                 logger.info(
                     "Attempting to fetch role assignments at %s scope: %s", label, scope
                 )
-                result = list(client.role_assignments.list_for_scope(scope))
+                result = await run_in_thread(
+                    list, client.role_assignments.list_for_scope(scope)
+                )
                 if result:
                     assignments = result
                     scope_used = scope
@@ -206,7 +209,9 @@ class SentinelAuthorizationSummaryTool(MCPToolBase):
         for assignment in assignments:
             role_def_id = assignment.role_definition_id.split("/")[-1]
             try:
-                role_def = client.role_definitions.get(scope_used, role_def_id)
+                role_def = await run_in_thread(
+                    client.role_definitions.get, scope_used, role_def_id
+                )
                 role_name = getattr(role_def, "role_name", "")
                 description = getattr(role_def, "description", "")
                 category = getattr(role_def, "role_type", "")
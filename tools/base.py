@@ -8,16 +8,42 @@ All custom MCP tools should inherit from MCPToolBase.
 """
 
 import os
+import math
+import asyncio
+import time
 import logging  # For type hinting of logger attribute
 import warnings
 from abc import ABC, abstractmethod
+from datetime import timedelta
 from typing import Any, Dict, List, Optional
+from urllib.parse import urlparse
 
 from mcp.server.fastmcp import Context
-from utilities.api_utils import AzureApiClient
-from utilities.task_manager import run_in_thread
+from utilities.api_utils import AzureApiClient, PageStream
+from utilities.client_registry import (
+    CLIENT_AUTHORIZATION,
+    CLIENT_LOGANALYTICS,
+    CLIENT_LOGS,
+    CLIENT_SECURITYINSIGHT,
+    client_registry,
+)
+from utilities.executors import EXECUTOR_QUERY, PRIORITY_NORMAL
+from utilities.kql_fingerprint import hot_queries
+from utilities.query_cache import normalize_kql
+from utilities.query_stats import query_stats, summarize_statistics
+from utilities.retry import reset_retry_budget, start_retry_budget
+from utilities.single_flight import query_single_flight
+from utilities.task_manager import create_tracked_task, run_in_thread
+from utilities.workspaces import parse_workspaces
 from utilities.logging import get_tool_logger
 
+# Default time limit for a Log Analytics query, in seconds
+DEFAULT_QUERY_TIMEOUT = 60.0
+# Log Analytics does not accept server timeouts above 10 minutes
+MAX_QUERY_TIMEOUT = 600.0
+# Extra seconds the client waits for the service to report its own timeout
+QUERY_TIMEOUT_GRACE = 5.0
+
 
 class MCPToolBase(ABC):
     """
@@ -33,6 +59,10 @@ class MCPToolBase(ABC):
       - get_logs_client_and_workspace
       - get_loganalytics_client
       - get_securityinsight_client
+      - get_authorization_client
+    These return long-lived clients from the process-wide client registry
+    (utilities/client_registry.py), so credential startup and connection
+    setup are paid once per process rather than once per tool call.
     Tool implementations must NOT import or initialize Azure SDK clients directly.
     This enforces maintainability, security, and testability.
 
@@ -48,6 +78,11 @@ class MCPToolBase(ABC):
     name: str = ""
     description: str = ""
     logger: logging.Logger = None
+    # Time limit for this tool's Log Analytics queries (see query_workspace)
+    query_timeout: float = DEFAULT_QUERY_TIMEOUT
+    # Queue priority for this tool's queries on the 'query' executor;
+    # quick metadata lookups use PRIORITY_INTERACTIVE to jump ahead of hunts
+    query_priority: int = PRIORITY_NORMAL
 
     def __init__(self):
         """
@@ -76,15 +111,6 @@ class MCPToolBase(ABC):
         Raises:
             ImportError: If Azure SDK is not installed.
         """
-        try:
-            # pylint: disable=import-outside-toplevel
-            # ruff: noqa: C0415
-            from azure.identity import DefaultAzureCredential
-            from azure.monitor.query import LogsQueryClient
-        except ImportError as e:
-            raise ImportError(
-                "Azure SDK is required for Log Analytics operations."
-            ) from e
         # Server (MCP) invocation
         if (
             hasattr(ctx, "request_context")
@@ -96,11 +122,43 @@ class MCPToolBase(ABC):
             return logs_client, workspace_id
         # Direct invocation (integration tests)
         workspace_id = os.environ["AZURE_WORKSPACE_ID"]
-        # Use DefaultAzureCredential for all environments
-        credential = DefaultAzureCredential()
-        logs_client = LogsQueryClient(credential)
+        try:
+            logs_client = client_registry.get_client(CLIENT_LOGS)
+        except ImportError as e:
+            raise ImportError(
+                "Azure SDK is required for Log Analytics operations."
+            ) from e
         return logs_client, workspace_id
 
+    def get_workspaces(self, ctx: Context) -> Dict[str, str]:
+        """
+        Get the workspaces available for fan-out queries.
+
+        Supports both server (MCP) and direct invocation (integration tests).
+
+        Args:
+            ctx (Context): The MCP context object.
+        Returns:
+            dict: Workspace aliases mapped to workspace IDs, primary first.
+        """
+        if (
+            hasattr(ctx, "request_context")
+            and getattr(ctx, "request_context", None) is not None
+        ):
+            services_ctx = ctx.request_context.lifespan_context
+            workspaces = getattr(services_ctx, "workspaces", None)
+            if workspaces:
+                return dict(workspaces)
+            return parse_workspaces(
+                getattr(services_ctx, "workspace_id", ""),
+                getattr(services_ctx, "workspace_name", ""),
+            )
+        return parse_workspaces(
+            os.environ.get("AZURE_WORKSPACE_ID", ""),
+            os.environ.get("AZURE_WORKSPACE_NAME", ""),
+            os.environ.get("AZURE_WORKSPACE_IDS", ""),
+        )
+
     def get_azure_context(self, ctx: Context):
         """
         Get Azure workspace name, resource group, and subscription ID.
@@ -127,64 +185,52 @@ class MCPToolBase(ABC):
         """
         Get an authenticated LogAnalyticsManagementClient for the given subscription ID.
 
+        The client is shared process-wide through the client registry.
+
         Args:
             subscription_id (str): Azure subscription ID.
         Returns:
             LogAnalyticsManagementClient: Authenticated client instance.
         """
-        # pylint: disable=import-outside-toplevel
-        # ruff: noqa: C0415
-        from azure.identity import DefaultAzureCredential
-        from azure.mgmt.loganalytics import LogAnalyticsManagementClient
-
-        # pylint: disable=import-outside-toplevel
-        credential = DefaultAzureCredential()
-        return LogAnalyticsManagementClient(credential, subscription_id)
+        return client_registry.get_client(CLIENT_LOGANALYTICS, subscription_id)
 
     def get_securityinsight_client(self, subscription_id):
         """
         Get an authenticated SecurityInsights client for the given subscription ID.
 
+        The client is shared process-wide through the client registry.
+
         Args:
             subscription_id (str): Azure subscription ID.
         Returns:
             SecurityInsights: Authenticated client instance.
         """
-        # pylint: disable=import-outside-toplevel
-        # ruff: noqa: C0415
-        from azure.identity import DefaultAzureCredential
-        from azure.mgmt.securityinsight import SecurityInsights
-
-        # pylint: disable=import-outside-toplevel
-        credential = DefaultAzureCredential()
-        return SecurityInsights(credential, subscription_id)
+        return client_registry.get_client(CLIENT_SECURITYINSIGHT, subscription_id)
 
     def get_authorization_client(self, subscription_id):
         """
         Get an authenticated AuthorizationManagementClient for the given subscription ID.
 
+        The client is shared process-wide through the client registry.
+
         Args:
             subscription_id (str): Azure subscription ID.
         Returns:
             AuthorizationManagementClient: Authenticated client instance.
         """
         try:
-            # pylint: disable=import-outside-toplevel
-            # ruff: noqa: C0415
-            from azure.identity import DefaultAzureCredential
-            from azure.mgmt.authorization import AuthorizationManagementClient
+            return client_registry.get_client(CLIENT_AUTHORIZATION, subscription_id)
         except ImportError as e:
             raise ImportError(
                 "Azure SDK is required for AuthorizationManagementClient operations."
             ) from e
-        credential = DefaultAzureCredential()
-        return AuthorizationManagementClient(credential, subscription_id)
 
     def get_api_client(self, ctx: Context):
         """
         Get an AzureApiClient for making direct REST API calls to Azure services.
 
-        Reuses the credential from the context if available, otherwise creates a new one.
+        Reuses the credential from the context if available, otherwise the
+        shared credential from the client registry.
 
         Args:
             ctx (Context): The MCP context object.
@@ -197,13 +243,9 @@ class MCPToolBase(ABC):
         if hasattr(ctx, "request_context") and ctx.request_context:
             credential = ctx.request_context.lifespan_context.credential
 
-        # If no credential in context, create a new one
+        # If no credential in context, fall back to the shared one
         if not credential:
-            # pylint: disable=import-outside-toplevel
-            # ruff: noqa: C0415
-            from azure.identity import DefaultAzureCredential
-
-            credential = DefaultAzureCredential()
+            credential = client_registry.get_credential()
 
         # Create and return the API client
         return AzureApiClient(credential)
@@ -220,7 +262,10 @@ class MCPToolBase(ABC):
         name: Optional[str] = None,
     ):
         """
-        Make a direct REST API call using AzureApiClient and task_manager.
+        Make a direct REST API call using the asyncio-native AzureApiClient path.
+
+        The request is awaited on the event loop through the shared httpx
+        connection pool, so it does not hold an executor thread while in flight.
 
         Args:
             ctx (Context): The MCP context.
@@ -232,26 +277,195 @@ class MCPToolBase(ABC):
             timeout (float, optional): Timeout in seconds (default: 30).
             name (str, optional): Name for the task for debugging.
         Returns:
-            Any: The first page of results from the API call.
+            Any: The first page of results from the API call, or None if the
+            API returned no pages.
         Raises:
-            StopIteration: If no results are returned.
+            asyncio.TimeoutError: If the call does not complete within timeout.
             Exception: Any exception raised by the API call.
         """
         # Get the API client
         api_client = self.get_api_client(ctx)
 
-        # Define a function to make the API call and get the first page
-        def make_api_call():
-            # The call_azure_rest_api method returns a generator
-            generator = api_client.call_azure_rest_api(
+        async def make_api_call():
+            pages = api_client.call_azure_rest_api_async(
                 method, url, params=params, headers=headers, body=body
             )
-            # Get the first page of results
-            return next(generator)
-
-        # Run the API call in a thread with the task manager
+            try:
+                # Only the first page is needed
+                async for page in pages:
+                    return page
+                return None
+            finally:
+                await pages.aclose()
+
+        # Track the call with the task manager (for timeout and shutdown cleanup)
         task_name = name or f"api_call_{method}_{url.split('/')[-1]}"
-        return await run_in_thread(make_api_call, timeout=timeout, name=task_name)
+        return await create_tracked_task(
+            make_api_call(),
+            timeout=timeout,
+            name=task_name,
+            operation=f"{method} {urlparse(url).netloc}",
+        )
+
+    def call_api_paged(
+        self,
+        ctx: Context,
+        method: str,
+        url: str,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        body: Optional[dict] = None,
+        max_items: Optional[int] = None,
+        max_pages: Optional[int] = None,
+    ) -> PageStream:
+        """
+        Stream all pages of a paginated REST API result.
+
+        Follows nextLink/@odata.nextLink, prefetching the next page while the
+        caller processes the current one. Use as an async iterator (or call
+        collect()) and check .truncated afterwards to see if limits cut the
+        result short.
+
+        Args:
+            ctx (Context): The MCP context.
+            method (str): HTTP method (GET, POST, etc.).
+            url (str): The full URL for the API call.
+            params (dict, optional): Query parameters for the first request.
+            headers (dict, optional): HTTP headers.
+            body (dict, optional): Request body (for POST/PUT/PATCH).
+            max_items (int, optional): Maximum number of 'value' items to return.
+            max_pages (int, optional): Maximum number of pages to fetch.
+        Returns:
+            PageStream: Async iterator of response pages.
+        """
+        return self.get_api_client(ctx).iter_pages(
+            method,
+            url,
+            params=params,
+            headers=headers,
+            body=body,
+            max_items=max_items,
+            max_pages=max_pages,
+        )
+
+    async def query_workspace(
+        self,
+        logs_client,
+        workspace_id: str,
+        query: str,
+        timespan: Optional[timedelta],
+        name: Optional[str] = None,
+        timeout: Optional[float] = None,
+        include_statistics: bool = False,
+        priority: Optional[int] = None,
+    ):
+        """
+        Run a Log Analytics query in a worker thread, coalescing duplicates.
+
+        Identical concurrent queries (same tool, client, workspace, normalized
+        KQL and timespan) share one upstream request and all receive its
+        result. The tool is part of the key so that the query's statistics
+        are attributed to the tool that asked for it.
+
+        The timeout is sent to Log Analytics as the query's server_timeout,
+        so the service stops the query itself instead of letting it run on
+        after the caller gave up. The HTTP read timeout and the client-side
+        wait are set slightly longer, so the worker thread is released even
+        if the service does not answer. A query whose callers have all been
+        cancelled is cancelled too; if it has not reached a worker thread
+        yet, it never starts.
+
+        Queries run on the bounded 'query' executor; when its queue is full
+        the call fails fast with ExecutorBusyError.
+
+        With include_statistics, the service's cost statistics are requested
+        and recorded in the shared query_stats store under this tool's name.
+        Every upstream query's latency, outcome and row count is recorded in
+        the hot_queries tracker under its fingerprint and logged.
+
+        Args:
+            logs_client: The LogsQueryClient.
+            workspace_id (str): Log Analytics workspace ID.
+            query (str): The KQL query.
+            timespan (timedelta, optional): Time window for the query.
+            name (str, optional): Name for the task for debugging.
+            timeout (float, optional): Time limit in seconds, capped at 600
+                (default: the tool's query_timeout).
+            include_statistics (bool): Request query statistics (the
+                response's 'statistics').
+            priority (int, optional): Queue priority on the query executor
+                (default: the tool's query_priority).
+        Returns:
+            LogsQueryResult: The query response.
+        Raises:
+            ExecutorBusyError: If the query executor's queue is full.
+            asyncio.TimeoutError: If no response arrives within the timeout
+                plus a short grace period.
+            Exception: Any exception raised by the query, including the
+                service's own timeout error.
+        """
+        timeout = min(timeout or self.query_timeout, MAX_QUERY_TIMEOUT)
+        client_timeout = timeout + QUERY_TIMEOUT_GRACE
+        key = (
+            self.name,
+            id(logs_client),
+            workspace_id,
+            normalize_kql(query),
+            str(timespan),
+            include_statistics,
+        )
+
+        async def execute():
+            started = time.perf_counter()
+            outcome, rows = "error", None
+            try:
+                response = await run_in_thread(
+                    logs_client.query_workspace,
+                    workspace_id=workspace_id,
+                    query=query,
+                    timespan=timespan,
+                    server_timeout=max(1, math.ceil(timeout)),
+                    include_statistics=include_statistics,
+                    read_timeout=client_timeout,
+                    timeout=client_timeout,
+                    name=name,
+                    executor=EXECUTOR_QUERY,
+                    priority=(
+                        self.query_priority if priority is None else priority
+                    ),
+                )
+                tables = getattr(response, "tables", None)
+                if tables is None:
+                    outcome = "partial"
+                    tables = getattr(response, "partial_data", None) or []
+                else:
+                    outcome = "ok"
+                rows = sum(len(table.rows) for table in tables)
+            except asyncio.CancelledError:
+                outcome = None
+                raise
+            except asyncio.TimeoutError:
+                outcome = "timeout"
+                raise
+            finally:
+                if outcome is not None:
+                    latency_ms = (time.perf_counter() - started) * 1000
+                    fingerprint = hot_queries.record(query, latency_ms, outcome, rows)
+                    self.logger.info(
+                        "kql fingerprint=%s tool=%s outcome=%s latency_ms=%d rows=%s",
+                        fingerprint,
+                        self.name,
+                        outcome,
+                        latency_ms,
+                        rows,
+                    )
+            # Recorded once per upstream query, not once per coalesced caller
+            statistics = getattr(response, "statistics", None)
+            if statistics:
+                query_stats.record(self.name, query, summarize_statistics(statistics))
+            return response
+
+        return await query_single_flight.do(key, execute)
 
     def validate_azure_context(
         self,
@@ -314,6 +528,23 @@ class MCPToolBase(ABC):
                 )
         return value if value is not None else default
 
+    def _extract_bool_param(self, kwargs, name, default=False) -> bool:
+        """
+        Extract a boolean parameter, accepting JSON booleans and common strings.
+
+        Args:
+            kwargs (dict): The keyword arguments dictionary.
+            name (str): The parameter name to extract.
+            default (bool, optional): Value used when the parameter is absent.
+
+        Returns:
+            bool: The parameter value.
+        """
+        value = self._extract_param(kwargs, name, default)
+        if isinstance(value, str):
+            return value.strip().lower() in ("true", "1", "yes")
+        return bool(value)
+
     @abstractmethod
     async def run(self, ctx: Context, **kwargs) -> Any:
         """
@@ -356,6 +587,8 @@ class MCPToolBase(ABC):
         Entrypoint for MCP tool execution.
 
         Handles logging, error handling, and output wrapping.
+        Starts a retry budget so all Azure calls made by this tool call share
+        one cap on time spent retrying throttled requests.
         Returns MCP-compliant result dict with content and isError.
 
         Args:
@@ -365,6 +598,8 @@ class MCPToolBase(ABC):
             Dict[str, Any]: MCP-compliant result dict.
         """
         self.logger.info("Running tool: %s", self.name)
+        # Cap total time spent retrying throttled calls made by this tool call
+        budget = start_retry_budget()
         try:
             result = await self.run(ctx, **kwargs)
             content = self.wrap_result(result)
@@ -375,6 +610,8 @@ class MCPToolBase(ABC):
                 "content": [{"type": "text", "text": f"Error: {str(e)}"}],
                 "isError": True,
             }
+        finally:
+            reset_retry_budget(budget)
 
     @classmethod
     def register(cls, mcp):
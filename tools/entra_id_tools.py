@@ -13,20 +13,19 @@ Tools implemented:
 - EntraIDGetGroupTool: Get group by object ID
 
 Conforms to: docs/architecture/tool-architecture-and-implementation-requirements.md
-Leverages: utilities/api_utils.py, utilities/cache.py, utilities/task_manager.py
+Leverages: utilities/api_utils.py, utilities/cache.py
 """
 
 import logging
 
 from mcp.server.fastmcp import Context
-import requests
+import httpx
 from tools.base import MCPToolBase
 from utilities.graph_api_utils import (
     GraphApiClient,
     check_graph_permissions,
     GRAPH_API_BASE,
 )
-from utilities.task_manager import run_in_thread
 
 logger = logging.getLogger(__name__)
 
@@ -47,6 +46,68 @@ class EntraIDToolBase(MCPToolBase):
         token = client.get_token()
         check_graph_permissions(token)
 
+    async def _list_all(
+        self, client: GraphApiClient, url: str, kwargs: dict, items_key: str
+    ):
+        """
+        Collect every item of a paged Graph listing.
+
+        Pages are streamed with next-page prefetch. The optional 'max_items'
+        and 'max_pages' (default 10) parameters bound the listing; the result
+        says when they truncated it.
+
+        Args:
+            client (GraphApiClient): Graph API client.
+            url (str): Graph API collection URL.
+            kwargs (dict): Tool keyword arguments.
+            items_key (str): Result key for the collected items.
+        Returns:
+            dict: {items_key: list, 'count': int, 'pages': int (Graph pages
+            read), 'truncated': bool (True if more items exist than were
+            returned), 'valid': True}
+        """
+        max_items = self._extract_param(kwargs, "max_items")
+        max_pages = int(self._extract_param(kwargs, "max_pages", 10))
+        pages = client.iter_pages(
+            "GET",
+            url,
+            max_items=int(max_items) if max_items else None,
+            max_pages=max_pages,
+        )
+        items = await pages.collect()
+        if pages.truncated:
+            logger.warning(
+                "Graph listing %s truncated after %d items (%d pages)",
+                url,
+                len(items),
+                pages.pages,
+            )
+        return {
+            items_key: items,
+            "count": len(items),
+            "pages": pages.pages,
+            "truncated": pages.truncated,
+            "valid": True,
+        }
+
+    async def _first_page(self, client: GraphApiClient, url: str):
+        """
+        Fetch only the first page of a Graph API response.
+
+        Args:
+            client (GraphApiClient): Graph API client.
+            url (str): Graph API URL.
+        Returns:
+            dict or None: The first response page, or None if there was none.
+        """
+        pages = client.call_azure_rest_api_async("GET", url)
+        try:
+            async for page in pages:
+                return page
+            return None
+        finally:
+            await pages.aclose()
+
 
 class EntraIDListUsersTool(EntraIDToolBase):
     """
@@ -61,15 +122,8 @@ class EntraIDListUsersTool(EntraIDToolBase):
         client = GraphApiClient()
         url = f"{GRAPH_API_BASE}/users"
         try:
-
-            def fetch():
-                users = []
-                for page in client.call_azure_rest_api("GET", url):
-                    users.extend(page.get("value", []))
-                return users
-
-            return await run_in_thread(fetch, name="entra_id_list_users")
-        except requests.HTTPError as e:
+            return await self._list_all(client, url, kwargs, "users")
+        except httpx.HTTPStatusError as e:
             if e.response.status_code == 403:
                 raise Exception("Permission denied: User.Read.All is required.") from e
             raise
@@ -103,23 +157,15 @@ class EntraIDGetUserTool(EntraIDToolBase):
             if filter_str:
                 url = f"{GRAPH_API_BASE}/users?$filter={filter_str}"
                 try:
-                    # Use a unique name for this fetch to avoid duplicate function definition
-                    def fetch_user_by_filter():
-                        for page in client.call_azure_rest_api("GET", url):
-                            users = page.get("value", [])
-                            if users:
-                                return users[0]
-                            return None
-
-                    user = await run_in_thread(
-                        fetch_user_by_filter, name="entra_id_get_user_lookup"
-                    )
+                    page = await self._first_page(client, url)
+                    users = (page or {}).get("value", [])
+                    user = users[0] if users else None
                     if user and user.get("id"):
                         user_id = user["id"]
                     else:
                         logger.error("No user found for filter: %s", filter_str)
                         raise Exception(f"No user found for filter: {filter_str}")
-                except requests.HTTPError as e:
+                except httpx.HTTPStatusError as e:
                     logger.error("Graph API error during user lookup: %s", e)
                     if e.response.status_code == 403:
                         raise Exception(
@@ -132,13 +178,8 @@ class EntraIDGetUserTool(EntraIDToolBase):
 
         url = f"{GRAPH_API_BASE}/users/{user_id}"
         try:
-
-            def fetch():
-                for page in client.call_azure_rest_api("GET", url):
-                    return page
-
-            return await run_in_thread(fetch, name="entra_id_get_user")
-        except requests.HTTPError as e:
+            return await self._first_page(client, url)
+        except httpx.HTTPStatusError as e:
             logger.error("Graph API error during user fetch: %s", e)
             if e.response.status_code == 403:
                 raise Exception("Permission denied: User.Read.All is required.") from e
@@ -158,15 +199,8 @@ class EntraIDListGroupsTool(EntraIDToolBase):
         client = GraphApiClient()
         url = f"{GRAPH_API_BASE}/groups"
         try:
-
-            def fetch():
-                groups = []
-                for page in client.call_azure_rest_api("GET", url):
-                    groups.extend(page.get("value", []))
-                return groups
-
-            return await run_in_thread(fetch, name="entra_id_list_groups")
-        except requests.HTTPError as e:
+            return await self._list_all(client, url, kwargs, "groups")
+        except httpx.HTTPStatusError as e:
             if e.response.status_code == 403:
                 raise Exception("Permission denied: Group.Read.All is required.") from e
             raise
@@ -188,13 +222,8 @@ class EntraIDGetGroupTool(EntraIDToolBase):
         client = GraphApiClient()
         url = f"{GRAPH_API_BASE}/groups/{group_id}"
         try:
-
-            def fetch():
-                for page in client.call_azure_rest_api("GET", url):
-                    return page
-
-            return await run_in_thread(fetch, name="entra_id_get_group")
-        except requests.HTTPError as e:
+            return await self._first_page(client, url)
+        except httpx.HTTPStatusError as e:
             if e.response.status_code == 403:
                 raise Exception("Permission denied: Group.Read.All is required.") from e
             raise
@@ -7,7 +7,6 @@ integration with the MCP server.
 """
 
 import json
-from datetime import timedelta
 
 # NOTE: Azure client initialization for all MCP tools is centralized in MCPToolBase (tools/base.py).
 # All tools must use self.get_securityinsight_client, self.get_logs_client_and_workspace, etc.,
@@ -15,7 +14,8 @@ from datetime import timedelta
 
 from mcp.server.fastmcp import Context, FastMCP
 from tools.base import MCPToolBase
-from utilities.task_manager import run_in_thread
+from utilities.executors import PRIORITY_INTERACTIVE
+from utilities.timespan import describe_timespan, parse_timespan
 
 
 class SentinelIncidentListTool(MCPToolBase):
@@ -29,6 +29,7 @@ class SentinelIncidentListTool(MCPToolBase):
 
     name = "sentinel_incident_list"
     description = "List security incidents in Microsoft Sentinel"
+    query_priority = PRIORITY_INTERACTIVE
 
     async def run(self, ctx: Context, **kwargs):
         """
@@ -36,7 +37,8 @@ class SentinelIncidentListTool(MCPToolBase):
 
         Args:
             ctx (Context): MCP context object.
-            **kwargs: Optional filters (limit, severity, status).
+            **kwargs: Optional filters (limit, severity, status) and
+                'timespan' (how far back to look, default '30d').
 
         Returns:
             dict: Contains 'incidents' (list), 'valid' (bool),
@@ -48,6 +50,10 @@ class SentinelIncidentListTool(MCPToolBase):
         limit = self._extract_param(kwargs, "limit", 10)
         severity = self._extract_param(kwargs, "severity", None)
         status = self._extract_param(kwargs, "status", None)
+        try:
+            timespan = parse_timespan(self._extract_param(kwargs, "timespan", "30d"))
+        except ValueError as e:
+            return {"error": f"Invalid timespan format: {e}"}
 
         try:
             logs_client, workspace_id = self.get_logs_client_and_workspace(ctx)
@@ -77,11 +83,11 @@ class SentinelIncidentListTool(MCPToolBase):
                 LastModifiedTime,
                 IncidentUrl
             """
-            response = await run_in_thread(
-                logs_client.query_workspace,
-                workspace_id=workspace_id,
+            response = await self.query_workspace(
+                logs_client,
+                workspace_id,
                 query=query,
-                timespan=timedelta(days=30),
+                timespan=timespan,
                 name="get_recent_incidents",
             )
             if response and response.tables and len(response.tables[0].rows) > 0:
@@ -107,12 +113,13 @@ class SentinelIncidentListTool(MCPToolBase):
             filter_text = ""
             if filters:
                 filter_text = f" with filters ({', '.join(filters)})"
-            logger.info("No incidents found%s in the last 30 days.", filter_text)
+            window_text = describe_timespan(timespan)
+            logger.info("No incidents found%s %s.", filter_text, window_text)
             return {
                 "incidents": [],
                 "valid": True,
                 "errors": [],
-                "message": f"No incidents found{filter_text} in the last 30 days.",
+                "message": f"No incidents found{filter_text} {window_text}.",
             }
         except Exception as e:
             logger.error("Error retrieving incidents: %s", e)
@@ -132,6 +139,7 @@ class SentinelIncidentDetailsTool(MCPToolBase):
 
     name = "sentinel_incident_get"
     description = "Get detailed information about a specific Sentinel incident"
+    query_priority = PRIORITY_INTERACTIVE
 
     async def run(self, ctx: Context, **kwargs):
         """
@@ -139,7 +147,8 @@ class SentinelIncidentDetailsTool(MCPToolBase):
 
         Args:
             ctx (Context): MCP context object.
-            **kwargs: Must include 'incident_number'.
+            **kwargs: Must include 'incident_number'; optional 'timespan'
+                (how far back to search, default '90d').
 
         Returns:
             dict: Contains 'incident' (dict),
@@ -156,6 +165,15 @@ class SentinelIncidentDetailsTool(MCPToolBase):
                 "valid": False,
                 "errors": ["incident_number is required"],
             }
+        try:
+            timespan = parse_timespan(self._extract_param(kwargs, "timespan", "90d"))
+        except ValueError as e:
+            return {
+                "incident": None,
+                "related_alerts": [],
+                "valid": False,
+                "errors": [f"Invalid timespan format: {e}"],
+            }
 
         try:
             logs_client, workspace_id = self.get_logs_client_and_workspace(ctx)
@@ -174,11 +192,11 @@ class SentinelIncidentDetailsTool(MCPToolBase):
                 array_length(BookmarkIds))
             | extend CommentsCount = iif(isnull(Comments), 0, array_length(Comments))
             """
-            details_response = await run_in_thread(
-                logs_client.query_workspace,
-                workspace_id=workspace_id,
+            details_response = await self.query_workspace(
+                logs_client,
+                workspace_id,
                 query=details_query,
-                timespan=timedelta(days=90),
+                timespan=timespan,
                 name=f"get_incident_details_{incident_number}",
             )
             if (
@@ -216,7 +234,6 @@ class SentinelIncidentDetailsTool(MCPToolBase):
                 alert_id_list = ",".join([f"'{aid}'" for aid in alert_ids if aid])
                 alerts_query = f"""
                 SecurityAlert
-                | where TimeGenerated > ago(90d)
                 | where SystemAlertId in ({alert_id_list})
                 | project
                     TimeGenerated,
@@ -228,11 +245,11 @@ class SentinelIncidentDetailsTool(MCPToolBase):
                 | sort by TimeGenerated desc
                 | take 5
                 """
-                alerts_response = await run_in_thread(
-                    logs_client.query_workspace,
-                    workspace_id=workspace_id,
+                alerts_response = await self.query_workspace(
+                    logs_client,
+                    workspace_id,
                     query=alerts_query,
-                    timespan=timedelta(days=90),
+                    timespan=timespan,
                     name=f"get_incident_alerts_{incident_number}",
                 )
                 if (
@@ -11,7 +11,9 @@ are suitable for both server and direct invocation (e.g., integration tests).
 from mcp.server.fastmcp import Context, FastMCP
 
 from tools.base import MCPToolBase
+from utilities.executors import EXECUTOR_CPU, PRIORITY_INTERACTIVE
 from utilities.kql_validator import validate_kql
+from utilities.task_manager import run_in_thread
 
 
 class KQLValidateTool(MCPToolBase):
@@ -61,7 +63,14 @@ class KQLValidateTool(MCPToolBase):
                 "errors": ["Missing required parameter: query"],
             }
         try:
-            is_valid, errors = validate_kql(query)
+            # Parsing is CPU-bound; keep it off the event loop
+            is_valid, errors = await run_in_thread(
+                validate_kql,
+                query,
+                name="validate_kql",
+                executor=EXECUTOR_CPU,
+                priority=PRIORITY_INTERACTIVE,
+            )
             if is_valid:
                 return {
                     "result": (
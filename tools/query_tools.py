@@ -6,25 +6,190 @@ Azure Monitor query tools for the MCP server.
 This module provides:
 - SentinelLogsSearchTool: Run KQL queries against Azure Monitor Logs.
 - SentinelLogsSearchWithDummyDataTool: Test KQL queries with mock data using a datatable construct.
+- SentinelLogsSearchBatchTool: Run several named KQL queries concurrently in one call.
+- SentinelQueryStatsTool: Report the most expensive queries by recorded statistics.
+- SentinelQueryHotspotsTool: Latency, error and row-count analytics per query fingerprint.
 
 All tools are MCPToolBase compliant and are designed for both server and direct invocation.
 """
 
+import asyncio
 import re
 import time
 import json
-from datetime import timedelta, datetime, date
-from typing import List, Dict
+from datetime import datetime, date, timezone
+from typing import Callable, Dict, List, Optional
 from mcp.server.fastmcp import Context, FastMCP
 from tools.base import (
+    MAX_QUERY_TIMEOUT,
+    QUERY_TIMEOUT_GRACE,
     MCPToolBase,
 )  # May show import error in some test runners; see project memories
-from utilities.task_manager import (
-    run_in_thread,
-)  # May show import error in some test runners
+from utilities.executors import PRIORITY_BULK
+from utilities.kql_slicing import (
+    MAX_SLICES,
+    MergedTable,
+    merge_slice_rows,
+    plan_slices,
+    slice_concurrency,
+    time_slices,
+)
+from utilities.kql_fingerprint import SORT_FIELDS as HOTSPOT_SORT_FIELDS
+from utilities.kql_fingerprint import fingerprint_kql, hot_queries
+from utilities.query_cache import query_cache
+from utilities.query_stats import (
+    GROUPINGS,
+    SORT_FIELDS,
+    combine_statistics,
+    query_stats,
+    summarize_statistics,
+)
+from utilities.result_paging import (
+    DEFAULT_MAX_ROWS,
+    ResultCursor,
+    cap_query,
+    column_name_overhead,
+    page_query,
+    result_limits,
+    rows_within_budget,
+)
+from utilities.timespan import parse_timespan, timespan_bounds
+from utilities.workspaces import merge_workspace_tables, resolve_workspaces
 
 # pylint: disable=too-few-public-methods, too-many-return-statements, too-many-branches, too-many-locals
 
+# Supported result layouts for sentinel_logs_search
+RESULT_FORMATS = ("rows", "columnar", "compact")
+# Rows per notification when streaming results
+DEFAULT_STREAM_CHUNK_SIZE = 500
+# Limits for sentinel_logs_search_batch
+MAX_BATCH_QUERIES = 20
+MAX_BATCH_CONCURRENCY = 10
+DEFAULT_BATCH_CONCURRENCY = 5
+DEFAULT_BATCH_TIMEOUT = 60
+
+
+def _isoformat(val):
+    """
+    Return the ISO 8601 form of a date/datetime value.
+
+    Other values (None, and strings the SDK could not parse as datetimes)
+    are returned unchanged.
+    """
+    return val.isoformat() if hasattr(val, "isoformat") else val
+
+
+def _column_converters(rows, columns: List[Dict]) -> List[Optional[Callable]]:
+    """
+    Choose the JSON-safe conversion for each column once.
+
+    Columns declared as datetime, or whose first non-null value is a
+    date/datetime, convert each cell with _isoformat, which also accepts
+    cells of other types. Other columns are later passed through without
+    touching their cells.
+
+    Args:
+        rows: Result rows (sequences of cell values).
+        columns (list): Column metadata from _column_info.
+    Returns:
+        list: A converter per column, or None where values are already JSON-safe.
+    """
+    converters: List[Optional[Callable]] = []
+    for idx, column in enumerate(columns):
+        if str(column.get("type", "")).lower() == "datetime":
+            converters.append(_isoformat)
+            continue
+        sample = next((row[idx] for row in rows if row[idx] is not None), None)
+        converters.append(_isoformat if isinstance(sample, (datetime, date)) else None)
+    return converters
+
+
+def _column_values(rows, converters: List[Optional[Callable]]) -> List[List]:
+    """
+    Transpose rows into JSON-safe value arrays, one per column.
+
+    Args:
+        rows: Result rows (sequences of cell values).
+        converters (list): Per-column converters from _column_converters.
+    Returns:
+        list: One list of values per column.
+    """
+    if not rows:
+        return [[] for _ in converters]
+    return [
+        list(map(convert, col)) if convert else list(col)
+        for convert, col in zip(converters, zip(*rows))
+    ]
+
+
+def _column_info(table) -> List[Dict]:
+    """
+    Return column metadata (name, type, ordinal) for a result table.
+
+    Args:
+        table: A LogsTable from the query response.
+    Returns:
+        list: Column metadata dicts.
+    """
+    column_types = getattr(table, "column_types", None) or []
+
+    def get_col_info(col, idx):
+        # Azure SDK columns may have name/type/ordinal attributes,
+        # or just be strings with types listed separately
+        default_type = column_types[idx] if idx < len(column_types) else "string"
+        return {
+            "name": getattr(col, "name", col),
+            "type": getattr(col, "type", getattr(col, "column_type", default_type)),
+            "ordinal": getattr(col, "ordinal", idx),
+        }
+
+    return [get_col_info(col, idx) for idx, col in enumerate(table.columns)]
+
+
+def _format_rows(columns: List[Dict], values: List[List], result_format: str) -> Dict:
+    """
+    Lay out column value arrays in the requested result format.
+
+    Args:
+        columns (list): Column metadata.
+        values (list): One JSON-safe value list per column.
+        result_format (str): 'rows' (dicts keyed by column name), 'compact'
+            (positional arrays) or 'columnar' (one value array per column).
+    Returns:
+        dict: Either {'rows': [...]} or {'data': {...}}.
+    """
+    names = [col["name"] for col in columns]
+    if result_format == "columnar":
+        return {"data": dict(zip(names, values))}
+    if result_format == "compact":
+        return {"rows": [list(row) for row in zip(*values)]}
+    return {"rows": [dict(zip(names, row)) for row in zip(*values)]}
+
+
+def _error_result(message: str, errors=None, warnings=None, **extras) -> Dict:
+    """
+    Build the failure response of sentinel_logs_search.
+
+    Args:
+        message (str): What went wrong; also the default errors and warnings.
+        errors (list, optional): Detailed errors (default: [message]).
+        warnings (list, optional): Warnings to return (default: [message]).
+        **extras: Additional response fields (e.g. workspace errors).
+    Returns:
+        dict: A result with valid=False and no rows.
+    """
+    return {
+        "valid": False,
+        "errors": errors if errors is not None else [message],
+        "error": message,
+        "result_count": 0,
+        "columns": [],
+        "rows": [],
+        **extras,
+        "warnings": warnings if warnings is not None else [message],
+        "message": message,
+    }
+
 
 class SentinelLogsSearchTool(MCPToolBase):
     """
@@ -42,7 +207,15 @@ class SentinelLogsSearchTool(MCPToolBase):
 
         Args:
             ctx (Context): The MCP context.
-            **kwargs: Should include 'query' and optional 'timespan'.
+            **kwargs: Should include 'query' and optional 'timespan',
+                'format' ('rows', 'columnar' or 'compact'), 'use_cache'
+                (serve repeated queries from the result cache), 'stream'
+                (send rows as notifications), 'chunk_size',
+                'parallel_slices' (split the window into concurrent slices),
+                'workspaces' (fan out to configured workspaces), 'max_rows'
+                (lower the row budget), 'cursor' (fetch the next page of
+                a truncated result), 'timeout' (seconds, at most 600) and
+                'include_statistics' (return the query's cost statistics).
 
         Returns:
             dict: Query results and metadata, or error information.
@@ -50,73 +223,108 @@ class SentinelLogsSearchTool(MCPToolBase):
         # Extract parameters using the centralized parameter extraction from MCPToolBase
         query = self._extract_param(kwargs, "query")
         timespan = self._extract_param(kwargs, "timespan", "1d")
+        result_format = self._extract_param(kwargs, "format", "rows")
+        use_cache = self._extract_bool_param(kwargs, "use_cache")
+        parallel_slices = self._extract_param(kwargs, "parallel_slices", 0)
+        requested_workspaces = self._extract_param(kwargs, "workspaces")
+        stream = self._extract_bool_param(kwargs, "stream")
+        chunk_size = self._extract_param(
+            kwargs, "chunk_size", DEFAULT_STREAM_CHUNK_SIZE
+        )
+        max_rows = self._extract_param(kwargs, "max_rows")
+        cursor = self._extract_param(kwargs, "cursor")
+        timeout = self._extract_param(kwargs, "timeout", self.query_timeout)
+        include_statistics = self._extract_bool_param(kwargs, "include_statistics")
         logger = self.logger
+
+        # A cursor carries the query and pinned window of the page to fetch
+        page = None
+        if cursor:
+            try:
+                page = ResultCursor.decode(str(cursor))
+            except ValueError as e:
+                message = f"Invalid cursor: {e}"
+                logger.error(message)
+                return _error_result(message)
+            query = page.query
+            timespan = f"{page.start.isoformat()}/{page.end.isoformat()}"
+
         if not query:
             logger.error("Missing required parameter: query")
-            return {
-                "valid": False,
-                "errors": ["Missing required parameter: query"],
-                "error": "Missing required parameter: query",
-                "result_count": 0,
-                "columns": [],
-                "rows": [],
-                "warnings": ["Missing required parameter: query"],
-                "message": "Missing required parameter: query",
-            }
+            return _error_result("Missing required parameter: query")
+
+        if result_format not in RESULT_FORMATS:
+            message = (
+                f"Invalid format '{result_format}'. "
+                f"Use one of: {', '.join(RESULT_FORMATS)}."
+            )
+            logger.error(message)
+            return _error_result(message)
+
+        try:
+            chunk_size = int(chunk_size)
+            if chunk_size <= 0:
+                raise ValueError("chunk_size must be positive")
+            parallel_slices = int(parallel_slices)
+            if not 0 <= parallel_slices <= MAX_SLICES:
+                raise ValueError(f"parallel_slices must be between 0 and {MAX_SLICES}")
+            row_budget, byte_budget = result_limits()
+            if max_rows is not None:
+                max_rows = int(max_rows)
+                if max_rows <= 0:
+                    raise ValueError("max_rows must be positive")
+                row_budget = min(max_rows, row_budget) if row_budget else max_rows
+            if page is not None and (requested_workspaces or parallel_slices > 1):
+                raise ValueError(
+                    "cursor cannot be combined with workspaces or parallel_slices"
+                )
+            timeout = float(timeout)
+            if not 0 < timeout <= MAX_QUERY_TIMEOUT:
+                raise ValueError(
+                    f"timeout must be between 0 and {MAX_QUERY_TIMEOUT:g} seconds"
+                )
+            if page is not None:
+                # Pages are always bounded, even with an unlimited row budget
+                row_budget = row_budget or DEFAULT_MAX_ROWS
+        except (TypeError, ValueError) as e:
+            message = f"Invalid parameter: {e}"
+            logger.error(message)
+            return _error_result(message)
 
         logs_client, workspace_id = self.get_logs_client_and_workspace(ctx)
         if logs_client is None or workspace_id is None:
             logger.error(
                 "Azure Monitor Logs client or workspace_id is not initialized."
             )
-            return {
-                "valid": False,
-                "errors": [
-                    (
-                        "Azure Monitor Logs client or workspace_id is not initialized. "
-                        # noqa: E501
-                        "Check your credentials and configuration."
-                    )
-                ],
-                "error": (
-                    "Azure Monitor Logs client or workspace_id is not initialized. "
-                    # noqa: E501
-                    "Check your credentials and configuration."
-                ),
-                "result_count": 0,
-                "columns": [],
-                "rows": [],
-                "warnings": [
-                    "Azure Monitor Logs client or workspace_id is not initialized."
-                ],
-                "message": "Azure Monitor Logs client or workspace_id is not initialized.",
-            }
+            return _error_result(
+                "Azure Monitor Logs client or workspace_id is not initialized. "
+                "Check your credentials and configuration."
+            )
+
+        # Fan-out: run against several configured workspaces concurrently
+        targets = []
+        if requested_workspaces:
+            try:
+                targets = resolve_workspaces(
+                    requested_workspaces, self.get_workspaces(ctx)
+                )
+                if not targets:
+                    raise ValueError("No workspaces selected")
+            except ValueError as e:
+                logger.error("Invalid workspaces: %s", e)
+                return _error_result(str(e))
 
         start_time = time.perf_counter()
         timespan_obj = None
         try:
             if timespan:
-                if timespan.endswith("d"):
-                    timespan_obj = timedelta(days=int(timespan[:-1]))
-                elif timespan.endswith("h"):
-                    timespan_obj = timedelta(hours=int(timespan[:-1]))
-                elif timespan.endswith("m"):
-                    timespan_obj = timedelta(minutes=int(timespan[:-1]))
-                else:
-                    timespan_obj = timedelta(days=1)  # noqa: E501
-        except Exception as e:
+                timespan_obj = parse_timespan(timespan)
+        except ValueError as e:
             logger.error("Invalid timespan format: %s", e)
-            return {
-                "error": (
-                    "Invalid timespan format: %s. Use format like '1d', '12h', or '30m'."
-                    % str(e)
-                ),
-                "result_count": 0,
-                "columns": [],
-                "rows": [],
-                "warnings": ["Invalid timespan format: %s" % str(e)],
-                "message": "Invalid timespan format: %s" % str(e),
-            }
+            return _error_result(
+                "Invalid timespan format: %s. Use a duration like '1d', '1d12h' "
+                "or 'PT6H', or a range like '<start>/<end>'." % str(e)
+            )
 
         warnings = []
         match = re.search(r"\b(take|limit)\s+(\d+)", query, re.IGNORECASE)
@@ -128,58 +336,198 @@ class SentinelLogsSearchTool(MCPToolBase):
                     "Consider using a smaller limit for better performance."
                 )  # noqa: E501
 
-        try:
-            # Execute the query using task manager for async compatibility
-            response = await run_in_thread(
-                logs_client.query_workspace,
-                workspace_id=workspace_id,
-                query=query,
-                timespan=timespan_obj,
-                name=f"query_logs_{hash(query) % 10000}",
-            )
-            exec_time_ms = int((time.perf_counter() - start_time) * 1000)
-
-            def make_json_safe(val):
-                if isinstance(val, datetime):
-                    return val.isoformat()
-                if isinstance(val, date):
-                    return val.isoformat()
-                return val
+        slice_plan = None
+        if parallel_slices > 1:
+            slice_plan, reason = plan_slices(query)
+            if slice_plan is None or timespan_obj is None:
+                reason = reason or "no timespan to split"
+                warnings.append(
+                    f"parallel_slices ignored ({reason}); ran as a single query."
+                )
+                slice_plan = None
+            elif slice_plan.approximate:
+                warnings.append(
+                    "dcount() results were merged across time slices by summing "
+                    "per-slice counts; they are an upper bound, not exact."
+                )
 
-            def get_col_info(col, idx):
-                # Azure SDK columns may have name/type/ordinal attributes,
-                # or just be strings
+        # Opt-in result cache: serve repeated queries without a round-trip
+        # (streamed results are delivered as notifications and never cached,
+        # and statistics describe an actual execution)
+        cache_key = None
+        if use_cache and query_cache.enabled and not stream and not include_statistics:
+            cache_key = query_cache.make_key(
+                ",".join(ws for _, ws in targets) if targets else workspace_id,
+                query,
+                timespan,
+                result_format,
+                parallel_slices if slice_plan else 0,
+                row_budget,
+                byte_budget,
+                page.offset if page is not None else 0,
+            )
+            cached = query_cache.get(cache_key)
+            if cached is not None:
+                result_obj, age = cached
                 return {
-                    "name": getattr(col, "name", col),
-                    "type": getattr(col, "type", getattr(col, "column_type", "string")),
-                    "ordinal": getattr(col, "ordinal", idx),
+                    **result_obj,
+                    "execution_time_ms": int((time.perf_counter() - start_time) * 1000),
+                    "cache_hit": True,
+                    "cache_age_seconds": round(age, 1),
                 }
 
-            if response and getattr(response, "tables", None):
-                table = response.tables[0]
-                columns = [
-                    get_col_info(col, idx) for idx, col in enumerate(table.columns)
-                ]
-                rows = [list(row) for row in table.rows]
-                dict_rows = [
-                    {
-                        col["name"]: make_json_safe(cell)
-                        for col, cell in zip(columns, row)
+        # Only single-workspace, unsliced results can be paged with a cursor;
+        # the window is pinned so that later pages see the same events
+        pageable = not targets and slice_plan is None and timespan_obj is not None
+        if page is not None:
+            # One extra row tells whether another page follows
+            run_query = page_query(query, page.offset, row_budget + 1)
+            window = page.timespan
+        else:
+            run_query = query
+            window = (
+                timespan_bounds(timespan_obj, datetime.now(timezone.utc))
+                if pageable
+                else None
+            )
+            # Let the service apply the row budget instead of downloading
+            # everything; sliced queries are merged first, so they stay whole
+            if row_budget and pageable:
+                run_query = page_query(query, 0, row_budget + 1)
+            elif row_budget and slice_plan is None:
+                run_query = cap_query(query, row_budget + 1)
+
+        # Fingerprint of the query shape, as used by sentinel_query_hotspots
+        response_extras = {"fingerprint": fingerprint_kql(query)[0]}
+        # Per-query statistics summaries, collected when requested
+        statistics = [] if include_statistics else None
+        try:
+            if targets:
+                workspace_errors = {}
+                table = await self._fan_out(
+                    logs_client,
+                    targets,
+                    run_query,
+                    timespan_obj,
+                    parallel_slices,
+                    slice_plan,
+                    warnings,
+                    workspace_errors,
+                    timeout,
+                    statistics,
+                )
+                response_extras.update(
+                    workspaces=[alias for alias, _ in targets],
+                    workspace_errors=workspace_errors,
+                )
+                if len(workspace_errors) == len(targets):
+                    message = "Query failed in every workspace"
+                    logger.error("%s: %s", message, workspace_errors)
+                    return _error_result(
+                        message,
+                        errors=[f"{k}: {v}" for k, v in workspace_errors.items()],
+                        warnings=warnings,
+                        **response_extras,
+                    )
+                # Workspace errors are reported per workspace, not cached
+                if workspace_errors:
+                    cache_key = None
+            else:
+                table = await self._fetch_table(
+                    logs_client,
+                    workspace_id,
+                    run_query,
+                    timespan_obj,
+                    parallel_slices,
+                    slice_plan,
+                    warnings,
+                    timeout,
+                    statistics,
+                )
+            if statistics is not None:
+                response_extras["statistics"] = combine_statistics(statistics)
+            exec_time_ms = int((time.perf_counter() - start_time) * 1000)
+
+            if table is not None:
+                columns = _column_info(table)
+                converters = _column_converters(table.rows, columns)
+                # Enforce the result budget before converting or streaming rows;
+                # the query already stopped one row past the row budget
+                rows = table.rows
+                kept, cut_reason = rows_within_budget(
+                    rows,
+                    row_budget,
+                    byte_budget,
+                    (
+                        column_name_overhead([col["name"] for col in columns])
+                        if result_format == "rows"
+                        else 0
+                    ),
+                )
+                next_cursor = None
+                if cut_reason is not None:
+                    rows = rows[:kept]
+                    offset = (page.offset if page is not None else 0) + kept
+                    if window is not None:
+                        next_cursor = ResultCursor(query, *window, offset).encode()
+                        warnings.append(
+                            f"Result truncated at {kept} rows ({cut_reason}); pass "
+                            "next_cursor as 'cursor' to fetch the next page."
+                        )
+                    else:
+                        warnings.append(
+                            f"Result truncated at {kept} rows ({cut_reason}); narrow "
+                            "the query or timespan to see the remaining rows."
+                        )
+                if stream:
+                    chunks = await self._stream_table(
+                        ctx, rows, columns, converters, result_format, chunk_size
+                    )
+                    return {
+                        "valid": True,
+                        "errors": [],
+                        "query": query,
+                        "timespan": timespan,
+                        "format": result_format,
+                        "result_count": kept,
+                        "columns": columns,
+                        **response_extras,
+                        "truncated": cut_reason is not None,
+                        "next_cursor": next_cursor,
+                        "row_offset": page.offset if page is not None else 0,
+                        "streamed": True,
+                        "chunks": chunks,
+                        "chunk_size": chunk_size,
+                        "execution_time_ms": int(
+                            (time.perf_counter() - start_time) * 1000
+                        ),
+                        "warnings": warnings,
+                        "message": (
+                            f"Query executed successfully; {kept} rows "
+                            f"streamed in {chunks} chunks"
+                        ),
                     }
-                    for row in rows
-                ]
+                values = _column_values(rows, converters)
                 result_obj = {
                     "valid": True,
                     "errors": [],
                     "query": query,
                     "timespan": timespan,
-                    "result_count": len(dict_rows),
+                    "format": result_format,
+                    "result_count": kept,
                     "columns": columns,
-                    "rows": dict_rows,
+                    **_format_rows(columns, values, result_format),
+                    **response_extras,
+                    "truncated": cut_reason is not None,
+                    "next_cursor": next_cursor,
+                    "row_offset": page.offset if page is not None else 0,
                     "execution_time_ms": exec_time_ms,
                     "warnings": warnings,
                     "message": "Query executed successfully",
+                    "cache_hit": False,
                 }
+                if cache_key is not None:
+                    query_cache.set(cache_key, result_obj)
                 return result_obj
             else:
                 result_obj = {
@@ -187,39 +535,276 @@ class SentinelLogsSearchTool(MCPToolBase):
                     "errors": [],
                     "query": query,
                     "timespan": timespan,
+                    "format": result_format,
                     "result_count": 0,
                     "columns": [],
-                    "rows": [],
+                    **_format_rows([], [], result_format),
+                    **response_extras,
+                    "truncated": False,
+                    "next_cursor": None,
+                    "row_offset": page.offset if page is not None else 0,
                     "execution_time_ms": int((time.perf_counter() - start_time) * 1000),
                     "warnings": warnings,
                     "message": "Query returned no tables or results",
+                    "cache_hit": False,
                 }
+                if cache_key is not None:
+                    query_cache.set(cache_key, result_obj)
                 return result_obj
 
-        except TimeoutError:
-            logger.error("Query timed out after 60 seconds")
-            return {
-                "valid": False,
-                "errors": ["Query timed out after 60 seconds"],
-                "error": "Query timed out after 60 seconds",
-                "result_count": 0,
-                "columns": [],
-                "rows": [],
-                "warnings": ["Query timed out after 60 seconds"],
-                "message": "Query timed out after 60 seconds",
-            }
+        except (TimeoutError, asyncio.TimeoutError):
+            message = f"Query timed out after {timeout:g} seconds"
+            logger.error(message)
+            return _error_result(message)
         except Exception as e:
             logger.error("Error executing logs query: %s", str(e), exc_info=True)
-            return {
-                "valid": False,
-                "errors": [f"Error executing query: {str(e)}"],
-                "error": f"Error executing query: {str(e)}",
-                "result_count": 0,
-                "columns": [],
-                "rows": [],
-                "warnings": [f"Error executing query: {str(e)}"],
-                "message": f"Error executing query: {str(e)}",
+            return _error_result(f"Error executing query: {str(e)}")
+
+    async def _fetch_table(
+        self,
+        logs_client,
+        workspace_id,
+        query,
+        timespan_obj,
+        parallel_slices,
+        slice_plan,
+        warnings,
+        timeout=None,
+        statistics=None,
+    ):
+        """
+        Run the query against one workspace, sliced if a slice plan is given.
+
+        If 'statistics' is a list, query statistics are requested and the
+        summary of each upstream query is appended to it.
+
+        Returns:
+            The first result table, or None if the query returned no tables.
+        """
+        if slice_plan is not None:
+            return await self._run_sliced(
+                logs_client,
+                workspace_id,
+                query,
+                timespan_obj,
+                parallel_slices,
+                slice_plan,
+                warnings,
+                timeout,
+                statistics,
+            )
+        # Execute the query using task manager for async compatibility
+        response = await self.query_workspace(
+            logs_client,
+            workspace_id,
+            query=query,
+            timespan=timespan_obj,
+            name=f"query_logs_{hash(query) % 10000}",
+            timeout=timeout,
+            include_statistics=statistics is not None,
+        )
+        if statistics is not None:
+            statistics.append(
+                summarize_statistics(getattr(response, "statistics", None))
+            )
+        if response and getattr(response, "tables", None):
+            return response.tables[0]
+        return None
+
+    async def _fan_out(
+        self,
+        logs_client,
+        targets,
+        query,
+        timespan_obj,
+        parallel_slices,
+        slice_plan,
+        warnings,
+        workspace_errors,
+        timeout=None,
+        statistics=None,
+    ):
+        """
+        Run the query against several workspaces concurrently and merge the rows.
+
+        Each row is tagged with its source workspace alias. A failing workspace
+        does not fail the others; its error is recorded in workspace_errors.
+
+        Args:
+            logs_client: The LogsQueryClient.
+            targets (list): (alias, workspace ID) pairs.
+            query (str): The KQL query.
+            timespan_obj (timedelta or tuple): The query window.
+            parallel_slices (int): Slices per workspace (with slice_plan).
+            slice_plan (SlicePlan, optional): Time-slicing plan, if any.
+            warnings (list): Receives per-workspace warnings.
+            workspace_errors (dict): Receives alias -> error message.
+            timeout (float, optional): Time limit per workspace query.
+            statistics (list, optional): Receives per-query statistics.
+        Returns:
+            MergedTable or None: The merged table, or None if no workspace
+            returned a table.
+        """
+
+        async def fetch(alias, ws_id):
+            ws_warnings = []
+            try:
+                return await self._fetch_table(
+                    logs_client,
+                    ws_id,
+                    query,
+                    timespan_obj,
+                    parallel_slices,
+                    slice_plan,
+                    ws_warnings,
+                    timeout,
+                    statistics,
+                )
+            finally:
+                warnings.extend(f"[{alias}] {warning}" for warning in ws_warnings)
+
+        outcomes = await asyncio.gather(
+            *(fetch(alias, ws_id) for alias, ws_id in targets),
+            return_exceptions=True,
+        )
+        tagged = []
+        for (alias, _), outcome in zip(targets, outcomes):
+            if isinstance(outcome, asyncio.CancelledError):
+                raise outcome
+            if isinstance(outcome, BaseException):
+                self.logger.error("Query failed in workspace %s: %s", alias, outcome)
+                workspace_errors[alias] = str(outcome) or type(outcome).__name__
+            elif outcome is not None:
+                tagged.append((alias, outcome))
+        if not tagged:
+            return None
+        return merge_workspace_tables(tagged)
+
+    async def _run_sliced(
+        self,
+        logs_client,
+        workspace_id,
+        query,
+        window,
+        slice_count,
+        plan,
+        warnings,
+        timeout=None,
+        statistics=None,
+    ):
+        """
+        Run a query over adjacent time slices concurrently and merge the results.
+
+        At most MCP_QUERY_SLICE_CONCURRENCY slices run at once. If any slice
+        fails, the remaining slices are cancelled and the error is raised.
+
+        Args:
+            logs_client: The LogsQueryClient.
+            workspace_id (str): Log Analytics workspace ID.
+            query (str): The KQL query (must be sliceable, see plan_slices).
+            window (timedelta or tuple): The full query window (relative to
+                now, or a (start, end) range).
+            slice_count (int): Number of slices.
+            plan (SlicePlan): How to merge slice results.
+            warnings (list): Receives warnings about partial slice results.
+            timeout (float, optional): Time limit per slice query.
+            statistics (list, optional): Receives per-slice statistics.
+        Returns:
+            MergedTable or None: The merged table, or None if no slice returned one.
+        """
+        semaphore = asyncio.Semaphore(slice_concurrency())
+        start, end = timespan_bounds(window, datetime.now(timezone.utc))
+        slices = time_slices(end, end - start, slice_count)
+
+        async def run_slice(idx, bounds):
+            async with semaphore:
+                return await self.query_workspace(
+                    logs_client,
+                    workspace_id,
+                    query=query,
+                    timespan=bounds,
+                    name=f"query_logs_slice_{idx}_{hash(query) % 10000}",
+                    timeout=timeout,
+                    include_statistics=statistics is not None,
+                    priority=PRIORITY_BULK,
+                )
+
+        tasks = [
+            asyncio.ensure_future(run_slice(idx, bounds))
+            for idx, bounds in enumerate(slices)
+        ]
+        try:
+            responses = await asyncio.gather(*tasks)
+        except BaseException:
+            for task in tasks:
+                task.cancel()
+            raise
+
+        template = None
+        slice_rows = []
+        for idx, response in enumerate(responses):
+            if statistics is not None:
+                statistics.append(
+                    summarize_statistics(getattr(response, "statistics", None))
+                )
+            tables = getattr(response, "tables", None)
+            if tables is None and getattr(response, "partial_data", None):
+                tables = response.partial_data
+                warnings.append(
+                    f"Time slice {idx + 1}/{len(slices)} returned partial results: "
+                    f"{getattr(response, 'partial_error', '')}"
+                )
+            if not tables:
+                continue
+            template = template or tables[0]
+            slice_rows.append(tables[0].rows)
+        if template is None:
+            return None
+        return MergedTable(
+            template.columns,
+            getattr(template, "column_types", None) or [],
+            merge_slice_rows(plan, slice_rows),
+        )
+
+    async def _stream_table(
+        self, ctx: Context, rows, columns, converters, result_format, chunk_size
+    ) -> int:
+        """
+        Send result rows to the client in chunks as MCP log notifications.
+
+        Each chunk is converted and serialized on its own, so only one chunk of
+        converted rows is held in memory at a time. Progress is reported after
+        every chunk (clients that sent a progress token receive it).
+
+        Args:
+            ctx (Context): The MCP context.
+            rows: Result rows from the query response.
+            columns (list): Column metadata.
+            converters (list): Per-column converters from _column_converters.
+            result_format (str): Layout of each chunk ('rows', 'compact', 'columnar').
+            chunk_size (int): Rows per chunk.
+        Returns:
+            int: Number of chunks sent.
+        """
+        total = len(rows)
+        chunks = 0
+        for offset in range(0, total, chunk_size):
+            chunk_rows = rows[offset : offset + chunk_size]
+            payload = {
+                "type": "sentinel_logs_search.chunk",
+                "chunk": chunks,
+                "offset": offset,
+                "row_count": len(chunk_rows),
+                **_format_rows(
+                    columns, _column_values(chunk_rows, converters), result_format
+                ),
             }
+            if chunks == 0:
+                payload["columns"] = columns
+            await ctx.log("info", json.dumps(payload, default=str), logger_name=self.name)
+            chunks += 1
+            await ctx.report_progress(offset + len(chunk_rows), total)
+        return chunks
 
 
 class SentinelLogsSearchWithDummyDataTool(MCPToolBase):
@@ -454,6 +1039,8 @@ class SentinelLogsSearchWithDummyDataTool(MCPToolBase):
             )
 
             search_tool = _SentinelLogsSearchTool()
+            # Attribute the test query to this tool in the query statistics
+            search_tool.name = self.name
             result = await search_tool.run(ctx, query=test_query)
             return {
                 "valid": result.get("valid", False),
@@ -583,6 +1170,290 @@ class SentinelLogsSearchWithDummyDataTool(MCPToolBase):
         return datatable_def, datatable_var
 
 
+class SentinelLogsSearchBatchTool(MCPToolBase):
+    """
+    Tool that runs several named KQL queries concurrently in one call.
+
+    Each query runs through sentinel_logs_search (same result shape, caching
+    and de-duplication) under a shared concurrency limit and its own timeout.
+    """
+
+    name = "sentinel_logs_search_batch"
+    description = "Run several named KQL queries concurrently against Azure Monitor"
+
+    async def run(self, ctx: Context, **kwargs):
+        """
+        Run a batch of named KQL queries concurrently.
+
+        Args:
+            ctx (Context): The MCP context.
+            **kwargs: Should include 'queries' (list of {'name', 'query',
+                optional 'timespan'} objects, or a mapping of name to query)
+                and optional 'timespan' (default for all queries),
+                'max_concurrency', 'timeout' (seconds per query), 'format',
+                'use_cache', 'workspaces' and 'include_statistics' (applied to
+                every query).
+
+        Returns:
+            dict: Results keyed by query name, or error information.
+        """
+        queries = self._extract_param(kwargs, "queries")
+        default_timespan = self._extract_param(kwargs, "timespan", "1d")
+        max_concurrency = self._extract_param(
+            kwargs, "max_concurrency", DEFAULT_BATCH_CONCURRENCY
+        )
+        timeout = self._extract_param(kwargs, "timeout", DEFAULT_BATCH_TIMEOUT)
+        result_format = self._extract_param(kwargs, "format", "rows")
+        use_cache = self._extract_bool_param(kwargs, "use_cache")
+        workspaces = self._extract_param(kwargs, "workspaces")
+        include_statistics = self._extract_bool_param(kwargs, "include_statistics")
+        logger = self.logger
+
+        try:
+            batch = self._normalize_queries(queries, default_timespan)
+            max_concurrency = int(max_concurrency)
+            timeout = float(timeout)
+            if max_concurrency <= 0 or timeout <= 0:
+                raise ValueError("max_concurrency and timeout must be positive")
+            if timeout > MAX_QUERY_TIMEOUT:
+                raise ValueError(f"timeout must be at most {MAX_QUERY_TIMEOUT:g}")
+        except (TypeError, ValueError) as e:
+            logger.error("Invalid batch request: %s", e)
+            return {
+                "valid": False,
+                "error": f"Invalid batch request: {e}",
+                "results": {},
+                "errors": {},
+            }
+
+        start_time = time.perf_counter()
+        semaphore = asyncio.Semaphore(min(max_concurrency, MAX_BATCH_CONCURRENCY))
+        search_tool = SentinelLogsSearchTool()
+        # Batches are bulk work; single searches and lookups run ahead of them
+        search_tool.query_priority = PRIORITY_BULK
+        # Statistics and hotspots are attributed to the batch tool
+        search_tool.name = self.name
+
+        async def run_one(entry):
+            async with semaphore:
+                try:
+                    return await asyncio.wait_for(
+                        search_tool.run(
+                            ctx,
+                            query=entry["query"],
+                            timespan=entry["timespan"],
+                            format=result_format,
+                            use_cache=use_cache,
+                            workspaces=workspaces,
+                            timeout=timeout,
+                            include_statistics=include_statistics,
+                        ),
+                        # The search enforces the timeout itself, server side
+                        timeout + QUERY_TIMEOUT_GRACE,
+                    )
+                except asyncio.TimeoutError:
+                    message = f"Query timed out after {timeout:g} seconds"
+                    return {"valid": False, "error": message, "errors": [message]}
+                except Exception as e:
+                    logger.error(
+                        "Batch query '%s' failed: %s", entry["name"], e, exc_info=True
+                    )
+                    message = f"Error executing query: {e}"
+                    return {"valid": False, "error": message, "errors": [message]}
+
+        outcomes = await asyncio.gather(*(run_one(entry) for entry in batch))
+        results = {}
+        errors = {}
+        for entry, outcome in zip(batch, outcomes):
+            results[entry["name"]] = outcome
+            if not outcome.get("valid", False):
+                errors[entry["name"]] = outcome.get("error") or "Query failed"
+        succeeded = len(batch) - len(errors)
+        return {
+            "valid": not errors,
+            "query_count": len(batch),
+            "succeeded": succeeded,
+            "failed": len(errors),
+            "results": results,
+            "errors": errors,
+            "execution_time_ms": int((time.perf_counter() - start_time) * 1000),
+            "message": f"{succeeded} of {len(batch)} queries succeeded",
+        }
+
+    def _normalize_queries(self, queries, default_timespan) -> List[Dict]:
+        """
+        Validate the 'queries' parameter and return a list of query entries.
+
+        Args:
+            queries: List of {'name', 'query', 'timespan'} objects, a mapping
+                of name to query, or either of those as a JSON string.
+            default_timespan (str): Timespan for entries that do not set one.
+        Returns:
+            list: Dicts with 'name', 'query' and 'timespan'.
+        Raises:
+            ValueError: If the batch is empty, too large or malformed.
+        """
+        if isinstance(queries, str):
+            queries = json.loads(queries)
+        if isinstance(queries, dict):
+            queries = [{"name": name, "query": q} for name, q in queries.items()]
+        if not isinstance(queries, list) or not queries:
+            raise ValueError("'queries' must be a non-empty list of named queries")
+        if len(queries) > MAX_BATCH_QUERIES:
+            raise ValueError(f"at most {MAX_BATCH_QUERIES} queries per batch")
+        batch = []
+        for idx, entry in enumerate(queries):
+            if not isinstance(entry, dict) or not entry.get("query"):
+                raise ValueError(f"query #{idx + 1} must be an object with a 'query'")
+            name = str(entry.get("name") or f"query_{idx + 1}")
+            if any(existing["name"] == name for existing in batch):
+                raise ValueError(f"duplicate query name '{name}'")
+            batch.append(
+                {
+                    "name": name,
+                    "query": entry["query"],
+                    "timespan": entry.get("timespan") or default_timespan,
+                }
+            )
+        return batch
+
+
+class SentinelQueryStatsTool(MCPToolBase):
+    """
+    Tool that reports aggregated Log Analytics query statistics.
+
+    Statistics are recorded for every query run with include_statistics and
+    are grouped per query fingerprint, per tool and per table.
+    """
+
+    name = "sentinel_query_stats"
+    description = "Show the most expensive Log Analytics queries run by this server"
+
+    async def run(self, ctx: Context, **kwargs):
+        """
+        Return the heaviest query groups by recorded statistics.
+
+        Args:
+            ctx (Context): The MCP context.
+            **kwargs: Optional 'group_by' ('fingerprint', 'tool' or 'table'),
+                'sort_by' ('count' or a summed field such as 'cpu_time_ms'),
+                'limit' (default 10) and 'reset' (clear the statistics after
+                reading them).
+
+        Returns:
+            dict: The top entries and store metadata, or error information.
+        """
+        group_by = self._extract_param(kwargs, "group_by", "fingerprint")
+        sort_by = self._extract_param(kwargs, "sort_by", "cpu_time_ms")
+        limit = self._extract_param(kwargs, "limit", 10)
+        reset = self._extract_bool_param(kwargs, "reset")
+        try:
+            limit = int(limit)
+            if limit <= 0:
+                raise ValueError("limit must be positive")
+            entries = query_stats.top(group_by, sort_by, limit)
+        except (TypeError, ValueError) as e:
+            message = f"Invalid parameter: {e}"
+            self.logger.error(message)
+            return {
+                "valid": False,
+                "error": message,
+                "errors": [message],
+                "group_by_options": list(GROUPINGS),
+                "sort_by_options": list(SORT_FIELDS),
+            }
+        store = query_stats.stats()
+        if reset:
+            query_stats.clear()
+        return {
+            "valid": True,
+            "errors": [],
+            "group_by": group_by,
+            "sort_by": sort_by,
+            "entries": entries,
+            "tracked": store["tracked"],
+            "since": datetime.fromtimestamp(store["since"], timezone.utc).isoformat(),
+            "reset": reset,
+            "message": (
+                f"Top {len(entries)} {group_by} entries by {sort_by}"
+                if entries
+                else "No query statistics recorded yet; run sentinel_logs_search "
+                "with include_statistics: true"
+            ),
+        }
+
+
+class SentinelQueryHotspotsTool(MCPToolBase):
+    """
+    Tool that reports the hottest query shapes run by this server.
+
+    Every Log Analytics query is fingerprinted (literals removed) and its
+    latency, outcome and row count recorded; see utilities/kql_fingerprint.py.
+    """
+
+    name = "sentinel_query_hotspots"
+    description = (
+        "Show the most frequent, slowest or most failing query shapes run by "
+        "this server"
+    )
+
+    async def run(self, ctx: Context, **kwargs):
+        """
+        Return per-fingerprint query analytics.
+
+        Args:
+            ctx (Context): The MCP context.
+            **kwargs: Optional 'sort_by' ('count', 'p95_ms', 'error_rate' or
+                'total_ms'), 'limit' (default 10), 'fingerprint' (return only
+                that fingerprint) and 'reset' (clear after reading).
+
+        Returns:
+            dict: The hottest fingerprints and tracker metadata, or error
+            information.
+        """
+        sort_by = self._extract_param(kwargs, "sort_by", "count")
+        limit = self._extract_param(kwargs, "limit", 10)
+        fingerprint = self._extract_param(kwargs, "fingerprint")
+        reset = self._extract_bool_param(kwargs, "reset")
+        try:
+            limit = int(limit)
+            if limit <= 0:
+                raise ValueError("limit must be positive")
+            if fingerprint:
+                entries = [
+                    entry
+                    for entry in hot_queries.top(sort_by, hot_queries.capacity)
+                    if entry["fingerprint"] == fingerprint
+                ]
+            else:
+                entries = hot_queries.top(sort_by, limit)
+        except (TypeError, ValueError) as e:
+            message = f"Invalid parameter: {e}"
+            self.logger.error(message)
+            return {
+                "valid": False,
+                "error": message,
+                "errors": [message],
+                "sort_by_options": list(HOTSPOT_SORT_FIELDS),
+            }
+        tracker = hot_queries.stats()
+        if reset:
+            hot_queries.clear()
+        return {
+            "valid": True,
+            "errors": [],
+            "sort_by": sort_by,
+            "entries": entries,
+            **tracker,
+            "reset": reset,
+            "message": (
+                f"Top {len(entries)} query fingerprints by {sort_by}"
+                if entries
+                else "No matching queries recorded yet"
+            ),
+        }
+
+
 def register_tools(mcp: FastMCP):
     """
     Register Azure Monitor query tools with the MCP server.
@@ -592,3 +1463,6 @@ def register_tools(mcp: FastMCP):
     """
     SentinelLogsSearchTool.register(mcp)
     SentinelLogsSearchWithDummyDataTool.register(mcp)
+    SentinelLogsSearchBatchTool.register(mcp)
+    SentinelQueryStatsTool.register(mcp)
+    SentinelQueryHotspotsTool.register(mcp)
@@ -0,0 +1,155 @@
+"""
+FILE: tools/server_tools.py
+
+Provides diagnostics about the MCP server process itself.
+
+This module defines tools that report what the server is doing: running and
+recently finished tasks, their queue wait and run times, per-operation
+latency histograms, executor usage and cache region usage. All tools are
+MCPToolBase compliant.
+"""
+
+from mcp.server.fastmcp import Context, FastMCP
+
+from tools.base import MCPToolBase
+from utilities.cache import cache_manager
+from utilities.executors import executors
+from utilities.task_manager import TASK_HISTORY, task_registry
+
+
+class ServerTasksStatusTool(MCPToolBase):
+    """
+    Tool that lists running and recently finished server tasks.
+
+    Every tracked task (thread-pool SDK calls and REST calls) is recorded in
+    the task registry; see utilities/task_manager.py.
+    """
+
+    name = "server_tasks_status"
+    description = (
+        "List running and recently finished server tasks with queue wait, run "
+        "time and latency histograms, to find slow or stuck upstream calls"
+    )
+
+    async def run(self, ctx: Context, **kwargs):
+        """
+        Return the task registry and executor status.
+
+        Args:
+            ctx (Context): The MCP context.
+            **kwargs: Optional 'limit' (recently finished tasks returned,
+                default 20), 'operation' (only tasks and histograms whose
+                operation contains this text) and 'reset' (clear finished
+                tasks and histograms after reading).
+
+        Returns:
+            dict: Running tasks, recent tasks, histograms and executor stats,
+            or error information.
+        """
+        limit = self._extract_param(kwargs, "limit", 20)
+        operation = self._extract_param(kwargs, "operation")
+        reset = self._extract_bool_param(kwargs, "reset")
+        try:
+            limit = int(limit)
+            if limit < 0:
+                raise ValueError("limit must not be negative")
+        except (TypeError, ValueError) as e:
+            message = f"Invalid parameter: {e}"
+            self.logger.error(message)
+            return {"valid": False, "error": message, "errors": [message]}
+
+        running = task_registry.running()
+        recent = task_registry.recent(TASK_HISTORY if operation else limit)
+        histograms = task_registry.histograms()
+        if operation:
+            needle = str(operation).lower()
+            running = [t for t in running if needle in t["operation"].lower()]
+            recent = [t for t in recent if needle in t["operation"].lower()][:limit]
+            histograms = {
+                key: value
+                for key, value in histograms.items()
+                if needle in key.lower()
+            }
+        registry = task_registry.stats()
+        if reset:
+            task_registry.clear()
+        stuck = [task for task in running if task["state"] == "orphaned"]
+        return {
+            "valid": True,
+            "errors": [],
+            "running": running,
+            "recent": recent,
+            "operations": histograms,
+            "executors": executors.stats(),
+            **registry,
+            "reset": reset,
+            "message": (
+                f"{len(running)} running task(s)"
+                + (f", {len(stuck)} orphaned after timeout" if stuck else "")
+                + f"; {len(recent)} recent task(s) shown"
+            ),
+        }
+
+
+class ServerCacheStatusTool(MCPToolBase):
+    """
+    Tool that reports usage of the server's cache regions.
+
+    See utilities/cache.py for the regions and their limits.
+    """
+
+    name = "server_cache_status"
+    description = (
+        "Show entries, memory use and hit/miss/eviction counters of each "
+        "server cache region, optionally clearing a region"
+    )
+
+    async def run(self, ctx: Context, **kwargs):
+        """
+        Return per-region cache stats.
+
+        Args:
+            ctx (Context): The MCP context.
+            **kwargs: Optional 'clear' (a region name, or 'all', to clear
+                after reading).
+
+        Returns:
+            dict: Global and per-region stats, or error information.
+        """
+        clear = self._extract_param(kwargs, "clear")
+        stats = cache_manager.stats()
+        if clear and clear != "all" and clear not in stats["regions"]:
+            message = (
+                f"Invalid parameter: unknown cache region '{clear}'; "
+                f"known regions: {', '.join(sorted(stats['regions']))}"
+            )
+            self.logger.error(message)
+            return {"valid": False, "error": message, "errors": [message]}
+        if clear:
+            cache_manager.clear(None if clear == "all" else clear)
+        hits = sum(region["hits"] for region in stats["regions"].values())
+        lookups = hits + sum(
+            region["misses"] for region in stats["regions"].values()
+        )
+        return {
+            "valid": True,
+            "errors": [],
+            **stats,
+            "cleared": clear or None,
+            "message": (
+                f"{len(stats['regions'])} cache region(s), "
+                f"{stats['bytes']} bytes in use, "
+                + (f"{hits / lookups:.0%} hit rate" if lookups else "no lookups yet")
+            ),
+        }
+
+
+def register_tools(mcp: FastMCP):
+    """
+    Register server diagnostics tools with the MCP server.
+
+    Args:
+        mcp (FastMCP): The MCP server instance to register tools with.
+    """
+    ServerTasksStatusTool.register(mcp)
+    ServerCacheStatusTool.register(mcp)
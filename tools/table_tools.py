@@ -8,9 +8,44 @@ It includes utilities to list tables, fetch schema information, and retrieve tab
 from datetime import timedelta
 
 from tools.base import Context, MCPToolBase
-from utilities.cache import cache
-
-from utilities.task_manager import run_in_thread
+from utilities.cache import (
+    REGION_SCHEMAS,
+    REGION_TABLE_DETAILS,
+    REGION_TABLES,
+    RESULT_ERROR,
+    RESULT_NOT_FOUND,
+    RESULT_OK,
+    RESULT_RETRYABLE,
+    cache_manager,
+    is_transient_error,
+)
+from utilities.executors import PRIORITY_INTERACTIVE
+from utilities.retry import get_status_code
+from utilities.timespan import parse_timespan
+
+tables_cache = cache_manager.region(REGION_TABLES)
+schema_cache = cache_manager.region(REGION_SCHEMAS)
+details_cache = cache_manager.region(REGION_TABLE_DETAILS)
+
+
+def _classify_tables(result):
+    """Return the cache category of a sentinel_logs_tables_list result."""
+    if "error" not in result:
+        return RESULT_OK
+    # An empty list may just mean missing access, which can be granted at
+    # any moment, so it is only cached as briefly as any other error
+    return RESULT_ERROR
+
+
+def _classify_schema(result):
+    """Return the cache category of a sentinel_logs_table_schema_get result."""
+    if "error" not in result:
+        return RESULT_OK
+    if result["error"].startswith("No schema found") or (
+        "Failed to resolve table" in result["error"]
+    ):
+        return RESULT_NOT_FOUND
+    return RESULT_ERROR
 
 
 class ListTablesTool(MCPToolBase):
@@ -27,6 +62,8 @@ class ListTablesTool(MCPToolBase):
 
     name = "sentinel_logs_tables_list"
     description = "List available tables in the Log Analytics workspace"
+    # 'search *' across every table is slow on large workspaces
+    query_timeout = 120.0
 
     async def run(self, ctx: Context, **kwargs):
         """
@@ -34,17 +71,50 @@ class ListTablesTool(MCPToolBase):
 
         Args:
             ctx (Context): The MCP tool context.
-            **kwargs: Optional filter_pattern to filter table names.
+            **kwargs: Optional filter_pattern to filter table names and
+                'timespan' (window for lastUpdated/rowCount, default '90d').
 
         Returns:
             dict: Results as described in the class docstring.
         """
         filter_pattern = self._extract_param(kwargs, "filter_pattern", "")
+        timespan_text = self._extract_param(kwargs, "timespan", "90d")
+        try:
+            timespan = parse_timespan(timespan_text)
+        except ValueError as e:
+            return {"error": f"Invalid timespan format: {e}"}
         logs_client, workspace_id = self.get_logs_client_and_workspace(ctx)
-        cache_key = f"tables_json:{workspace_id}:{filter_pattern}"
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
+        cache_key = f"tables_json:{workspace_id}:{filter_pattern}:{timespan_text}"
+        # Past its TTL the cached list is returned at once and refreshed in
+        # the background. Errors are cached briefly, transient ones not at all.
+        return await tables_cache.get_or_load(
+            cache_key,
+            lambda: self._fetch_tables(
+                logs_client, workspace_id, filter_pattern, timespan
+            ),
+            classify=_classify_tables,
+            on_error=self._list_error,
+        )
+
+    def _list_error(self, error):
+        """Build the result returned when listing tables raised."""
+        self.logger.error("Failed to list tables: %s", str(error))
+        return {"error": "Failed to list tables: %s" % str(error)}
+
+    async def _fetch_tables(self, logs_client, workspace_id, filter_pattern, timespan):
+        """
+        Query the workspace's tables with their last update and row count.
+
+        Args:
+            logs_client: The LogsQueryClient, or None if not initialized.
+            workspace_id (str): Log Analytics workspace ID.
+            filter_pattern (str): Only tables whose name contains this text.
+            timespan: Parsed window for lastUpdated/rowCount.
+        Returns:
+            dict: Results as described in the class docstring.
+        Raises:
+            Exception: Query failures, turned into a result by _list_error.
+        """
         if logs_client is None:
             result = {
                 "error": (
@@ -52,10 +122,25 @@ class ListTablesTool(MCPToolBase):
                     "Check your credentials and configuration."
                 )
             }
-            cache.set(cache_key, result)
             return result
-        try:
-            kql_table_info = (
+        kql_table_info = (
+            "search *\n"
+            "| distinct $table\n"
+            "| extend TableName = $table\n"
+            "| project-away $table\n"
+            "| join kind=leftouter (\n"
+            "    union withsource=SourceTable *\n"
+            "    | summarize LastUpdate=max(TimeGenerated),\n"
+            "      RowCount=count() by SourceTable\n"
+            "    | project SourceTable, LastUpdate, RowCount\n"
+            ") on $left.TableName == $right.SourceTable\n"
+            "| project name=TableName, lastUpdated=LastUpdate, "
+            "rowCount=RowCount\n"
+            "| order by name asc"
+        )
+        query = kql_table_info
+        if filter_pattern:
+            query = (
                 "search *\n"
                 "| distinct $table\n"
                 "| extend TableName = $table\n"
@@ -68,56 +153,32 @@ class ListTablesTool(MCPToolBase):
                 ") on $left.TableName == $right.SourceTable\n"
                 "| project name=TableName, lastUpdated=LastUpdate, "
                 "rowCount=RowCount\n"
+                f'| where name contains "{filter_pattern}"\n'
                 "| order by name asc"
             )
-            query = kql_table_info
-            if filter_pattern:
-                query = (
-                    "search *\n"
-                    "| distinct $table\n"
-                    "| extend TableName = $table\n"
-                    "| project-away $table\n"
-                    "| join kind=leftouter (\n"
-                    "    union withsource=SourceTable *\n"
-                    "    | summarize LastUpdate=max(TimeGenerated),\n"
-                    "      RowCount=count() by SourceTable\n"
-                    "    | project SourceTable, LastUpdate, RowCount\n"
-                    ") on $left.TableName == $right.SourceTable\n"
-                    "| project name=TableName, lastUpdated=LastUpdate, "
-                    "rowCount=RowCount\n"
-                    f'| where name contains "{filter_pattern}"\n'
-                    "| order by name asc"
-                )
-            response = await run_in_thread(
-                logs_client.query_workspace,
-                workspace_id=workspace_id,
-                query=query,
-                timespan=timedelta(days=90),
-                name="list_tables_info",
-            )
-            if response and response.tables and len(response.tables[0].rows) > 0:
-                tables = []
-                for row in response.tables[0].rows:
-                    table = {"name": row[0], "lastUpdated": row[1], "rowCount": row[2]}
-                    tables.append(table)
-                result = {"found": len(tables), "tables": tables}
-                cache.set(cache_key, result)
-                return result
-            result = {
-                "found": 0,
-                "tables": [],
-                "error": (
-                    "No tables found. The workspace may be empty "
-                    "or you may not have access to the data."
-                ),
-            }
-            cache.set(cache_key, result)
-            return result
-        except Exception as e:
-            result = {"error": "Failed to list tables: %s" % str(e)}
-            self.logger.error("Failed to list tables: %s", str(e))
-            cache.set(cache_key, result)
+        response = await self.query_workspace(
+            logs_client,
+            workspace_id,
+            query=query,
+            timespan=timespan,
+            name="list_tables_info",
+        )
+        if response and response.tables and len(response.tables[0].rows) > 0:
+            tables = []
+            for row in response.tables[0].rows:
+                table = {"name": row[0], "lastUpdated": row[1], "rowCount": row[2]}
+                tables.append(table)
+            result = {"found": len(tables), "tables": tables}
             return result
+        result = {
+            "found": 0,
+            "tables": [],
+            "error": (
+                "No tables found. The workspace may be empty "
+                "or you may not have access to the data."
+            ),
+        }
+        return result
 
 
 class GetTableSchemaTool(MCPToolBase):
@@ -134,6 +195,7 @@ class GetTableSchemaTool(MCPToolBase):
 
     name = "sentinel_logs_table_schema_get"
     description = "Get schema (columns/types) for a Log Analytics table"
+    query_priority = PRIORITY_INTERACTIVE
 
     async def run(self, ctx: Context, **kwargs):
         """
@@ -151,9 +213,34 @@ class GetTableSchemaTool(MCPToolBase):
             return {"error": "Missing required parameter: table_name"}
         logs_client, workspace_id = self.get_logs_client_and_workspace(ctx)
         cache_key = f"table_schema_json:{workspace_id}:{table_name}"
-        cached = cache.get(cache_key)
-        if cached:
-            return cached
+        # Past its TTL the cached schema is returned at once and refreshed
+        # in the background. Unknown tables are cached like schemas; other
+        # errors briefly, transient ones not at all.
+        return await schema_cache.get_or_load(
+            cache_key,
+            lambda: self._fetch_schema(logs_client, workspace_id, table_name),
+            classify=_classify_schema,
+            on_error=self._schema_error,
+        )
+
+    def _schema_error(self, error):
+        """Build the result returned when the schema query raised."""
+        self.logger.error("Failed to get table schema: %s", str(error))
+        return {"error": "Failed to get table schema: %s" % str(error)}
+
+    async def _fetch_schema(self, logs_client, workspace_id, table_name):
+        """
+        Query the schema of a table.
+
+        Args:
+            logs_client: The LogsQueryClient, or None if not initialized.
+            workspace_id (str): Log Analytics workspace ID.
+            table_name (str): The table.
+        Returns:
+            dict: Results as described in the class docstring.
+        Raises:
+            Exception: Query failures, turned into a result by _schema_error.
+        """
         if logs_client is None:
             result = {
                 "error": (
@@ -161,69 +248,60 @@ class GetTableSchemaTool(MCPToolBase):
                     "Check your credentials and configuration."
                 )
             }
-            cache.set(cache_key, result)
-            return result
-        try:
-            kql_schema = f"{table_name} | getschema"
-            response = await run_in_thread(
-                logs_client.query_workspace,
-                workspace_id=workspace_id,
-                query=kql_schema,
-                timespan=timedelta(days=1),
-                name="get_table_schema",
-            )
-            schema = []
-            if response and response.tables and len(response.tables[0].rows) > 0:
-                columns = response.tables[0].columns
-                rows = response.tables[0].rows
-                # Try to find the canonical getschema columns
-                col_name_idx = col_type_idx = col_data_type_idx = col_ordinal_idx = None
-
-                # Determine if columns are strings or objects
-                def col_name(col):
-                    """Return column name as lowercase string."""
-                    return col.lower() if isinstance(col, str) else col.name.lower()
-
-                for idx, col in enumerate(columns):
-                    cname = col_name(col)
-                    if cname == "columnname":
-                        col_name_idx = idx
-                    elif cname == "columntype":
-                        col_type_idx = idx
-                    elif cname == "datatype":
-                        col_data_type_idx = idx
-                    elif cname == "columnordinal":
-                        col_ordinal_idx = idx
-                if col_name_idx is not None and col_type_idx is not None:
-                    # Return all metadata if available
-                    for row in rows:
-                        entry = {"name": row[col_name_idx], "type": row[col_type_idx]}
-                        if col_data_type_idx is not None:
-                            entry["dataType"] = row[col_data_type_idx]
-                        if col_ordinal_idx is not None:
-                            entry["ordinal"] = row[col_ordinal_idx]
-                        schema.append(entry)
-                else:
-                    # Fallback: return all columns for each row
-                    for row in rows:
-                        schema.append(
-                            {col.name: row[i] for i, col in enumerate(columns)}
-                        )
-                result = {"table": table_name, "schema": schema}
-                cache.set(cache_key, result)
-                return result
-            result = {
-                "table": table_name,
-                "schema": [],
-                "error": f"No schema found for table {table_name}.",
-            }
-            cache.set(cache_key, result)
             return result
-        except Exception as e:
-            result = {"error": "Failed to get table schema: %s" % str(e)}
-            self.logger.error("Failed to get table schema: %s", str(e))
-            cache.set(cache_key, result)
+        kql_schema = f"{table_name} | getschema"
+        response = await self.query_workspace(
+            logs_client,
+            workspace_id,
+            query=kql_schema,
+            timespan=timedelta(days=1),
+            name="get_table_schema",
+        )
+        schema = []
+        if response and response.tables and len(response.tables[0].rows) > 0:
+            columns = response.tables[0].columns
+            rows = response.tables[0].rows
+            # Try to find the canonical getschema columns
+            col_name_idx = col_type_idx = col_data_type_idx = col_ordinal_idx = None
+
+            # Determine if columns are strings or objects
+            def col_name(col):
+                """Return column name as lowercase string."""
+                return col.lower() if isinstance(col, str) else col.name.lower()
+
+            for idx, col in enumerate(columns):
+                cname = col_name(col)
+                if cname == "columnname":
+                    col_name_idx = idx
+                elif cname == "columntype":
+                    col_type_idx = idx
+                elif cname == "datatype":
+                    col_data_type_idx = idx
+                elif cname == "columnordinal":
+                    col_ordinal_idx = idx
+            if col_name_idx is not None and col_type_idx is not None:
+                # Return all metadata if available
+                for row in rows:
+                    entry = {"name": row[col_name_idx], "type": row[col_type_idx]}
+                    if col_data_type_idx is not None:
+                        entry["dataType"] = row[col_data_type_idx]
+                    if col_ordinal_idx is not None:
+                        entry["ordinal"] = row[col_ordinal_idx]
+                    schema.append(entry)
+            else:
+                # Fallback: return all columns for each row
+                for row in rows:
+                    schema.append(
+                        {col.name: row[i] for i, col in enumerate(columns)}
+                    )
+            result = {"table": table_name, "schema": schema}
             return result
+        result = {
+            "table": table_name,
+            "schema": [],
+            "error": f"No schema found for table {table_name}.",
+        }
+        return result
 
 
 class GetTableDetailsTool(MCPToolBase):
@@ -242,6 +320,7 @@ class GetTableDetailsTool(MCPToolBase):
     description = (
         "Get details (metadata, retention, row count, etc.) for a Log Analytics table"
     )
+    query_priority = PRIORITY_INTERACTIVE
 
     async def run(self, ctx: Context, **kwargs):
         """
@@ -249,7 +328,8 @@ class GetTableDetailsTool(MCPToolBase):
 
         Args:
             ctx (Context): The MCP tool context.
-            **kwargs: Must include 'table_name'.
+            **kwargs: Must include 'table_name'; optional 'timespan'
+                (window for lastUpdated/rowCount, default '30d').
 
         Returns:
             dict: Results as described in the class docstring.
@@ -257,11 +337,33 @@ class GetTableDetailsTool(MCPToolBase):
         table_name = self._extract_param(kwargs, "table_name")
         if not table_name:
             return {"error": "Missing required parameter: table_name"}
+        timespan_text = self._extract_param(kwargs, "timespan", "30d")
+        try:
+            timespan = parse_timespan(timespan_text)
+        except ValueError as e:
+            return {"error": f"Invalid timespan format: {e}"}
         logs_client, workspace_id = self.get_logs_client_and_workspace(ctx)
-        cache_key = f"table_details_json:{workspace_id}:{table_name}"
-        cached = cache.get(cache_key)
+        cache_key = f"table_details_json:{workspace_id}:{table_name}:{timespan_text}"
+        cached = await details_cache.get_async(cache_key)
         if cached:
             return cached
+        result, category = await self._fetch_details(
+            ctx, logs_client, workspace_id, table_name, timespan, timespan_text
+        )
+        details_cache.set(cache_key, result, category=category)
+        return result
+
+    async def _fetch_details(
+        self, ctx, logs_client, workspace_id, table_name, timespan, timespan_text
+    ):
+        """
+        Collect ARM metadata and KQL statistics for a table.
+
+        Returns:
+            tuple: (result as described in the class docstring, its cache
+            category): retryable if any part failed transiently, not_found
+            if ARM reports no such table, error for other failures.
+        """
         # Get Azure context
         resource_group = None
         workspace_name = None
@@ -279,6 +381,9 @@ class GetTableDetailsTool(MCPToolBase):
             subscription_id = getattr(services_ctx, "subscription_id", None)
         errors = []
         result = {"table": table_name}
+        # Any transient failure keeps the partial result out of the cache
+        transient = False
+        not_found = False
         # --- REST API METADATA ---
         try:
             if resource_group and workspace_name and subscription_id:
@@ -357,6 +462,8 @@ class GetTableDetailsTool(MCPToolBase):
                     )
                 except Exception as e:
                     errors.append("REST API call error: %s" % str(e))
+                    transient = transient or is_transient_error(e)
+                    not_found = get_status_code(e) == 404
                     self.logger.error(
                         "Error during REST API call for table %s: %s", table_name, e
                     )
@@ -372,6 +479,7 @@ class GetTableDetailsTool(MCPToolBase):
                 )
         except Exception as e:
             errors.append("REST API client error: %s" % str(e))
+            transient = transient or is_transient_error(e)
         # --- KQL METADATA ---
         if logs_client:
             # Query for lastUpdated
@@ -379,11 +487,11 @@ class GetTableDetailsTool(MCPToolBase):
                 kql_last_updated = (
                     f"{table_name}\n| summarize lastUpdated=max(TimeGenerated)"
                 )
-                last_updated_resp = await run_in_thread(
-                    logs_client.query_workspace,
-                    workspace_id=workspace_id,
+                last_updated_resp = await self.query_workspace(
+                    logs_client,
+                    workspace_id,
                     query=kql_last_updated,
-                    timespan=timedelta(days=30),
+                    timespan=timespan,
                     name="get_table_last_updated",
                 )
                 if (
@@ -397,20 +505,23 @@ class GetTableDetailsTool(MCPToolBase):
                     result["lastUpdated"] = None
             except TimeoutError:
                 errors.append(
-                    "KQL timeout: lastUpdated query exceeded time limit (30 days)"
+                    "KQL timeout: lastUpdated query exceeded time limit "
+                    f"({timespan_text})"
                 )
                 result["lastUpdated"] = None
+                transient = True
             except Exception as e:
                 errors.append(f"KQL error (lastUpdated): {str(e)}")
+                transient = transient or is_transient_error(e)
                 result["lastUpdated"] = None
             # Query for rowCount
             try:
                 kql_row_count = f"{table_name}\n| count"
-                row_count_resp = await run_in_thread(
-                    logs_client.query_workspace,
-                    workspace_id=workspace_id,
+                row_count_resp = await self.query_workspace(
+                    logs_client,
+                    workspace_id,
                     query=kql_row_count,
-                    timespan=timedelta(days=30),
+                    timespan=timespan,
                     name="get_table_row_count",
                 )
                 if (
@@ -424,17 +535,23 @@ class GetTableDetailsTool(MCPToolBase):
                     result["rowCount"] = 0
             except TimeoutError:
                 errors.append(
-                    "KQL timeout: rowCount query exceeded time limit (30 days)"
+                    f"KQL timeout: rowCount query exceeded time limit ({timespan_text})"
                 )
                 result["rowCount"] = 0
+                transient = True
             except Exception as e:
                 errors.append(f"KQL error (rowCount): {str(e)}")
+                transient = transient or is_transient_error(e)
                 result["rowCount"] = 0
         else:
             errors.append("logs_client missing.")
         if errors:
             result["errors"] = errors
-        return result
+        if not errors:
+            return result, RESULT_OK
+        if transient:
+            return result, RESULT_RETRYABLE
+        return result, RESULT_NOT_FOUND if not_found else RESULT_ERROR
 
 
 def register_tools(mcp):
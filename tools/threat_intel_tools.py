@@ -20,6 +20,8 @@ class SentinelThreatIntelligenceIndicatorsListTool(MCPToolBase):
         dict: {
             'indicators': list,  # List of indicators as returned by the API
             'count': int,        # Number of indicators returned
+            'pages': int,        # Number of API pages read
+            'truncated': bool,   # True if more indicators exist than were returned
             'valid': bool,       # True if successful
             'error': str (optional)
         }
@@ -34,11 +36,13 @@ class SentinelThreatIntelligenceIndicatorsListTool(MCPToolBase):
 
         Args:
             ctx (Context): The MCP tool context.
-            **kwargs: Not used.
+            **kwargs: Optional 'max_items' (default 1000) to cap the number of
+                indicators returned.
 
         Returns:
             dict: Results as described in the class docstring.
         """
+        max_items = int(self._extract_param(kwargs, "max_items", 1000))
         workspace_name, resource_group, subscription_id = self.get_azure_context(ctx)
         valid = self.validate_azure_context(
             True, workspace_name, resource_group, subscription_id, self.logger
@@ -52,8 +56,8 @@ class SentinelThreatIntelligenceIndicatorsListTool(MCPToolBase):
                 f"workspaces/{workspace_name}/providers/Microsoft.SecurityInsights/"
                 f"threatIntelligence/main/indicators?api-version=2024-01-01-preview"
             )
-            response = await self.call_api(ctx, "GET", url, name="list_ti_indicators")
-            indicators = response.get("value", [])
+            pages = self.call_api_paged(ctx, "GET", url, max_items=max_items)
+            indicators = await pages.collect()
             result = []
             for indicator in indicators:
                 info = {
@@ -73,7 +77,17 @@ class SentinelThreatIntelligenceIndicatorsListTool(MCPToolBase):
                 info["validUntil"] = props.get("validUntil")
                 info["description"] = props.get("description")
                 result.append(info)
-            return {"indicators": result, "count": len(result), "valid": True}
+            if pages.truncated:
+                self.logger.warning(
+                    "Threat intelligence listing truncated at %d indicators", len(result)
+                )
+            return {
+                "indicators": result,
+                "count": len(result),
+                "pages": pages.pages,
+                "truncated": pages.truncated,
+                "valid": True,
+            }
         except Exception as e:
             self.logger.error("Error retrieving threat intelligence indicators: %s", e)
             return {
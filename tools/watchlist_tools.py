@@ -41,11 +41,13 @@ class SentinelWatchlistsListTool(MCPToolBase):
             return {"error": "Azure SecurityInsights client is not initialized"}
 
         try:
-            # List all watchlists
+            # List all watchlists (pages are fetched in the worker thread)
             watchlists = await run_in_thread(
-                client.watchlists.list,
-                resource_group_name=resource_group,
-                workspace_name=workspace_name,
+                list,
+                client.watchlists.list(
+                    resource_group_name=resource_group,
+                    workspace_name=workspace_name,
+                ),
             )
 
             result = []
@@ -237,10 +239,12 @@ class SentinelWatchlistItemsListTool(MCPToolBase):
         try:
             # List all items in the watchlist
             watchlist_items = await run_in_thread(
-                client.watchlist_items.list,
-                resource_group_name=resource_group,
-                workspace_name=workspace_name,
-                watchlist_alias=watchlist_alias,
+                list,
+                client.watchlist_items.list(
+                    resource_group_name=resource_group,
+                    workspace_name=workspace_name,
+                    watchlist_alias=watchlist_alias,
+                ),
             )
 
             result = []
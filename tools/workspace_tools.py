@@ -144,7 +144,9 @@ class SentinelSourceControlsListTool(MCPToolBase):
         }
         try:
             client = self.get_securityinsight_client(subscription_id)
-            controls = client.source_controls.list(resource_group, workspace_name)
+            controls = await run_in_thread(
+                list, client.source_controls.list(resource_group, workspace_name)
+            )
             controls_list = []
             for ctrl in controls:
                 controls_list.append(
@@ -217,8 +219,11 @@ class SentinelSourceControlGetTool(MCPToolBase):
         workspace_name, resource_group, subscription_id = self.get_azure_context(ctx)
         try:
             client = self.get_securityinsight_client(subscription_id)
-            ctrl = client.source_controls.get(
-                resource_group, workspace_name, source_control_id
+            ctrl = await run_in_thread(
+                client.source_controls.get,
+                resource_group,
+                workspace_name,
+                source_control_id,
             )
             result["source_control"] = {
                 "id": getattr(ctrl, "id", None),
@@ -278,7 +283,9 @@ class SentinelMetadataListTool(MCPToolBase):
         }
         try:
             client = self.get_securityinsight_client(subscription_id)
-            metadata_objs = client.metadata.list(resource_group, workspace_name)
+            metadata_objs = await run_in_thread(
+                list, client.metadata.list(resource_group, workspace_name)
+            )
             metadata_list = []
             for meta in metadata_objs:
                 metadata_list.append(
@@ -362,7 +369,9 @@ class SentinelMetadataGetTool(MCPToolBase):
         workspace_name, resource_group, subscription_id = self.get_azure_context(ctx)
         try:
             client = self.get_securityinsight_client(subscription_id)
-            meta = client.metadata.get(resource_group, workspace_name, metadata_id)
+            meta = await run_in_thread(
+                client.metadata.get, resource_group, workspace_name, metadata_id
+            )
 
             def _serialize_model(obj):
                 if hasattr(obj, "as_dict"):
@@ -427,8 +436,11 @@ class SentinelMLAnalyticsSettingsListTool(MCPToolBase):
         try:
             client = self.get_securityinsight_client(subscription_id)
             # Use the preview API version for ML Analytics support
-            ml_settings_paged = client.security_ml_analytics_settings.list(
-                resource_group, workspace_name
+            ml_settings_paged = await run_in_thread(
+                list,
+                client.security_ml_analytics_settings.list(
+                    resource_group, workspace_name
+                ),
             )
             settings = []
             for s in ml_settings_paged:
@@ -488,8 +500,11 @@ class SentinelMLAnalyticsSettingGetTool(MCPToolBase):
             return result
         try:
             client = self.get_securityinsight_client(subscription_id)
-            s = client.security_ml_analytics_settings.get(
-                resource_group, workspace_name, setting_name
+            s = await run_in_thread(
+                client.security_ml_analytics_settings.get,
+                resource_group,
+                workspace_name,
+                setting_name,
             )
             s_dict = s.as_dict() if hasattr(s, "as_dict") else dict(s)
             enriched = {
@@ -526,7 +541,10 @@ class SentinelMLAnalyticsSettingGetTool(MCPToolBase):
                     enriched["properties"] = {"raw": str(props)}
             # Attempt to find analytic rules that reference this ML setting
             analytic_rules = []
-            for rule in client.alert_rules.list(resource_group, workspace_name):
+            rules = await run_in_thread(
+                list, client.alert_rules.list(resource_group, workspace_name)
+            )
+            for rule in rules:
                 rule_dict = rule.as_dict() if hasattr(rule, "as_dict") else dict(rule)
                 found_ref = False
                 for val in rule_dict.values():
@@ -5,34 +5,54 @@ UTILITIES: api_utils.py
 Utility functions for making direct Azure REST API calls.
 """
 
-from typing import Any, Dict, Generator, Optional
+import asyncio
+from typing import Any, AsyncGenerator, Dict, Generator, Optional
 
+import httpx
 import requests
 from azure.identity import CredentialUnavailableError, DefaultAzureCredential
+from utilities.client_registry import client_registry
+from utilities.executors import EXECUTOR_ARM, PRIORITY_INTERACTIVE, run_in_executor
+from utilities.http_session import async_http_session, http_session
 from utilities.logging import get_tool_logger
+from utilities.rate_limiter import rate_limiters
+from utilities.retry import is_replay_safe, retry_async, retry_call
+from utilities.token_cache import token_cache_for
 
 logger = get_tool_logger("api_utils")
 
+ARM_SCOPE = "https://management.azure.com/.default"
+
 
 class AzureApiClient:
     """
     Client for making authenticated Azure REST API calls using Azure Active Directory credentials.
 
     Provides token management and utility methods for robust, paginated REST API access.
+    Tokens come from the shared, expiry-aware token cache for the credential, so
+    they are only requested upstream when missing or about to expire. Throttled
+    (429) and transient failures are retried by the shared retry engine
+    (utilities/retry.py), honoring Retry-After, and every request passes the
+    per-endpoint adaptive rate limiter (utilities/rate_limiter.py).
     """
+
+    scope = ARM_SCOPE
+    # Named executor for blocking token fetches (see utilities/executors.py)
+    executor = EXECUTOR_ARM
+
     def __init__(self, credential: Optional[DefaultAzureCredential] = None):
         """
         Initialize the AzureApiClient.
 
         Args:
-            credential (Optional[DefaultAzureCredential]): An optional Azure credential instance. If not provided, DefaultAzureCredential is used.
+            credential (Optional[DefaultAzureCredential]): An optional Azure credential instance. If not provided, the shared process-wide credential is used.
         """
-        self.credential = credential or DefaultAzureCredential()
+        self.credential = credential or client_registry.get_credential()
         self._token = None
 
     def get_token(self) -> str:
         """
-        Acquire and cache a bearer token for Azure REST API authentication.
+        Return a cached (or freshly acquired) bearer token for this client's scope.
 
         Returns:
             str: The acquired bearer token as a string.
@@ -42,9 +62,7 @@ class AzureApiClient:
             Exception: For any other errors during token acquisition.
         """
         try:
-            token = self.credential.get_token(
-                "https://management.azure.com/.default"
-            ).token
+            token = token_cache_for(self.credential).get_token(self.scope)
             self._token = token
             return token
         except CredentialUnavailableError as e:
@@ -83,29 +101,27 @@ class AzureApiClient:
             requests.exceptions.Timeout: If the request times out.
             Exception: For any other errors during the REST call.
         """
-        if not self._token:
-            self.get_token()
-        session = requests.Session()
+        token = self.get_token()
         req_headers = headers.copy() if headers else {}
-        req_headers["Authorization"] = f"Bearer {self._token}"
+        req_headers["Authorization"] = f"Bearer {token}"
         req_headers["Content-Type"] = "application/json"
 
         page = 0
         while url and page < max_pages:
             try:
-                resp = session.request(
+                data = retry_call(
+                    self._send_request,
                     method,
                     url,
                     params=params,
                     headers=req_headers,
-                    json=body,
-                    timeout=30,
+                    body=body,
+                    name=f"{method} {url.split('?')[0]}",
+                    replay_safe=is_replay_safe(method, url),
                 )
-                resp.raise_for_status()
-                data = resp.json()
                 yield data
                 # Pagination: Azure REST APIs use 'nextLink' for paging
-                url = data.get("nextLink")
+                url = get_next_link(data)
                 params = None  # nextLink already has all params
                 page += 1
             except requests.exceptions.HTTPError as e:
@@ -125,3 +141,328 @@ class AzureApiClient:
             logger.warning(
                 "Max pages (%s) reached during Azure REST API pagination.", max_pages
             )
+
+    def _send_request(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> Dict[str, Any]:
+        """Send one rate-limited request on the shared session and decode the JSON body."""
+        rate_limiters.acquire(url)
+        # Shared keep-alive session: connections are pooled per host
+        resp = http_session.request(
+            method,
+            url,
+            params=params,
+            headers=headers,
+            json=body,
+            timeout=30,
+        )
+        rate_limiters.record(url, resp.status_code, resp.headers)
+        resp.raise_for_status()
+        return resp.json()
+
+    async def get_token_async(self) -> str:
+        """
+        Acquire a bearer token without blocking the event loop.
+
+        A usable cached token is returned inline; only an upstream fetch
+        (which is synchronous in azure-identity) is delegated to this client's
+        executor, ahead of queued bulk work since every request waits on it.
+
+        Returns:
+            str: The acquired bearer token as a string.
+        """
+        token = token_cache_for(self.credential).peek(self.scope)
+        if token:
+            self._token = token
+            return token
+        return await run_in_executor(
+            self.executor, self.get_token, priority=PRIORITY_INTERACTIVE
+        )
+
+    async def _request_page_async(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        body: Optional[dict] = None,
+    ) -> Dict[str, Any]:
+        """
+        Send a single REST request on the shared async pool and decode the JSON body.
+
+        Throttled and transient failures are retried by the shared retry engine;
+        5xx responses and timeouts only for requests that are safe to replay.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            params (Optional[dict]): Query parameters.
+            headers (Optional[dict]): Additional headers.
+            body (Optional[dict]): JSON body.
+        Returns:
+            Dict[str, Any]: The decoded response page.
+        Raises:
+            httpx.HTTPStatusError: If an HTTP error occurs.
+            httpx.TimeoutException: If the request times out.
+        """
+        token = await self.get_token_async()
+        req_headers = headers.copy() if headers else {}
+        req_headers["Authorization"] = f"Bearer {token}"
+        req_headers["Content-Type"] = "application/json"
+
+        async def send():
+            await rate_limiters.acquire_async(url)
+            resp = await async_http_session.request(
+                method,
+                url,
+                params=params,
+                headers=req_headers,
+                json=body,
+                timeout=30,
+            )
+            rate_limiters.record(url, resp.status_code, resp.headers)
+            resp.raise_for_status()
+            return resp.json()
+
+        try:
+            return await retry_async(
+                send,
+                name=f"{method} {url.split('?')[0]}",
+                replay_safe=is_replay_safe(method, url),
+            )
+        except httpx.HTTPStatusError as e:
+            logger.error(
+                "HTTP error during Azure REST call: %s (Status: %s)",
+                e,
+                e.response.status_code,
+            )
+            raise
+        except httpx.TimeoutException:
+            logger.error("Timeout during Azure REST API call.")
+            raise
+        except Exception as e:
+            logger.error("Unexpected error during Azure REST call: %s", e)
+            raise
+
+    async def call_azure_rest_api_async(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        body: Optional[dict] = None,
+        max_pages: int = 10
+    ) -> AsyncGenerator[Dict[str, Any], None]:
+        """
+        Asyncio-native variant of call_azure_rest_api.
+
+        Requests are sent through the shared httpx connection pool and awaited
+        directly, so an in-flight call does not occupy an executor thread.
+
+        Args:
+            method (str): HTTP method to use (e.g., 'GET', 'POST').
+            url (str): The Azure REST API endpoint URL.
+            params (Optional[dict]): Query parameters for the request.
+            headers (Optional[dict]): Additional headers to include in the request.
+            body (Optional[dict]): JSON body to send with the request.
+            max_pages (int): Maximum number of paginated results to fetch.
+
+        Yields:
+            Dict[str, Any]: The response data for each page as a dictionary.
+
+        Raises:
+            httpx.HTTPStatusError: If an HTTP error occurs.
+            httpx.TimeoutException: If the request times out.
+            Exception: For any other errors during the REST call.
+        """
+        page = 0
+        while url and page < max_pages:
+            data = await self._request_page_async(
+                method, url, params=params, headers=headers, body=body
+            )
+            yield data
+            url = get_next_link(data)
+            params = None  # nextLink already has all params
+            page += 1
+        if page == max_pages:
+            logger.warning(
+                "Max pages (%s) reached during Azure REST API pagination.", max_pages
+            )
+
+    def iter_pages(
+        self,
+        method: str,
+        url: str,
+        *,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        body: Optional[dict] = None,
+        max_pages: Optional[int] = None,
+        max_items: Optional[int] = None,
+    ) -> "PageStream":
+        """
+        Stream result pages with next-page prefetch and item/page limits.
+
+        Args:
+            method (str): HTTP method to use.
+            url (str): The Azure REST API endpoint URL.
+            params (Optional[dict]): Query parameters for the first request.
+            headers (Optional[dict]): Additional headers.
+            body (Optional[dict]): JSON body.
+            max_pages (Optional[int]): Stop after this many pages.
+            max_items (Optional[int]): Stop after this many items in 'value'.
+        Returns:
+            PageStream: Async iterator of pages; check .truncated when done.
+        """
+        return PageStream(
+            self,
+            method,
+            url,
+            params=params,
+            headers=headers,
+            body=body,
+            max_pages=max_pages,
+            max_items=max_items,
+        )
+
+
+def get_next_link(page: Dict[str, Any]) -> Optional[str]:
+    """
+    Return the continuation URL of a REST response page.
+
+    ARM uses 'nextLink'; Microsoft Graph uses '@odata.nextLink'.
+
+    Args:
+        page (dict): A decoded response page.
+    Returns:
+        Optional[str]: The next page URL, or None on the last page.
+    """
+    if not isinstance(page, dict):
+        return None
+    return page.get("nextLink") or page.get("@odata.nextLink")
+
+
+class PageStream:
+    """
+    Async iterator over paginated REST results.
+
+    While the caller processes page N, page N+1 is already being fetched, so
+    a listing costs roughly one round-trip per page overlapped with
+    processing. Limits are applied as pages arrive: the 'value' list of the
+    last page is trimmed to max_items, and truncated is set when results were
+    left on the server.
+
+    Attributes:
+        truncated (bool): True if more results existed than were returned.
+        pages (int): Number of pages yielded so far.
+        items (int): Number of 'value' items yielded so far.
+        next_link (Optional[str]): Continuation URL when truncated by limits.
+    """
+
+    def __init__(
+        self,
+        client: AzureApiClient,
+        method: str,
+        url: str,
+        *,
+        params: Optional[dict] = None,
+        headers: Optional[dict] = None,
+        body: Optional[dict] = None,
+        max_pages: Optional[int] = None,
+        max_items: Optional[int] = None,
+    ):
+        self._client = client
+        self._method = method
+        self._headers = headers
+        self._body = body
+        self.max_pages = max_pages
+        self.max_items = max_items
+        self.truncated = False
+        self.pages = 0
+        self.items = 0
+        self.next_link: Optional[str] = None
+        self._first = (url, params) if url else None
+        self._pending: Optional[asyncio.Task] = None
+
+    def _start(self, url: str, params: Optional[dict]) -> asyncio.Task:
+        return asyncio.ensure_future(
+            self._client._request_page_async(  # pylint: disable=protected-access
+                self._method, url, params=params, headers=self._headers, body=self._body
+            )
+        )
+
+    def __aiter__(self) -> "PageStream":
+        return self
+
+    async def __anext__(self) -> Dict[str, Any]:
+        if self._first is not None:
+            self._pending = self._start(*self._first)
+            self._first = None
+        if self._pending is None:
+            raise StopAsyncIteration
+        pending, self._pending = self._pending, None
+        data = await pending
+        self.pages += 1
+
+        values = data.get("value") if isinstance(data, dict) else None
+        if isinstance(values, list) and self.max_items is not None:
+            room = max(self.max_items - self.items, 0)
+            if len(values) > room:
+                data = dict(data)
+                data["value"] = values[:room]
+                values = data["value"]
+                self.truncated = True
+        if isinstance(values, list):
+            self.items += len(values)
+
+        next_link = get_next_link(data)
+        limit_hit = (self.max_pages is not None and self.pages >= self.max_pages) or (
+            self.max_items is not None and self.items >= self.max_items
+        )
+        if next_link and limit_hit:
+            self.truncated = True
+            self.next_link = next_link
+        elif next_link and not self.truncated:
+            # Prefetch the next page while the caller handles this one
+            self._pending = self._start(next_link, None)
+        return data
+
+    async def collect(self) -> list:
+        """
+        Drain the stream and return all 'value' items.
+
+        Returns:
+            list: Items from every page, subject to the stream limits.
+        """
+        items = []
+        try:
+            async for page in self:
+                items.extend(page.get("value", []))
+        finally:
+            await self.aclose()
+        return items
+
+    async def aclose(self) -> None:
+        """Cancel any in-flight prefetch."""
+        self._first = None
+        pending, self._pending = self._pending, None
+        if pending is not None and not pending.done():
+            pending.cancel()
+            try:
+                await pending
+            except (asyncio.CancelledError, Exception):
+                pass
+
+    async def __aenter__(self) -> "PageStream":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.aclose()
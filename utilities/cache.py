@@ -1,24 +1,714 @@
+"""
+FILE: utilities/cache.py
+DESCRIPTION:
+    Namespaced, size-aware in-memory cache.
+
+    The cache manager holds named regions (table lists, schemas, table
+    details, Graph permissions, query results). Each region has its own TTL,
+    entry limit and byte budget, so a burst of one kind of lookup cannot
+    evict everything else. Entry sizes are estimated with approx_sizeof().
+
+    All regions also share a global memory ceiling (MCP_CACHE_MAX_BYTES).
+    When it is exceeded, least recently used entries are evicted from the
+    region holding the most bytes. Region limits can be overridden with
+    MCP_CACHE_<REGION>_TTL, MCP_CACHE_<REGION>_MAX_ENTRIES and
+    MCP_CACHE_<REGION>_MAX_BYTES. Every region counts hits, misses, stores,
+    expirations and evictions.
+
+    Failures are cached by category: "not found" results for
+    MCP_CACHE_NOT_FOUND_TTL (an hour by default), other errors for only
+    MCP_CACHE_ERROR_TTL (30 s), and retryable failures (throttling,
+    timeouts, transient network errors) never, so a passing throttle is not
+    pinned in the cache. Both TTLs can be set per region as
+    MCP_CACHE_<REGION>_NOT_FOUND_TTL and MCP_CACHE_<REGION>_ERROR_TTL.
+
+    Metadata regions (table lists and schemas) also serve stale
+    values: for MCP_CACHE_<REGION>_STALE_TTL seconds after an entry expires,
+    get_or_load() returns it at once and refreshes it in the background
+    through the task manager, with at most one refresh per key at a time.
+
+    Regions in PERSISTENT_REGIONS can be backed by the optional SQLite tier
+    in utilities/disk_cache.py (MCP_DISK_CACHE=1): successful entries with
+    string keys are written through to disk, and a
+    memory miss is looked up there before the caller goes to Azure, so a
+    restarted server answers from the previous process's entries until
+    they expire. Values in those regions are kept in their JSON form
+    (datetimes as ISO 8601 strings) in memory too, so their types do not
+    change across a restart. Disk reads and writes run on the "disk"
+    executor, outside the region lock and off the event loop: writes are
+    queued without waiting, and only get_or_load() and get_async() look
+    the disk tier up; get() and get_entry() stay memory-only.
+"""
+
+import asyncio
+import json
+import logging
+import os
+import sys
+import time
+from collections import OrderedDict
 from threading import RLock
-from cachetools import TTLCache
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Set, Tuple
+
+from utilities.disk_cache import DiskCache
+from utilities.executors import (
+    EXECUTOR_DISK,
+    ExecutorBusyError,
+    executors,
+    run_in_executor,
+)
+from utilities.retry import is_retryable, reset_retry_budget, start_retry_budget
+from utilities.task_manager import create_tracked_task
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+
+REGION_TABLES = "tables"
+REGION_SCHEMAS = "schemas"
+REGION_TABLE_DETAILS = "table_details"
+REGION_GRAPH_PERMISSIONS = "graph_permissions"
+REGION_QUERY_RESULTS = "query_results"
+
+# name -> (ttl seconds, max entries, max bytes); 0 entries/bytes means no limit
+REGION_DEFAULTS = {
+    REGION_TABLES: (600, 64, 16 * 1024 * 1024),
+    REGION_SCHEMAS: (1800, 512, 16 * 1024 * 1024),
+    REGION_TABLE_DETAILS: (600, 256, 8 * 1024 * 1024),
+    REGION_GRAPH_PERMISSIONS: (600, 16, 1024 * 1024),
+    REGION_QUERY_RESULTS: (300, 0, 64 * 1024 * 1024),
+}
+# Regions created without an entry in REGION_DEFAULTS
+FALLBACK_DEFAULTS = (600, 1024, 16 * 1024 * 1024)
+# name -> seconds an expired entry may still be served while it is refreshed
+REGION_STALE_TTL = {
+    REGION_TABLES: 3600,
+    REGION_SCHEMAS: 6 * 3600,
+}
+
+# Workspace metadata regions kept in the disk tier when it is enabled
+PERSISTENT_REGIONS = (REGION_TABLES, REGION_SCHEMAS, REGION_TABLE_DETAILS)
+
+# Result categories; they decide how long (and whether) a value is cached
+RESULT_OK = "ok"
+RESULT_NOT_FOUND = "not_found"
+RESULT_ERROR = "error"
+RESULT_RETRYABLE = "retryable"
+RESULT_CATEGORIES = (RESULT_OK, RESULT_NOT_FOUND, RESULT_ERROR, RESULT_RETRYABLE)
+DEFAULT_ERROR_TTL = 30
+DEFAULT_NOT_FOUND_TTL = 3600
+
+# Deeper structures are counted at the size of their containers only
+_SIZEOF_MAX_DEPTH = 8
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a non-negative integer from the environment, falling back to default."""
+    try:
+        value = int(os.environ.get(name, default))
+        return value if value >= 0 else default
+    except (TypeError, ValueError):
+        logger.warning("Invalid value for %s; using %d", name, default)
+        return default
+
+
+def is_transient_error(error: BaseException) -> bool:
+    """
+    Return True if a failure is likely to pass on its own and must not be
+    cached: throttling, transient HTTP and network errors, timeouts and a
+    busy executor.
+    """
+    if isinstance(error, (TimeoutError, asyncio.TimeoutError, ExecutorBusyError)):
+        return True
+    return is_retryable(error)
+
+
+def approx_sizeof(obj: Any) -> int:
+    """
+    Estimate the memory held by an object graph in bytes.
+
+    Containers, their items and the attributes of plain objects are counted
+    recursively; shared objects are counted once.
+
+    Args:
+        obj: The object to measure.
+    Returns:
+        int: Approximate size in bytes.
+    """
+    seen = set()
+
+    def size(value: Any, depth: int) -> int:
+        if id(value) in seen:
+            return 0
+        seen.add(id(value))
+        total = sys.getsizeof(value, 64)
+        if depth >= _SIZEOF_MAX_DEPTH or isinstance(value, (str, bytes, int, float)):
+            return total
+        if isinstance(value, dict):
+            for key, item in value.items():
+                total += size(key, depth + 1) + size(item, depth + 1)
+        elif isinstance(value, (list, tuple, set, frozenset)):
+            for item in value:
+                total += size(item, depth + 1)
+        elif hasattr(value, "__dict__"):
+            total += size(vars(value), depth + 1)
+        return total
+
+    return size(obj, 0)
+
+
+class CacheRegion:
+    """
+    One named LRU region with its own TTL and limits.
+
+    Regions are created through CacheManager.region() and share the
+    manager's lock and global memory ceiling. An expired successful entry
+    is kept for stale_ttl more seconds, during which only get_or_load()
+    returns it. A region with a disk tier writes ok entries through to it
+    and reads it on a memory miss.
+    """
+
+    def __init__(
+        self,
+        manager: "CacheManager",
+        name: str,
+        ttl: float,
+        max_entries: int,
+        max_bytes: int,
+        stale_ttl: float = 0,
+        error_ttl: float = DEFAULT_ERROR_TTL,
+        not_found_ttl: float = DEFAULT_NOT_FOUND_TTL,
+        disk: Optional[DiskCache] = None,
+    ):
+        self.manager = manager
+        self.name = name
+        self.ttl = ttl
+        self.max_entries = max_entries
+        self.max_bytes = max_bytes
+        self.stale_ttl = stale_ttl
+        self.error_ttl = error_ttl
+        self.not_found_ttl = not_found_ttl
+        self.disk = disk
+        self._refreshing: Set[Hashable] = set()
+        # key -> (stored_at, expires_at, size, value, category)
+        self._entries: "OrderedDict[Hashable, Tuple[float, float, int, Any, str]]" = (
+            OrderedDict()
+        )
+        self.bytes = 0
+        self._stats = {
+            "hits": 0,
+            "misses": 0,
+            "stores": 0,
+            "expirations": 0,
+            "evictions": 0,
+            "stale_hits": 0,
+            "refreshes": 0,
+            "refresh_failures": 0,
+            "negative_stores": 0,
+            "retryable_skips": 0,
+            "disk_hits": 0,
+        }
+
+    def _lookup(self, key: Hashable, allow_stale: bool) -> Optional[Tuple]:
+        """
+        Find an entry and count the lookup (caller holds the lock).
+
+        Returns:
+            Optional[tuple]: (value, age in seconds, fresh), or None on a miss.
+        """
+        now = time.monotonic()
+        entry = self._entries.get(key)
+        stale_ttl = self.stale_ttl if entry and entry[4] == RESULT_OK else 0
+        if entry is not None and now >= entry[1] + stale_ttl:
+            self._remove(key)
+            self._stats["expirations"] += 1
+            entry = None
+        fresh = entry is not None and now < entry[1]
+        if entry is None or not (fresh or allow_stale):
+            self._stats["misses"] += 1
+            return None
+        self._entries.move_to_end(key)
+        self._stats["hits" if fresh else "stale_hits"] += 1
+        return entry[3], now - entry[0], fresh
+
+    async def _lookup_async(
+        self, key: Hashable, allow_stale: bool
+    ) -> Optional[Tuple]:
+        """
+        Like _lookup(), but a memory miss is looked up in the disk tier first.
+
+        Returns:
+            Optional[tuple]: (value, age in seconds, fresh), or None on a miss.
+        """
+        with self.manager.lock:
+            on_disk = (
+                self.disk is not None
+                and isinstance(key, str)
+                and key not in self._entries
+            )
+        if on_disk:
+            await self._load_from_disk(key)
+        with self.manager.lock:
+            return self._lookup(key, allow_stale)
+
+    async def _load_from_disk(self, key: str) -> None:
+        """Copy an entry from the disk tier into memory, if it is there."""
+        try:
+            found = await run_in_executor(EXECUTOR_DISK, self.disk.get, self.name, key)
+        except (ExecutorBusyError, RuntimeError) as e:
+            logger.debug("Skipping disk cache lookup: %s", e)
+            return
+        if found is None:
+            return
+        value, category, stored_at, expires_at = found
+        # Disk times are wall-clock; memory entries use the monotonic clock
+        offset = time.monotonic() - time.time()
+        with self.manager.lock:
+            # A newer value may have been stored while the disk was read
+            if key in self._entries:
+                return
+            self._insert(
+                key,
+                (
+                    stored_at + offset,
+                    expires_at + offset,
+                    approx_sizeof(value),
+                    value,
+                    category,
+                ),
+            )
+            self._stats["disk_hits"] += 1
+
+    def _write_to_disk(self, func: Callable[..., None], *args: Any) -> None:
+        """Queue a disk tier write on the disk executor without waiting for it."""
+        try:
+            executors.get(EXECUTOR_DISK).submit(lambda: func(*args))
+        except (ExecutorBusyError, RuntimeError) as e:
+            # The disk tier is only a warm start; memory stays authoritative
+            logger.debug("Skipping disk cache write: %s", e)
+
+    def get_entry(self, key: Hashable) -> Optional[Tuple[Any, float]]:
+        """
+        Look up a fresh value and its age in memory.
+
+        Args:
+            key: The entry key.
+        Returns:
+            Optional[tuple]: (value, age in seconds), or None on a miss.
+        """
+        with self.manager.lock:
+            found = self._lookup(key, allow_stale=False)
+        return None if found is None else found[:2]
+
+    async def get_or_load(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        classify: Optional[Callable[[Any], str]] = None,
+        on_error: Optional[Callable[[Exception], Any]] = None,
+    ) -> Any:
+        """
+        Return a cached value, loading it on a miss (stale-while-revalidate).
+
+        A fresh value is returned as is. An expired successful value still
+        within the region's stale_ttl is returned at once and a background
+        refresh is scheduled, unless one is already running for the key. On
+        a miss the loader is awaited and its result cached according to its
+        category (see set()).
+
+        Args:
+            key: The entry key.
+            loader: Coroutine function producing the value.
+            classify (callable, optional): Returns the RESULT_* category of
+                a value (default: RESULT_OK). A refresh only replaces the
+                stale value with an RESULT_OK or RESULT_NOT_FOUND value.
+            on_error (callable, optional): Turns an exception raised by the
+                loader into the value to return. The value is cached as
+                RESULT_RETRYABLE for transient errors (i.e. not at all) and
+                as classified otherwise. Without it, exceptions propagate.
+        Returns:
+            The cached or loaded value.
+        """
+        found = await self._lookup_async(key, allow_stale=True)
+        if found is not None:
+            value, _, fresh = found
+            if not fresh:
+                self._schedule_refresh(key, loader, classify)
+            return value
+        try:
+            value = await loader()
+            transient = False
+        except Exception as e:
+            if on_error is None:
+                raise
+            value = on_error(e)
+            transient = is_transient_error(e)
+        if transient:
+            category = RESULT_RETRYABLE
+        else:
+            category = classify(value) if classify else RESULT_OK
+        # Return the value as later hits will see it
+        value, text = self._normalize(value)
+        self._store(key, value, text, None, None, category)
+        return value
+
+    def _schedule_refresh(
+        self,
+        key: Hashable,
+        loader: Callable[[], Awaitable[Any]],
+        classify: Optional[Callable[[Any], str]],
+    ) -> None:
+        """Start a background refresh of key unless one is running."""
+        with self.manager.lock:
+            if key in self._refreshing:
+                return
+            self._refreshing.add(key)
+
+        async def refresh():
+            # The refresh outlives the tool call that triggered it
+            budget = start_retry_budget()
+            stored = False
+            try:
+                value = await loader()
+                category = classify(value) if classify else RESULT_OK
+                if category in (RESULT_OK, RESULT_NOT_FOUND):
+                    stored = self.set(key, value, category=category)
+            except Exception as e:
+                logger.warning("Refreshing '%s' cache entry failed: %s", self.name, e)
+            finally:
+                reset_retry_budget(budget)
+                with self.manager.lock:
+                    self._refreshing.discard(key)
+                    self._stats["refreshes" if stored else "refresh_failures"] += 1
+
+        create_tracked_task(
+            refresh(),
+            timeout=None,
+            name=f"cache_refresh_{self.name}",
+            operation=f"cache_refresh:{self.name}",
+        )
+
+    def get(self, key: Hashable, default: Any = None) -> Any:
+        """Return the cached value for key from memory, or default on a miss."""
+        entry = self.get_entry(key)
+        return default if entry is None else entry[0]
+
+    async def get_async(self, key: Hashable, default: Any = None) -> Any:
+        """Return the fresh value for key from memory or the disk tier."""
+        found = await self._lookup_async(key, allow_stale=False)
+        return default if found is None else found[0]
+
+    def set(
+        self,
+        key: Hashable,
+        value: Any,
+        ttl: Optional[float] = None,
+        size: Optional[int] = None,
+        category: str = RESULT_OK,
+    ) -> bool:
+        """
+        Store a value, evicting least recently used entries to stay in budget.
+
+        The category picks the default TTL: the region's ttl for RESULT_OK,
+        not_found_ttl for RESULT_NOT_FOUND and error_ttl for RESULT_ERROR.
+        RESULT_RETRYABLE values (throttling, timeouts, transient failures)
+        are never stored. Values larger than the region's byte budget are
+        not cached.
+
+        Args:
+            key: The entry key.
+            value: The value to cache.
+            ttl (float, optional): Seconds the entry stays valid (default:
+                by category).
+            size (int, optional): Size in bytes, if the caller already knows
+                it (default: approx_sizeof(value)).
+            category (str): One of RESULT_CATEGORIES.
+        Returns:
+            bool: True if the value was stored.
+        Raises:
+            ValueError: If the category is unknown.
+        """
+        value, text = self._normalize(value)
+        return self._store(key, value, text, ttl, size, category)
+
+    def _normalize(self, value: Any) -> Tuple[Any, Optional[str]]:
+        """
+        Return a value as the region keeps it, and its disk encoding.
+
+        Persistent regions keep the JSON round trip of the value (datetimes
+        become ISO 8601 strings), so a value has the same types whether it
+        was stored by this process or read back from disk after a restart.
+        Values the disk tier cannot encode are kept as they are.
+
+        Returns:
+            tuple: (value, JSON text or None if not persisted).
+        """
+        if self.disk is None:
+            return value, None
+        text = self.disk.encode(value)
+        return (value, None) if text is None else (json.loads(text), text)
+
+    def _store(
+        self,
+        key: Hashable,
+        value: Any,
+        text: Optional[str],
+        ttl: Optional[float],
+        size: Optional[int],
+        category: str,
+    ) -> bool:
+        """Store a normalized value; see set()."""
+        if category not in RESULT_CATEGORIES:
+            raise ValueError(f"unknown cache result category '{category}'")
+        if category == RESULT_RETRYABLE:
+            with self.manager.lock:
+                self._stats["retryable_skips"] += 1
+            return False
+        if ttl is None:
+            ttl = {
+                RESULT_OK: self.ttl,
+                RESULT_NOT_FOUND: self.not_found_ttl,
+                RESULT_ERROR: self.error_ttl,
+            }[category]
+        if ttl <= 0:
+            return False
+        size = approx_sizeof(value) if size is None else size
+        if self.max_bytes and size > self.max_bytes:
+            logger.debug(
+                "Cache entry of %d bytes exceeds the '%s' region budget",
+                size,
+                self.name,
+            )
+            return False
+        now = time.monotonic()
+        with self.manager.lock:
+            self._insert(key, (now, now + ttl, size, value, category))
+            self._stats["stores"] += 1
+            if category != RESULT_OK:
+                self._stats["negative_stores"] += 1
+        # Negative answers stay in memory: they can change at any moment
+        # (e.g. access being granted) and should not outlive a restart
+        if text is not None and isinstance(key, str) and category == RESULT_OK:
+            wall = time.time()
+            keep_until = wall + ttl + self.stale_ttl
+            self._write_to_disk(
+                self.disk.set,
+                self.name,
+                key,
+                text,
+                category,
+                wall,
+                wall + ttl,
+                keep_until,
+            )
+        return True
+
+    def _insert(self, key: Hashable, entry: Tuple) -> None:
+        """Store an entry, evicting to stay in budget (caller holds the lock)."""
+        size = entry[2]
+        if key in self._entries:
+            self._remove(key)
+        while self._entries and (
+            (self.max_bytes and self.bytes + size > self.max_bytes)
+            or (self.max_entries and len(self._entries) >= self.max_entries)
+        ):
+            self.evict_oldest()
+        self._entries[key] = entry
+        self.bytes += size
+        self.manager.enforce_ceiling(protect=(self, key))
+
+    def delete(self, key: Hashable) -> None:
+        """Drop an entry if present, in memory and on disk."""
+        with self.manager.lock:
+            if key in self._entries:
+                self._remove(key)
+        if self.disk is not None and isinstance(key, str):
+            self._write_to_disk(self.disk.delete, self.name, key)
+
+    def evict_oldest(self) -> None:
+        """Evict the least recently used entry (caller holds the lock)."""
+        self._remove(next(iter(self._entries)))
+        self._stats["evictions"] += 1
+
+    def _remove(self, key: Hashable) -> None:
+        """Drop an entry (caller holds the lock)."""
+        self.bytes -= self._entries.pop(key)[2]
+
+    def clear(self) -> None:
+        """Drop all entries, in memory and on disk."""
+        with self.manager.lock:
+            self._entries.clear()
+            self.bytes = 0
+        if self.disk is not None:
+            self._write_to_disk(self.disk.clear, self.name)
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return limits, usage and counters."""
+        with self.manager.lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "ttl": self.ttl,
+                "stale_ttl": self.stale_ttl,
+                "error_ttl": self.error_ttl,
+                "not_found_ttl": self.not_found_ttl,
+                "max_entries": self.max_entries,
+                "max_bytes": self.max_bytes,
+                "persistent": self.disk is not None,
+                **self._stats,
+            }
+
+
+class CacheManager:
+    """
+    Registry of named cache regions sharing a global memory ceiling.
+    """
+
+    def __init__(
+        self, max_bytes: Optional[int] = None, disk: Optional[DiskCache] = None
+    ):
+        """
+        Initialize the manager.
+
+        Args:
+            max_bytes (int, optional): Global ceiling across all regions
+                (default: MCP_CACHE_MAX_BYTES or 256 MiB; 0 for no ceiling).
+            disk (DiskCache, optional): Disk tier for PERSISTENT_REGIONS
+                (default: a DiskCache if MCP_DISK_CACHE is 1/true/yes).
+        """
+        if disk is None and os.environ.get("MCP_DISK_CACHE", "0").lower() in (
+            "1",
+            "true",
+            "yes",
+        ):
+            disk = DiskCache()
+        self.disk = disk
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else _env_int("MCP_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+        )
+        self.error_ttl = _env_int("MCP_CACHE_ERROR_TTL", DEFAULT_ERROR_TTL)
+        self.not_found_ttl = _env_int("MCP_CACHE_NOT_FOUND_TTL", DEFAULT_NOT_FOUND_TTL)
+        self.lock = RLock()
+        self._regions: Dict[str, CacheRegion] = {}
+
+    def region(
+        self,
+        name: str,
+        ttl: Optional[float] = None,
+        max_entries: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ) -> CacheRegion:
+        """
+        Return the named region, creating it on first use.
+
+        Limits passed here replace the region's defaults; environment
+        overrides (MCP_CACHE_<NAME>_TTL, _MAX_ENTRIES, _MAX_BYTES) apply to
+        limits that are not passed. The stale window comes from
+        REGION_STALE_TTL or MCP_CACHE_<NAME>_STALE_TTL, and the error and
+        not-found TTLs from MCP_CACHE_<NAME>_ERROR_TTL and _NOT_FOUND_TTL
+        (default: the manager's). Regions in PERSISTENT_REGIONS use the
+        manager's disk tier, if any. Limits of an existing region are not
+        changed.
+
+        Args:
+            name (str): Region name.
+            ttl (float, optional): Default entry lifetime in seconds.
+            max_entries (int, optional): Entry limit (0 for none).
+            max_bytes (int, optional): Byte budget (0 for none).
+        Returns:
+            CacheRegion: The region.
+        """
+        with self.lock:
+            region = self._regions.get(name)
+            if region is None:
+                default_ttl, default_entries, default_bytes = REGION_DEFAULTS.get(
+                    name, FALLBACK_DEFAULTS
+                )
+                prefix = f"MCP_CACHE_{name.upper()}"
+                region = self._regions[name] = CacheRegion(
+                    self,
+                    name,
+                    ttl if ttl is not None else _env_int(f"{prefix}_TTL", default_ttl),
+                    (
+                        max_entries
+                        if max_entries is not None
+                        else _env_int(f"{prefix}_MAX_ENTRIES", default_entries)
+                    ),
+                    (
+                        max_bytes
+                        if max_bytes is not None
+                        else _env_int(f"{prefix}_MAX_BYTES", default_bytes)
+                    ),
+                    _env_int(f"{prefix}_STALE_TTL", REGION_STALE_TTL.get(name, 0)),
+                    _env_int(f"{prefix}_ERROR_TTL", self.error_ttl),
+                    _env_int(f"{prefix}_NOT_FOUND_TTL", self.not_found_ttl),
+                    self.disk if name in PERSISTENT_REGIONS else None,
+                )
+            return region
+
+    @property
+    def bytes(self) -> int:
+        """Approximate bytes held by all regions."""
+        with self.lock:
+            return sum(region.bytes for region in self._regions.values())
+
+    def enforce_ceiling(self, protect: Optional[Tuple[CacheRegion, Any]] = None):
+        """
+        Evict from the largest regions until the global ceiling is met.
 
+        Args:
+            protect (tuple, optional): (region, key) of an entry that must
+                not be evicted, normally the one just stored.
+        """
+        if not self.max_bytes:
+            return
+        with self.lock:
+            while self.bytes > self.max_bytes:
+                candidates = [
+                    region
+                    for region in self._regions.values()
+                    if len(region) > (1 if protect and region is protect[0] else 0)
+                ]
+                if not candidates:
+                    return
+                largest = max(candidates, key=lambda region: region.bytes)
+                largest.evict_oldest()
 
-class Cache:
-    def __init__(self, ttl=600, max_size=1024):
-        self._cache = TTLCache(maxsize=max_size, ttl=ttl)
-        self._lock = RLock()
+    def clear(self, name: Optional[str] = None) -> None:
+        """
+        Drop all entries of one region, or of every region.
 
-    def get(self, key):
-        with self._lock:
-            return self._cache.get(key, None)
+        Raises:
+            KeyError: If the named region does not exist.
+        """
+        with self.lock:
+            regions = [self._regions[name]] if name else list(self._regions.values())
+        for region in regions:
+            region.clear()
 
-    def set(self, key, value):
-        with self._lock:
-            self._cache[key] = value
+    def stats(self) -> Dict[str, Any]:
+        """Return global usage, per-region stats and disk tier stats."""
+        with self.lock:
+            stats = {
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "regions": {
+                    name: region.stats() for name, region in self._regions.items()
+                },
+            }
+        stats["disk"] = self.disk.stats() if self.disk is not None else None
+        return stats
 
-    def clear(self):
-        with self._lock:
-            self._cache.clear()
+    def close(self) -> None:
+        """Flush and close the disk tier, if any."""
+        if self.disk is not None:
+            self.disk.close()
 
 
-# Singleton cache instance
-cache = Cache()
+# Shared cache manager for the whole server process
+cache_manager = CacheManager()
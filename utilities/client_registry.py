@@ -0,0 +1,212 @@
+"""
+FILE: utilities/client_registry.py
+DESCRIPTION:
+    Process-wide registry of the Azure credential and SDK clients.
+
+    Creating a DefaultAzureCredential probes the whole credential chain and
+    acquires a fresh token, and every management client owns its own HTTP
+    connection pool. The registry builds both once (seeded from the lifespan
+    AzureServicesContext when running under the MCP server) and hands out the
+    same long-lived instances, keyed by (client type, subscription ID).
+
+    Only clients the registry built itself are closed by close(); clients
+    seeded through configure() stay owned by whoever created them.
+"""
+
+import logging
+from threading import RLock
+from typing import Any, Callable, Dict, Optional, Set, Tuple
+
+from utilities.retry import sdk_client_kwargs
+
+logger = logging.getLogger(__name__)
+
+# Client type keys
+CLIENT_LOGS = "logs"
+CLIENT_METRICS = "metrics"
+CLIENT_LOGANALYTICS = "loganalytics"
+CLIENT_SECURITYINSIGHT = "securityinsight"
+CLIENT_AUTHORIZATION = "authorization"
+
+
+# pylint: disable=import-outside-toplevel
+def _build_logs_client(credential, _subscription_id):
+    """Build a LogsQueryClient (not subscription scoped)."""
+    from azure.monitor.query import LogsQueryClient
+
+    return LogsQueryClient(credential, **sdk_client_kwargs())
+
+
+def _build_metrics_client(credential, _subscription_id):
+    """Build a MetricsQueryClient (not subscription scoped)."""
+    from azure.monitor.query import MetricsQueryClient
+
+    return MetricsQueryClient(credential, **sdk_client_kwargs())
+
+
+def _build_loganalytics_client(credential, subscription_id):
+    """Build a LogAnalyticsManagementClient for a subscription."""
+    from azure.mgmt.loganalytics import LogAnalyticsManagementClient
+
+    return LogAnalyticsManagementClient(
+        credential, subscription_id, **sdk_client_kwargs()
+    )
+
+
+def _build_securityinsight_client(credential, subscription_id):
+    """Build a SecurityInsights client for a subscription."""
+    from azure.mgmt.securityinsight import SecurityInsights
+
+    return SecurityInsights(credential, subscription_id, **sdk_client_kwargs())
+
+
+def _build_authorization_client(credential, subscription_id):
+    """Build an AuthorizationManagementClient for a subscription."""
+    from azure.mgmt.authorization import AuthorizationManagementClient
+
+    return AuthorizationManagementClient(
+        credential, subscription_id, **sdk_client_kwargs()
+    )
+
+
+# pylint: enable=import-outside-toplevel
+
+_CLIENT_FACTORIES: Dict[str, Callable[[Any, Optional[str]], Any]] = {
+    CLIENT_LOGS: _build_logs_client,
+    CLIENT_METRICS: _build_metrics_client,
+    CLIENT_LOGANALYTICS: _build_loganalytics_client,
+    CLIENT_SECURITYINSIGHT: _build_securityinsight_client,
+    CLIENT_AUTHORIZATION: _build_authorization_client,
+}
+
+
+class AzureClientRegistry:
+    """
+    Thread-safe registry of a shared Azure credential and SDK clients.
+
+    Clients are created lazily on first use and reused for the lifetime of
+    the process (or until close() is called at server shutdown).
+    """
+
+    def __init__(self):
+        self._lock = RLock()
+        self._credential = None
+        self._owns_credential = False
+        self._clients: Dict[Tuple[str, str], Any] = {}
+        # Keys of the clients built (and therefore closed) by the registry
+        self._owned: Set[Tuple[str, str]] = set()
+
+    def configure(self, services_ctx) -> None:
+        """
+        Seed the registry from the lifespan AzureServicesContext.
+
+        Reuses the caller's credential and the clients it has already built
+        for the configured subscription. Seeded clients are not owned by the
+        registry: close() leaves them for their creator to close, and a key
+        that already holds a client is left untouched.
+
+        Args:
+            services_ctx: The AzureServicesContext created by the server lifespan.
+        """
+        subscription_id = getattr(services_ctx, "subscription_id", "") or ""
+        seeded = {
+            CLIENT_LOGS: getattr(services_ctx, "logs_client", None),
+            CLIENT_SECURITYINSIGHT: getattr(
+                services_ctx, "security_insights_client", None
+            ),
+            CLIENT_LOGANALYTICS: getattr(services_ctx, "loganalytics_client", None),
+        }
+        with self._lock:
+            credential = getattr(services_ctx, "credential", None)
+            if credential is not None and self._credential is None:
+                self._credential = credential
+                self._owns_credential = False
+            for client_type, client in seeded.items():
+                if client is None:
+                    continue
+                key_sub = "" if client_type == CLIENT_LOGS else subscription_id
+                self._clients.setdefault((client_type, key_sub), client)
+        logger.info(
+            "Client registry configured with %d lifespan clients", len(self._clients)
+        )
+
+    def get_credential(self):
+        """
+        Return the shared Azure credential, creating a DefaultAzureCredential if needed.
+
+        Returns:
+            TokenCredential: The process-wide credential.
+        """
+        with self._lock:
+            if self._credential is None:
+                # pylint: disable=import-outside-toplevel
+                from azure.identity import DefaultAzureCredential
+
+                self._credential = DefaultAzureCredential()
+                self._owns_credential = True
+            return self._credential
+
+    def get_client(self, client_type: str, subscription_id: Optional[str] = None):
+        """
+        Return the shared client of the given type for a subscription.
+
+        Args:
+            client_type (str): One of the CLIENT_* constants.
+            subscription_id (str, optional): Azure subscription ID. Ignored for
+                clients that are not subscription scoped.
+        Returns:
+            Any: The cached (or newly built) Azure SDK client.
+        Raises:
+            ValueError: If client_type is unknown.
+        """
+        factory = _CLIENT_FACTORIES.get(client_type)
+        if factory is None:
+            raise ValueError(f"Unknown Azure client type: {client_type}")
+        scoped = client_type not in (CLIENT_LOGS, CLIENT_METRICS)
+        key = (client_type, subscription_id or "" if scoped else "")
+        with self._lock:
+            client = self._clients.get(key)
+            if client is None:
+                client = factory(self.get_credential(), subscription_id)
+                self._clients[key] = client
+                self._owned.add(key)
+                logger.debug("Created %s client for '%s'", client_type, key[1])
+            return client
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the registered client keys for diagnostics."""
+        with self._lock:
+            return {
+                "credential": type(self._credential).__name__
+                if self._credential
+                else None,
+                "clients": [f"{ctype}:{sub}" for ctype, sub in self._clients],
+            }
+
+    def close(self) -> None:
+        """
+        Close the clients (and credential) the registry created and forget the rest.
+
+        Seeded clients are dropped from the registry but not closed, since
+        their creator may still be using them.
+        """
+        with self._lock:
+            clients = [
+                client for key, client in self._clients.items() if key in self._owned
+            ]
+            self._clients.clear()
+            self._owned.clear()
+            credential = self._credential if self._owns_credential else None
+            self._credential = None
+            self._owns_credential = False
+        for client in clients + ([credential] if credential else []):
+            close = getattr(client, "close", None)
+            if callable(close):
+                try:
+                    close()
+                except Exception as e:
+                    logger.warning("Error closing %s: %s", type(client).__name__, e)
+
+
+# Singleton registry instance
+client_registry = AzureClientRegistry()
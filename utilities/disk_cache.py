@@ -0,0 +1,381 @@
+"""
+FILE: utilities/disk_cache.py
+DESCRIPTION:
+    Optional SQLite tier behind the in-memory cache regions.
+
+    Workspace metadata (table lists, schemas, table details) rarely changes,
+    yet every server restart fetched all of it again from Azure. With
+    MCP_DISK_CACHE=1, regions listed in PERSISTENT_REGIONS (utilities/cache.py)
+    write successful entries through to a SQLite file, and a
+    memory miss looks the key up there before calling Azure. Nothing is
+    preloaded: a cold start pays one local read per key on first use.
+
+    Entries keep their wall-clock expiry, so a value read back after a
+    restart has only its remaining TTL (and stale window) left. Rows are
+    tagged with CACHE_FORMAT_VERSION; bump it whenever the shape of a cached
+    value changes and rows written by other versions are ignored and purged.
+
+    The file lives at MCP_DISK_CACHE_PATH (default: ms-sentinel-mcp/cache.sqlite3
+    in the per-user cache directory, $XDG_CACHE_HOME or ~/.cache, or
+    %LOCALAPPDATA% on Windows) and is pruned to MCP_DISK_CACHE_MAX_BYTES,
+    oldest entries first. Cached entries are trusted as tool results, so a
+    file is only used if it is a regular file owned by the current user and
+    not accessible to others, in a directory others cannot write to. Any
+    SQLite or file error, or a failed check, disables the tier for the rest
+    of the process; the in-memory cache keeps working.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import stat
+import time
+from datetime import date, datetime
+from threading import Lock
+from typing import Any, Dict, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+# Bump when the shape of any persisted value changes
+CACHE_FORMAT_VERSION = 1
+# Writes between two checks of the byte budget
+PRUNE_INTERVAL = 100
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS entries (
+    region TEXT NOT NULL,
+    key TEXT NOT NULL,
+    value TEXT NOT NULL,
+    category TEXT NOT NULL,
+    stored_at REAL NOT NULL,
+    expires_at REAL NOT NULL,
+    keep_until REAL NOT NULL,
+    size INTEGER NOT NULL,
+    version INTEGER NOT NULL,
+    PRIMARY KEY (region, key)
+);
+CREATE INDEX IF NOT EXISTS entries_stored_at ON entries (stored_at);
+"""
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a non-negative integer from the environment, falling back to default."""
+    try:
+        value = int(os.environ.get(name, default))
+        return value if value >= 0 else default
+    except (TypeError, ValueError):
+        logger.warning("Invalid value for %s; using %d", name, default)
+        return default
+
+
+def default_path() -> str:
+    """Return the default cache file in the current user's cache directory."""
+    base = (
+        os.environ.get("LOCALAPPDATA")
+        if os.name == "nt"
+        else os.environ.get("XDG_CACHE_HOME")
+    ) or os.path.join(os.path.expanduser("~"), ".cache")
+    return os.path.join(base, "ms-sentinel-mcp", "cache.sqlite3")
+
+
+def _check_private(path: str, mode_mask: int) -> None:
+    """
+    Refuse a path not owned by the current user or open to others.
+
+    Args:
+        path (str): File or directory to check (symlinks are not followed).
+        mode_mask (int): Permission bits that must not be set.
+    Raises:
+        PermissionError: If the check fails.
+    """
+    if not hasattr(os, "getuid"):
+        # No POSIX ownership on Windows; the per-user directory protects it
+        return
+    info = os.lstat(path)
+    if stat.S_ISLNK(info.st_mode):
+        raise PermissionError(f"{path} is a symbolic link")
+    if info.st_uid != os.getuid():
+        raise PermissionError(f"{path} is not owned by the current user")
+    if info.st_mode & mode_mask:
+        raise PermissionError(
+            f"{path} has unsafe permissions {stat.filemode(info.st_mode)}"
+        )
+
+
+def _json_default(value: Any) -> Any:
+    """Encode datetimes (as returned by the Logs SDK) as ISO 8601 strings."""
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    raise TypeError(f"{type(value).__name__} is not JSON serializable")
+
+
+class DiskCache:
+    """
+    SQLite key-value store of cache entries, keyed on (region, key).
+
+    The connection is opened lazily on first use and shared by all threads
+    under a lock. Values are stored as JSON (see encode()); values that
+    cannot be encoded are not persisted.
+    """
+
+    def __init__(self, path: Optional[str] = None, max_bytes: Optional[int] = None):
+        """
+        Initialize the store without touching the file.
+
+        Args:
+            path (str, optional): SQLite file (default: MCP_DISK_CACHE_PATH
+                or default_path()).
+            max_bytes (int, optional): Budget for stored values (default:
+                MCP_DISK_CACHE_MAX_BYTES or 64 MiB; 0 for no limit).
+        """
+        self.path = path or os.environ.get("MCP_DISK_CACHE_PATH") or default_path()
+        self.max_bytes = (
+            max_bytes
+            if max_bytes is not None
+            else _env_int("MCP_DISK_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES)
+        )
+        self._lock = Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._failed = False
+        self._writes_since_prune = 0
+        self._stats = {"loads": 0, "writes": 0, "skipped": 0, "pruned": 0}
+
+    def _connect(self) -> Optional[sqlite3.Connection]:
+        """Open the file on first use (caller holds the lock)."""
+        if self._conn is not None or self._failed:
+            return self._conn
+        try:
+            self._prepare_file()
+            conn = sqlite3.connect(
+                self.path, timeout=5, isolation_level=None, check_same_thread=False
+            )
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            purged = conn.execute(
+                "DELETE FROM entries WHERE version != ? OR keep_until <= ?",
+                (CACHE_FORMAT_VERSION, time.time()),
+            ).rowcount
+            self._conn = conn
+            self._stats["pruned"] += purged
+            logger.info("Disk cache opened at %s", self.path)
+        except (sqlite3.Error, OSError) as e:
+            self._disable(e)
+        return self._conn
+
+    def _prepare_file(self) -> None:
+        """
+        Create the file privately, or check an existing one before use.
+
+        Cached entries are returned as tool results, so a file another user
+        could have created or can write to must not be read.
+
+        Raises:
+            OSError: If the file cannot be created or fails the checks.
+        """
+        directory = os.path.dirname(os.path.abspath(self.path))
+        os.makedirs(directory, mode=0o700, exist_ok=True)
+        # Others must not be able to replace the file or its -wal/-shm files
+        _check_private(directory, stat.S_IWGRP | stat.S_IWOTH)
+        try:
+            fd = os.open(
+                self.path,
+                os.O_CREAT | os.O_EXCL | os.O_WRONLY | getattr(os, "O_NOFOLLOW", 0),
+                0o600,
+            )
+            os.close(fd)
+        except FileExistsError:
+            pass
+        _check_private(self.path, stat.S_IRWXG | stat.S_IRWXO)
+        if not stat.S_ISREG(os.lstat(self.path).st_mode):
+            raise PermissionError(f"{self.path} is not a regular file")
+
+    def _disable(self, error: Exception) -> None:
+        """Stop using the file after an error (caller holds the lock)."""
+        logger.warning("Disk cache at %s disabled: %s", self.path, error)
+        self._failed = True
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except sqlite3.Error:
+                pass
+            self._conn = None
+
+    def get(self, region: str, key: str) -> Optional[Tuple[Any, str, float, float]]:
+        """
+        Read an entry that has not passed its keep_until time.
+
+        Args:
+            region (str): Region name.
+            key (str): Entry key.
+        Returns:
+            Optional[tuple]: (value, category, stored_at, expires_at) with
+            wall-clock times, or None if absent.
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return None
+            try:
+                row = conn.execute(
+                    "SELECT value, category, stored_at, expires_at FROM entries "
+                    "WHERE region = ? AND key = ? AND version = ? AND keep_until > ?",
+                    (region, key, CACHE_FORMAT_VERSION, time.time()),
+                ).fetchone()
+            except sqlite3.Error as e:
+                self._disable(e)
+                return None
+            if row is None:
+                return None
+            self._stats["loads"] += 1
+        return json.loads(row[0]), row[1], row[2], row[3]
+
+    def encode(self, value: Any) -> Optional[str]:
+        """
+        Return the JSON text stored for a value.
+
+        Datetimes are encoded as ISO 8601 strings.
+
+        Returns:
+            Optional[str]: The text, or None if the value cannot be
+            persisted (not JSON-serializable, or larger than max_bytes).
+        """
+        try:
+            text = json.dumps(value, default=_json_default)
+        except (TypeError, ValueError):
+            text = None
+        if text is None or (self.max_bytes and len(text) > self.max_bytes):
+            with self._lock:
+                self._stats["skipped"] += 1
+            return None
+        return text
+
+    def set(
+        self,
+        region: str,
+        key: str,
+        text: str,
+        category: str,
+        stored_at: float,
+        expires_at: float,
+        keep_until: float,
+    ) -> bool:
+        """
+        Write an entry, replacing any previous value.
+
+        Args:
+            region (str): Region name.
+            key (str): Entry key.
+            text (str): The value as returned by encode().
+            category (str): Result category of the value.
+            stored_at (float): Wall-clock time the value was produced.
+            expires_at (float): Wall-clock time the value stops being fresh.
+            keep_until (float): Wall-clock time the row may be deleted
+                (expires_at plus any stale window).
+        Returns:
+            bool: True if the entry was written.
+        """
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return False
+            try:
+                conn.execute(
+                    "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    (
+                        region,
+                        key,
+                        text,
+                        category,
+                        stored_at,
+                        expires_at,
+                        keep_until,
+                        len(text),
+                        CACHE_FORMAT_VERSION,
+                    ),
+                )
+                self._stats["writes"] += 1
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= PRUNE_INTERVAL:
+                    self._prune(conn)
+            except sqlite3.Error as e:
+                self._disable(e)
+                return False
+        return True
+
+    def _prune(self, conn: sqlite3.Connection) -> None:
+        """Drop dead rows, then oldest rows over budget (caller holds the lock)."""
+        self._writes_since_prune = 0
+        pruned = conn.execute(
+            "DELETE FROM entries WHERE keep_until <= ?", (time.time(),)
+        ).rowcount
+        if self.max_bytes:
+            total = conn.execute(
+                "SELECT COALESCE(SUM(size), 0) FROM entries"
+            ).fetchone()[0]
+            if total > self.max_bytes:
+                # Keep the newest rows that fit the budget
+                pruned += conn.execute(
+                    "DELETE FROM entries WHERE rowid IN ("
+                    "SELECT rowid FROM (SELECT rowid, SUM(size) OVER "
+                    "(ORDER BY stored_at DESC) AS running FROM entries) "
+                    "WHERE running > ?)",
+                    (self.max_bytes,),
+                ).rowcount
+        self._stats["pruned"] += pruned
+
+    def delete(self, region: str, key: str) -> None:
+        """Drop an entry if present."""
+        self._execute("DELETE FROM entries WHERE region = ? AND key = ?", (region, key))
+
+    def clear(self, region: Optional[str] = None) -> None:
+        """Drop all entries of one region, or of every region."""
+        if region is None:
+            self._execute("DELETE FROM entries", ())
+        else:
+            self._execute("DELETE FROM entries WHERE region = ?", (region,))
+
+    def _execute(self, sql: str, params: Tuple) -> None:
+        """Run a write statement, disabling the tier on error."""
+        with self._lock:
+            conn = self._connect()
+            if conn is None:
+                return
+            try:
+                conn.execute(sql, params)
+            except sqlite3.Error as e:
+                self._disable(e)
+
+    def close(self) -> None:
+        """Prune and close the file; it is reopened on next use."""
+        with self._lock:
+            if self._conn is None:
+                return
+            try:
+                self._prune(self._conn)
+                self._conn.close()
+            except sqlite3.Error as e:
+                logger.warning("Closing disk cache at %s failed: %s", self.path, e)
+            self._conn = None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the file path, usage and counters."""
+        with self._lock:
+            conn = self._connect()
+            entries = size = 0
+            if conn is not None:
+                try:
+                    entries, size = conn.execute(
+                        "SELECT COUNT(*), COALESCE(SUM(size), 0) FROM entries"
+                    ).fetchone()
+                except sqlite3.Error as e:
+                    self._disable(e)
+            return {
+                "path": self.path,
+                "enabled": not self._failed,
+                "entries": entries,
+                "bytes": size,
+                "max_bytes": self.max_bytes,
+                **self._stats,
+            }
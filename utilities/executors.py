@@ -0,0 +1,331 @@
+"""
+FILE: utilities/executors.py
+DESCRIPTION:
+    Named, bounded, prioritized thread pools for blocking work.
+
+    Blocking calls are split by workload so a slow class of work cannot
+    starve another:
+
+    - query: Log Analytics queries (LogsQueryClient).
+    - arm:   Azure Resource Manager / Sentinel management SDK calls.
+    - graph: Microsoft Graph SDK calls.
+    - cpu:   Local CPU-bound work such as KQL validation.
+    - disk:  Reads and writes of the disk cache tier (one worker, so writes
+             land in the order they were made).
+
+    Each executor has its own worker count (MCP_EXECUTOR_<NAME>_WORKERS) and
+    queue limit (MCP_EXECUTOR_<NAME>_MAX_QUEUE). Queued work runs in priority
+    order (lower first, FIFO within a priority). Work submitted to a full
+    queue is rejected with ExecutorBusyError instead of waiting unboundedly.
+    Work cancelled while still queued never runs. The submitting task's
+    contextvars (such as the retry budget) are carried into the worker.
+"""
+
+import asyncio
+import contextvars
+import functools
+import itertools
+import logging
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+logger = logging.getLogger(__name__)
+
+R = TypeVar("R")
+
+EXECUTOR_QUERY = "query"
+EXECUTOR_ARM = "arm"
+EXECUTOR_GRAPH = "graph"
+EXECUTOR_CPU = "cpu"
+EXECUTOR_DISK = "disk"
+
+# Lower values run first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_NORMAL = 10
+PRIORITY_BULK = 20
+
+# name -> (default workers, default queue limit)
+EXECUTOR_DEFAULTS = {
+    EXECUTOR_QUERY: (8, 200),
+    EXECUTOR_ARM: (8, 200),
+    EXECUTOR_GRAPH: (4, 100),
+    EXECUTOR_CPU: (max(1, min(4, os.cpu_count() or 1)), 100),
+    EXECUTOR_DISK: (1, 1000),
+}
+
+_SHUTDOWN = object()
+
+
+class ExecutorBusyError(RuntimeError):
+    """Raised when work is submitted to an executor whose queue is full."""
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to default."""
+    try:
+        value = int(os.environ.get(name, default))
+        return value if value > 0 else default
+    except (TypeError, ValueError):
+        logger.warning("Invalid value for %s; using %d", name, default)
+        return default
+
+
+class _WorkItem:
+    """One submitted call and its timing."""
+
+    __slots__ = ("future", "fn", "enqueued", "started", "dequeued")
+
+    def __init__(self, future: Future, fn: Callable[[], Any]):
+        self.future = future
+        self.fn = fn
+        self.enqueued = time.perf_counter()
+        self.started: Optional[float] = None
+        # Set once the item no longer counts against max_queue
+        self.dequeued = False
+
+
+class PriorityExecutor:
+    """
+    Thread pool with a bounded priority queue and usage counters.
+    """
+
+    def __init__(self, name: str, max_workers: int, max_queue: int):
+        """
+        Initialize the executor. Worker threads start on demand.
+
+        Args:
+            name (str): Executor name, used for thread names and metrics.
+            max_workers (int): Maximum worker threads.
+            max_queue (int): Maximum queued (not yet running) work items.
+        """
+        self.name = name
+        self.max_workers = max_workers
+        self.max_queue = max_queue
+        self._queue: "queue.PriorityQueue" = queue.PriorityQueue()
+        self._sequence = itertools.count()
+        self._threads = []
+        self._lock = threading.Lock()
+        self._queued = 0
+        self._active = 0
+        self._idle = 0
+        self._shutdown = False
+        self._stats = {
+            "submitted": 0,
+            "completed": 0,
+            "failed": 0,
+            "cancelled": 0,
+            "rejected": 0,
+            "max_queued": 0,
+            "queue_wait_ms_total": 0.0,
+            "queue_wait_ms_max": 0.0,
+            "run_ms_total": 0.0,
+        }
+
+    def submit(
+        self, fn: Callable[[], R], priority: int = PRIORITY_NORMAL
+    ) -> "Future[R]":
+        """
+        Queue a zero-argument callable.
+
+        Args:
+            fn: The callable to run in a worker thread.
+            priority (int): Lower runs first (see PRIORITY_*).
+        Returns:
+            concurrent.futures.Future: The call's future.
+        Raises:
+            ExecutorBusyError: If the queue is full.
+            RuntimeError: If the executor has been shut down.
+        """
+        future: Future = Future()
+        with self._lock:
+            if self._shutdown:
+                raise RuntimeError(f"Executor '{self.name}' has been shut down")
+            if self._queued >= self.max_queue:
+                self._stats["rejected"] += 1
+                raise ExecutorBusyError(
+                    f"Executor '{self.name}' is busy "
+                    f"({self._queued} tasks queued); retry later"
+                )
+            self._queued += 1
+            self._stats["submitted"] += 1
+            self._stats["max_queued"] = max(self._stats["max_queued"], self._queued)
+            item = _WorkItem(future, fn)
+            self._queue.put((priority, next(self._sequence), item))
+            # Like ThreadPoolExecutor: one thread per item no idle worker takes
+            if self._queued > self._idle and len(self._threads) < self.max_workers:
+                thread = threading.Thread(
+                    target=self._worker,
+                    name=f"{self.name}-{len(self._threads)}",
+                    daemon=True,
+                )
+                self._threads.append(thread)
+                thread.start()
+        future.add_done_callback(lambda f: self._release_cancelled(item))
+        return future
+
+    def _release_cancelled(self, item: _WorkItem) -> None:
+        """Free the queue slot of an item cancelled before a worker took it."""
+        if not item.future.cancelled():
+            return
+        with self._lock:
+            if item.dequeued:
+                return
+            item.dequeued = True
+            self._queued -= 1
+            self._stats["cancelled"] += 1
+
+    def _worker(self) -> None:
+        """Run queued work until shutdown."""
+        while True:
+            with self._lock:
+                self._idle += 1
+            _, _, item = self._queue.get()
+            with self._lock:
+                self._idle -= 1
+                if item is _SHUTDOWN:
+                    return
+                if item.dequeued:
+                    # Cancelled while queued; its slot is already free
+                    continue
+                item.dequeued = True
+                self._queued -= 1
+                if not item.future.set_running_or_notify_cancel():
+                    self._stats["cancelled"] += 1
+                    continue
+                item.started = time.perf_counter()
+                wait_ms = (item.started - item.enqueued) * 1000
+                self._stats["queue_wait_ms_total"] += wait_ms
+                self._stats["queue_wait_ms_max"] = max(
+                    self._stats["queue_wait_ms_max"], wait_ms
+                )
+                self._active += 1
+            try:
+                result = item.fn()
+            except BaseException as e:  # pylint: disable=broad-except
+                item.future.set_exception(e)
+                outcome = "failed"
+            else:
+                item.future.set_result(result)
+                outcome = "completed"
+            with self._lock:
+                self._active -= 1
+                self._stats[outcome] += 1
+                run_ms = (time.perf_counter() - item.started) * 1000
+                self._stats["run_ms_total"] += run_ms
+
+    def stats(self) -> Dict[str, Any]:
+        """Return configuration, live depth and counters."""
+        with self._lock:
+            started = self._stats["completed"] + self._stats["failed"]
+            return {
+                "max_workers": self.max_workers,
+                "max_queue": self.max_queue,
+                "threads": len(self._threads),
+                "active": self._active,
+                "queued": self._queued,
+                **{
+                    key: round(value, 1) if isinstance(value, float) else value
+                    for key, value in self._stats.items()
+                },
+                "queue_wait_ms_avg": (
+                    round(self._stats["queue_wait_ms_total"] / started, 1)
+                    if started
+                    else 0.0
+                ),
+            }
+
+    def shutdown(self) -> None:
+        """Stop accepting work, cancel queued work and stop idle workers."""
+        with self._lock:
+            self._shutdown = True
+            threads = list(self._threads)
+        while True:
+            try:
+                _, _, item = self._queue.get_nowait()
+            except queue.Empty:
+                break
+            if item is not _SHUTDOWN:
+                # The done callback frees the slot and counts the cancellation
+                item.future.cancel()
+        for _ in threads:
+            self._queue.put((float("inf"), next(self._sequence), _SHUTDOWN))
+
+
+class ExecutorRegistry:
+    """
+    Lazily created named executors.
+    """
+
+    def __init__(self):
+        self._executors: Dict[str, PriorityExecutor] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> PriorityExecutor:
+        """
+        Return the executor with the given name, creating it on first use.
+
+        Raises:
+            KeyError: If the name is not one of EXECUTOR_DEFAULTS.
+        """
+        executor = self._executors.get(name)
+        if executor is not None:
+            return executor
+        workers, max_queue = EXECUTOR_DEFAULTS[name]
+        with self._lock:
+            if name not in self._executors:
+                prefix = f"MCP_EXECUTOR_{name.upper()}"
+                self._executors[name] = PriorityExecutor(
+                    name,
+                    _env_int(f"{prefix}_WORKERS", workers),
+                    _env_int(f"{prefix}_MAX_QUEUE", max_queue),
+                )
+            return self._executors[name]
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return stats for every executor created so far."""
+        with self._lock:
+            executors = dict(self._executors)
+        return {name: executor.stats() for name, executor in executors.items()}
+
+    def shutdown(self) -> None:
+        """Shut down every executor."""
+        with self._lock:
+            executors = list(self._executors.values())
+            self._executors.clear()
+        for executor in executors:
+            executor.shutdown()
+
+
+executors = ExecutorRegistry()
+
+
+async def run_in_executor(
+    name: str,
+    func: Callable[..., R],
+    *args: Any,
+    priority: int = PRIORITY_NORMAL,
+    **kwargs: Any,
+) -> R:
+    """
+    Run a blocking callable on a named executor and await its result.
+
+    Cancelling the awaiting task cancels the work if it has not started.
+
+    Args:
+        name (str): Executor name (see EXECUTOR_*).
+        func: The blocking callable.
+        *args: Positional arguments for func.
+        priority (int): Queue priority (see PRIORITY_*).
+        **kwargs: Keyword arguments for func.
+    Returns:
+        The callable's result.
+    Raises:
+        ExecutorBusyError: If the executor's queue is full.
+    """
+    context = contextvars.copy_context()
+    call = functools.partial(context.run, func, *args, **kwargs)
+    return await asyncio.wrap_future(executors.get(name).submit(call, priority))
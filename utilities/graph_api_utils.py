@@ -11,26 +11,34 @@ This module centralizes all logic for interacting with Microsoft Graph, includin
 import logging
 import jwt
 from azure.identity import CredentialUnavailableError
-from utilities.cache import cache
+from utilities.cache import REGION_GRAPH_PERMISSIONS, cache_manager
 from utilities.api_utils import AzureApiClient
+from utilities.executors import EXECUTOR_GRAPH
+from utilities.token_cache import token_cache_for
 
 logger = logging.getLogger(__name__)
 GRAPH_SCOPE = "https://graph.microsoft.com/.default"
 GRAPH_API_BASE = "https://graph.microsoft.com/v1.0"
 REQUIRED_PERMISSIONS = ["User.Read.All", "Group.Read.All"]
 
+permissions_cache = cache_manager.region(REGION_GRAPH_PERMISSIONS)
+
 
 class GraphApiClient(AzureApiClient):
     """
     AzureApiClient subclass for Microsoft Graph API calls.
 
     Provides a method to acquire a Microsoft Graph API access token
-    using the configured Azure credential.
+    using the configured Azure credential. Tokens are served from the shared
+    token cache, keyed by the Graph scope.
     """
 
+    scope = GRAPH_SCOPE
+    executor = EXECUTOR_GRAPH
+
     def get_token(self):
         """
-        Acquire a Microsoft Graph API access token using the configured Azure credential.
+        Return a cached (or freshly acquired) Microsoft Graph API access token.
 
         Returns:
             str: The acquired access token.
@@ -39,7 +47,7 @@ class GraphApiClient(AzureApiClient):
             Exception: For other errors during token acquisition.
         """
         try:
-            token = self.credential.get_token(GRAPH_SCOPE).token
+            token = token_cache_for(self.credential).get_token(GRAPH_SCOPE)
             self._token = token
             return token
         except CredentialUnavailableError as e:
@@ -89,13 +97,13 @@ def check_graph_permissions(
     """
     if required_permissions is None:
         required_permissions = REQUIRED_PERMISSIONS
-    permissions = cache.get(cache_key)
+    permissions = permissions_cache.get(cache_key)
     claims = None
     if permissions is None:
         try:
             claims = decode_graph_token(token)
             permissions = claims.get("roles", []) or claims.get("scp", "").split()
-            cache.set(cache_key, permissions)
+            permissions_cache.set(cache_key, permissions)
         except jwt.InvalidTokenError as e:
             logger.warning("Failed to decode Graph token: %s", e)
             permissions = []
@@ -0,0 +1,285 @@
+"""
+FILE: utilities/http_session.py
+DESCRIPTION:
+    Shared, connection-pooled HTTP sessions for direct Azure REST calls.
+
+    A single requests.Session with a keep-alive HTTPAdapter is reused for
+    every blocking ARM and Microsoft Graph call for the lifetime of the
+    server, so TCP and TLS setup is paid once per host instead of once per
+    request. Pool sizes can be tuned with MCP_HTTP_POOL_CONNECTIONS (number
+    of host pools) and MCP_HTTP_POOL_MAXSIZE (connections kept per host).
+
+    AsyncPooledHttpClient is the event-loop-native counterpart built on
+    httpx.AsyncClient. Awaiting it does not occupy an executor thread, so
+    many concurrent REST calls only cost open sockets. Its total connection
+    limit is set with MCP_HTTP_MAX_CONNECTIONS.
+"""
+
+import asyncio
+import logging
+import os
+from threading import Lock
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_POOL_CONNECTIONS = 10
+DEFAULT_POOL_MAXSIZE = 20
+DEFAULT_MAX_CONNECTIONS = 100
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a positive integer from the environment, falling back to default."""
+    try:
+        value = int(os.environ.get(name, default))
+        return value if value > 0 else default
+    except (TypeError, ValueError):
+        logger.warning("Invalid value for %s; using %d", name, default)
+        return default
+
+
+class PooledHttpSession:
+    """
+    Lazily created, thread-safe wrapper around a pooled requests.Session.
+
+    Tracks per-host request counts and in-flight requests so pool usage can
+    be reported via stats().
+    """
+
+    def __init__(
+        self,
+        pool_connections: Optional[int] = None,
+        pool_maxsize: Optional[int] = None,
+    ):
+        """
+        Initialize the pooled session wrapper.
+
+        Args:
+            pool_connections (int, optional): Number of per-host pools to keep.
+                Defaults to MCP_HTTP_POOL_CONNECTIONS or 10.
+            pool_maxsize (int, optional): Maximum connections kept per host.
+                Defaults to MCP_HTTP_POOL_MAXSIZE or 20.
+        """
+        self.pool_connections = pool_connections or _env_int(
+            "MCP_HTTP_POOL_CONNECTIONS", DEFAULT_POOL_CONNECTIONS
+        )
+        self.pool_maxsize = pool_maxsize or _env_int(
+            "MCP_HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE
+        )
+        self._session: Optional[requests.Session] = None
+        self._adapter: Optional[HTTPAdapter] = None
+        self._lock = Lock()
+        self._hosts: Dict[str, Dict[str, int]] = {}
+
+    def get_session(self) -> requests.Session:
+        """
+        Return the shared session, creating it on first use.
+
+        Returns:
+            requests.Session: Session with a pooled keep-alive adapter mounted.
+        """
+        with self._lock:
+            if self._session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(
+                    pool_connections=self.pool_connections,
+                    pool_maxsize=self.pool_maxsize,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                self._session = session
+                self._adapter = adapter
+                logger.info(
+                    "Created pooled HTTP session (pools=%d, maxsize=%d)",
+                    self.pool_connections,
+                    self.pool_maxsize,
+                )
+            return self._session
+
+    def _host_stats(self, host: str) -> Dict[str, int]:
+        stats = self._hosts.get(host)
+        if stats is None:
+            stats = {"requests": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0}
+            self._hosts[host] = stats
+        return stats
+
+    def request(self, method: str, url: str, **kwargs: Any) -> requests.Response:
+        """
+        Send a request through the shared session, recording pool usage.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            **kwargs: Passed through to requests.Session.request.
+        Returns:
+            requests.Response: The HTTP response.
+        """
+        session = self.get_session()
+        host = urlsplit(url).netloc
+        with self._lock:
+            stats = self._host_stats(host)
+            stats["requests"] += 1
+            stats["in_flight"] += 1
+            stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        try:
+            return session.request(method, url, **kwargs)
+        except Exception:
+            with self._lock:
+                stats["errors"] += 1
+            raise
+        finally:
+            with self._lock:
+                stats["in_flight"] -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Report pool configuration and usage.
+
+        Returns:
+            dict: Pool settings, per-host request counters and, for each live
+            urllib3 pool, the number of connections opened versus requests
+            served (a low ratio means connections are being reused).
+        """
+        with self._lock:
+            hosts = {host: dict(values) for host, values in self._hosts.items()}
+            adapter = self._adapter
+        pools = {}
+        if adapter is not None:
+            manager = adapter.poolmanager
+            for key in list(manager.pools.keys()):
+                pool = manager.pools.get(key)
+                if pool is None:
+                    continue
+                pools[pool.host] = {
+                    "connections_opened": pool.num_connections,
+                    "requests_served": pool.num_requests,
+                }
+        return {
+            "pool_connections": self.pool_connections,
+            "pool_maxsize": self.pool_maxsize,
+            "hosts": hosts,
+            "pools": pools,
+        }
+
+    def close(self) -> None:
+        """Close the shared session and release all pooled connections."""
+        with self._lock:
+            session = self._session
+            self._session = None
+            self._adapter = None
+        if session is not None:
+            session.close()
+            logger.info("Closed pooled HTTP session")
+
+
+class AsyncPooledHttpClient:
+    """
+    Lazily created wrapper around a shared httpx.AsyncClient.
+
+    The client is bound to the event loop it was first used on; if called
+    from a different loop (e.g. successive asyncio.run calls in direct
+    invocation), a fresh client is created for that loop.
+    """
+
+    def __init__(
+        self,
+        max_connections: Optional[int] = None,
+        max_keepalive: Optional[int] = None,
+    ):
+        """
+        Initialize the async client wrapper.
+
+        Args:
+            max_connections (int, optional): Total concurrent connections.
+                Defaults to MCP_HTTP_MAX_CONNECTIONS or 100.
+            max_keepalive (int, optional): Idle keep-alive connections retained.
+                Defaults to MCP_HTTP_POOL_MAXSIZE or 20.
+        """
+        self.max_connections = max_connections or _env_int(
+            "MCP_HTTP_MAX_CONNECTIONS", DEFAULT_MAX_CONNECTIONS
+        )
+        self.max_keepalive = max_keepalive or _env_int(
+            "MCP_HTTP_POOL_MAXSIZE", DEFAULT_POOL_MAXSIZE
+        )
+        self._client: Optional[httpx.AsyncClient] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._hosts: Dict[str, Dict[str, int]] = {}
+
+    def get_client(self) -> httpx.AsyncClient:
+        """
+        Return the shared AsyncClient for the running event loop.
+
+        Returns:
+            httpx.AsyncClient: Pooled async HTTP client.
+        """
+        loop = asyncio.get_running_loop()
+        if self._client is None or self._loop is not loop or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_keepalive,
+                ),
+                timeout=httpx.Timeout(30.0),
+            )
+            self._loop = loop
+            logger.info(
+                "Created async HTTP client (max_connections=%d, keepalive=%d)",
+                self.max_connections,
+                self.max_keepalive,
+            )
+        return self._client
+
+    async def request(self, method: str, url: str, **kwargs: Any) -> httpx.Response:
+        """
+        Send a request through the shared AsyncClient, recording usage.
+
+        Args:
+            method (str): HTTP method.
+            url (str): Request URL.
+            **kwargs: Passed through to httpx.AsyncClient.request.
+        Returns:
+            httpx.Response: The HTTP response.
+        """
+        client = self.get_client()
+        host = urlsplit(url).netloc
+        stats = self._hosts.get(host)
+        if stats is None:
+            stats = {"requests": 0, "errors": 0, "in_flight": 0, "peak_in_flight": 0}
+            self._hosts[host] = stats
+        stats["requests"] += 1
+        stats["in_flight"] += 1
+        stats["peak_in_flight"] = max(stats["peak_in_flight"], stats["in_flight"])
+        try:
+            return await client.request(method, url, **kwargs)
+        except Exception:
+            stats["errors"] += 1
+            raise
+        finally:
+            stats["in_flight"] -= 1
+
+    def stats(self) -> Dict[str, Any]:
+        """Report async pool limits and per-host request counters."""
+        return {
+            "max_connections": self.max_connections,
+            "max_keepalive": self.max_keepalive,
+            "hosts": {host: dict(values) for host, values in self._hosts.items()},
+        }
+
+    async def aclose(self) -> None:
+        """Close the shared AsyncClient and release its connections."""
+        client = self._client
+        self._client = None
+        self._loop = None
+        if client is not None and not client.is_closed:
+            await client.aclose()
+            logger.info("Closed async HTTP client")
+
+
+# Singleton sessions shared by all REST clients
+http_session = PooledHttpSession()
+async_http_session = AsyncPooledHttpClient()
@@ -0,0 +1,243 @@
+"""
+FILE: utilities/kql_fingerprint.py
+DESCRIPTION:
+    KQL query fingerprinting and hot-query analytics.
+
+    fingerprint_kql() reduces a query to a template by replacing string,
+    number, datetime and timespan literals (and take/limit counts) with '?',
+    so the same query shape with different values shares one fingerprint.
+
+    HotQueryTracker keeps per-fingerprint latency percentiles (over a window
+    of recent executions), error rates and result row-count distributions.
+    Memory is bounded with the space-saving top-K algorithm: at most
+    MCP_QUERY_FINGERPRINT_CAPACITY fingerprints are tracked, and a new one
+    replaces the least frequent, inheriting its count as an error bound.
+"""
+
+import hashlib
+import logging
+import os
+import re
+import time
+from collections import deque
+from threading import Lock
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from utilities.query_cache import normalize_kql
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_CAPACITY = 200
+# Recent executions per fingerprint used for latency percentiles
+LATENCY_WINDOW = 128
+ROW_BUCKETS = ("0", "1-9", "10-99", "100-999", "1k-9.9k", "10k-99k", "100k+")
+OUTCOMES = ("ok", "partial", "error", "timeout")
+SORT_FIELDS = ("count", "p95_ms", "error_rate", "total_ms")
+
+_LITERAL_FUNCTIONS = r"datetime|todatetime|timespan|totimespan|dynamic|guid"
+_LITERAL_RE = re.compile(
+    r"""(?P<string>[hH]?@?"(?:[^"\\\n]|\\.)*"|[hH]?@?'(?:[^'\\\n]|\\.)*')"""
+    rf"""|(?P<call>\b(?:{_LITERAL_FUNCTIONS})\s*\([^()]*\))"""
+    r"""|(?P<take>\b(?:take|limit)\s+\d+)"""
+    r"""|(?P<number>(?<![\w.])\d+(?:\.\d+)?(?:e[+-]?\d+)?"""
+    r"""(?:d|h|m|s|ms|microsecond|tick)?(?![\w.]))"""
+)
+# A parenthesized list of placeholders, e.g. in (?, ?, ?)
+_PLACEHOLDER_LIST_RE = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+
+
+def fingerprint_kql(query: str) -> Tuple[str, str]:
+    """
+    Reduce a KQL query to its literal-free template and fingerprint.
+
+    Args:
+        query (str): The KQL query.
+    Returns:
+        tuple: (fingerprint, template) where fingerprint is a short hex id.
+    """
+
+    def replace(match):
+        if match.group("call") is not None:
+            return match.group("call").split("(", 1)[0].rstrip() + "(?)"
+        if match.group("take") is not None:
+            return match.group("take").split()[0] + " ?"
+        return "?"
+
+    template = _LITERAL_RE.sub(replace, normalize_kql(query))
+    template = _PLACEHOLDER_LIST_RE.sub("(?)", template)
+    digest = hashlib.sha1(template.encode("utf-8")).hexdigest()[:12]
+    return digest, template
+
+
+def _row_bucket(rows: int) -> str:
+    """Return the ROW_BUCKETS label for a row count."""
+    if rows <= 0:
+        return ROW_BUCKETS[0]
+    return ROW_BUCKETS[min(len(str(rows)), len(ROW_BUCKETS) - 1)]
+
+
+def _percentile(ordered: List[float], fraction: float) -> Optional[float]:
+    """Nearest-rank percentile of an ascending list."""
+    if not ordered:
+        return None
+    rank = max(0, min(len(ordered) - 1, int(round(fraction * len(ordered))) - 1))
+    return round(ordered[rank], 1)
+
+
+def _capacity() -> int:
+    """Read the tracked fingerprint limit from the environment."""
+    try:
+        value = int(os.environ.get("MCP_QUERY_FINGERPRINT_CAPACITY", DEFAULT_CAPACITY))
+        return value if value > 0 else DEFAULT_CAPACITY
+    except (TypeError, ValueError):
+        logger.warning(
+            "Invalid value for MCP_QUERY_FINGERPRINT_CAPACITY; using %d",
+            DEFAULT_CAPACITY,
+        )
+        return DEFAULT_CAPACITY
+
+
+class _Entry:
+    """Statistics for one fingerprint."""
+
+    __slots__ = (
+        "template",
+        "count",
+        "overestimate",
+        "outcomes",
+        "latencies",
+        "row_buckets",
+        "first_seen",
+        "last_seen",
+    )
+
+    def __init__(self, template: str, inherited: int = 0):
+        self.template = template
+        self.count = inherited
+        self.overestimate = inherited
+        self.outcomes = {outcome: 0 for outcome in OUTCOMES}
+        self.latencies: Deque[float] = deque(maxlen=LATENCY_WINDOW)
+        self.row_buckets = {bucket: 0 for bucket in ROW_BUCKETS}
+        self.first_seen = self.last_seen = time.time()
+
+
+class HotQueryTracker:
+    """
+    Bounded, thread-safe per-fingerprint execution analytics.
+    """
+
+    def __init__(self, capacity: Optional[int] = None):
+        """
+        Initialize the tracker.
+
+        Args:
+            capacity (int, optional): Maximum fingerprints tracked
+                (default: MCP_QUERY_FINGERPRINT_CAPACITY or 200).
+        """
+        self.capacity = capacity or _capacity()
+        self._entries: Dict[str, _Entry] = {}
+        self._lock = Lock()
+        self._evicted = 0
+
+    def record(
+        self,
+        query: str,
+        latency_ms: float,
+        outcome: str = "ok",
+        rows: Optional[int] = None,
+    ) -> str:
+        """
+        Record one execution of a query.
+
+        Args:
+            query (str): The KQL query as executed.
+            latency_ms (float): Wall-clock latency in milliseconds.
+            outcome (str): One of OUTCOMES.
+            rows (int, optional): Result rows, if the query returned any tables.
+        Returns:
+            str: The query's fingerprint.
+        """
+        fingerprint, template = fingerprint_kql(query)
+        with self._lock:
+            entry = self._entries.get(fingerprint)
+            if entry is None:
+                inherited = 0
+                if len(self._entries) >= self.capacity:
+                    # Space-saving: replace the least frequent fingerprint
+                    victim = min(self._entries, key=lambda k: self._entries[k].count)
+                    inherited = self._entries.pop(victim).count
+                    self._evicted += 1
+                entry = self._entries[fingerprint] = _Entry(template, inherited)
+            entry.count += 1
+            entry.outcomes[outcome if outcome in OUTCOMES else "error"] += 1
+            entry.latencies.append(latency_ms)
+            if rows is not None:
+                entry.row_buckets[_row_bucket(rows)] += 1
+            entry.last_seen = time.time()
+        return fingerprint
+
+    def top(self, sort_by: str = "count", limit: int = 10) -> List[Dict[str, Any]]:
+        """
+        Return the hottest fingerprints.
+
+        Args:
+            sort_by (str): 'count', 'p95_ms', 'error_rate' or 'total_ms'
+                (estimated total latency).
+            limit (int): Maximum entries to return.
+        Returns:
+            list: Per-fingerprint summaries, highest first.
+        Raises:
+            ValueError: If sort_by is not supported.
+        """
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"sort_by must be one of: {', '.join(SORT_FIELDS)}")
+        with self._lock:
+            summaries = [
+                self._summary(fingerprint, entry)
+                for fingerprint, entry in self._entries.items()
+            ]
+        summaries.sort(key=lambda summary: summary[sort_by] or 0, reverse=True)
+        return summaries[:limit]
+
+    @staticmethod
+    def _summary(fingerprint: str, entry: _Entry) -> Dict[str, Any]:
+        """Build the report for one entry (lock held)."""
+        ordered = sorted(entry.latencies)
+        observed = sum(entry.outcomes.values())
+        failures = entry.outcomes["error"] + entry.outcomes["timeout"]
+        mean = sum(ordered) / len(ordered) if ordered else 0.0
+        return {
+            "fingerprint": fingerprint,
+            "template": entry.template[:500],
+            "count": entry.count,
+            "count_overestimate": entry.overestimate,
+            "outcomes": dict(entry.outcomes),
+            "error_rate": round(failures / observed, 3) if observed else 0.0,
+            "p50_ms": _percentile(ordered, 0.50),
+            "p95_ms": _percentile(ordered, 0.95),
+            "p99_ms": _percentile(ordered, 0.99),
+            "max_ms": round(ordered[-1], 1) if ordered else None,
+            "total_ms": round(mean * entry.count, 1),
+            "row_counts": {k: v for k, v in entry.row_buckets.items() if v},
+            "first_seen": entry.first_seen,
+            "last_seen": entry.last_seen,
+        }
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of tracked and evicted fingerprints."""
+        with self._lock:
+            return {
+                "tracked": len(self._entries),
+                "capacity": self.capacity,
+                "evicted": self._evicted,
+            }
+
+    def clear(self) -> None:
+        """Forget all fingerprints."""
+        with self._lock:
+            self._entries.clear()
+            self._evicted = 0
+
+
+# Shared tracker for the whole server process
+hot_queries = HotQueryTracker()
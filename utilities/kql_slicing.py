@@ -0,0 +1,293 @@
+"""
+FILE: utilities/kql_slicing.py
+DESCRIPTION:
+    Planning and merging for time-sliced parallel execution of KQL queries.
+
+    A long query window can be split into adjacent sub-ranges that run
+    concurrently, as long as the per-slice results can be combined exactly:
+
+    - Row queries: a table name followed only by row-wise operators
+      (where, project, extend, parse, mv-expand). Slice results are
+      concatenated in time order.
+    - Summarize queries: the same, ending in a single summarize whose
+      aggregates are count/countif/sum/sumif/min/max (merged exactly) or
+      dcount/dcountif (merged by summing per-slice counts, which is an
+      upper bound because a value seen in several slices is counted once
+      per slice).
+
+    Anything else (let statements, joins, unions, take/top/sort, other
+    aggregates, operators after summarize) is reported as not sliceable.
+
+    Slices of one query run at most MCP_QUERY_SLICE_CONCURRENCY at a time.
+"""
+
+import json
+import logging
+import os
+import re
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, Hashable, List, Optional, Tuple
+
+from utilities.query_cache import normalize_kql
+
+logger = logging.getLogger(__name__)
+
+MAX_SLICES = 32
+DEFAULT_SLICE_CONCURRENCY = 4
+
+# Operators that work row by row, so slicing the time range cannot change their output
+ROW_OPERATORS = frozenset(
+    {
+        "where",
+        "filter",
+        "project",
+        "project-away",
+        "project-keep",
+        "project-rename",
+        "project-reorder",
+        "extend",
+        "parse",
+        "parse-where",
+        "mv-expand",
+    }
+)
+
+
+def slice_concurrency() -> int:
+    """Return how many slices of one query may run at once."""
+    try:
+        value = int(
+            os.environ.get("MCP_QUERY_SLICE_CONCURRENCY", DEFAULT_SLICE_CONCURRENCY)
+        )
+        return value if value > 0 else DEFAULT_SLICE_CONCURRENCY
+    except (TypeError, ValueError):
+        logger.warning(
+            "Invalid value for MCP_QUERY_SLICE_CONCURRENCY; using %d",
+            DEFAULT_SLICE_CONCURRENCY,
+        )
+        return DEFAULT_SLICE_CONCURRENCY
+
+
+def _merge_sum(a, b):
+    return (a or 0) + (b or 0)
+
+
+def _merge_min(a, b):
+    return b if a is None else a if b is None else min(a, b)
+
+
+def _merge_max(a, b):
+    return b if a is None else a if b is None else max(a, b)
+
+
+# Aggregate function -> how per-slice values are combined
+MERGEABLE_AGGREGATES: Dict[str, Callable[[Any, Any], Any]] = {
+    "count": _merge_sum,
+    "countif": _merge_sum,
+    "sum": _merge_sum,
+    "sumif": _merge_sum,
+    "min": _merge_min,
+    "max": _merge_max,
+    "dcount": _merge_sum,
+    "dcountif": _merge_sum,
+}
+# Aggregates whose merged value is only an upper bound
+APPROXIMATE_AGGREGATES = frozenset({"dcount", "dcountif"})
+
+_STRING_RE = re.compile(r"""@?"(?:[^"\\\n]|\\.)*"|@?'(?:[^'\\\n]|\\.)*'""")
+_TABLE_RE = re.compile(r"^[A-Za-z_][\w]*$")
+_OPERATOR_RE = re.compile(r"^([a-z][a-z-]*)\b", re.IGNORECASE)
+_HINT_RE = re.compile(r"^hint\.\w+\s*=\s*\w+\s*", re.IGNORECASE)
+_AGGREGATE_RE = re.compile(r"^(?:[A-Za-z_]\w*\s*=\s*)?([A-Za-z_]\w*)\s*\((.*)\)$", re.S)
+_BY_RE = re.compile(r"(?<![\w-])by\b", re.IGNORECASE)
+
+
+def _split_top_level(text: str, separator: str) -> List[str]:
+    """Split text on a separator that is outside strings and brackets."""
+    parts, depth, current, idx = [], 0, [], 0
+    while idx < len(text):
+        match = _STRING_RE.match(text, idx)
+        if match:
+            current.append(match.group(0))
+            idx = match.end()
+            continue
+        char = text[idx]
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        if char == separator and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(char)
+        idx += 1
+    parts.append("".join(current))
+    return [part.strip() for part in parts]
+
+
+def _top_level_by(text: str) -> int:
+    """Return the index of the first top-level 'by' keyword, or -1."""
+    depth, idx = 0, 0
+    while idx < len(text):
+        match = _STRING_RE.match(text, idx)
+        if match:
+            idx = match.end()
+            continue
+        char = text[idx]
+        if char in "([{":
+            depth += 1
+        elif char in ")]}":
+            depth -= 1
+        elif depth == 0 and _BY_RE.match(text, idx):
+            return idx
+        idx += 1
+    return -1
+
+
+def _is_single_call(expression: str) -> bool:
+    """True if the expression's first '(' is closed by its final ')'."""
+    depth = 0
+    for idx, char in enumerate(expression):
+        if char == "(":
+            depth += 1
+        elif char == ")":
+            depth -= 1
+            if depth == 0:
+                return idx == len(expression) - 1
+    return False
+
+
+class SlicePlan:
+    """
+    How to run a query in time slices and merge the results.
+
+    Attributes:
+        mode (str): 'rows' (concatenate) or 'summarize' (group and reduce).
+        aggregates (list): Aggregate function names, in output column order.
+        approximate (bool): True if a merged aggregate is only an upper bound.
+    """
+
+    def __init__(self, mode: str, aggregates: Optional[List[str]] = None):
+        self.mode = mode
+        self.aggregates = aggregates or []
+        self.approximate = any(a in APPROXIMATE_AGGREGATES for a in self.aggregates)
+
+
+def _plan_summarize(segment: str) -> Tuple[Optional[List[str]], Optional[str]]:
+    """Parse the aggregates of a summarize segment."""
+    body = segment[len("summarize") :].strip()
+    while _HINT_RE.match(body):
+        body = _HINT_RE.sub("", body, count=1)
+    # Aggregates come before a top-level 'by'
+    by_index = _top_level_by(body)
+    aggregate_text = body[:by_index] if by_index >= 0 else body
+    aggregates = []
+    for expression in _split_top_level(aggregate_text, ","):
+        match = _AGGREGATE_RE.match(expression)
+        if not match or not _is_single_call(expression[match.start(1) :]):
+            return None, f"aggregate '{expression}' cannot be merged across slices"
+        function = match.group(1).lower()
+        if function not in MERGEABLE_AGGREGATES:
+            return None, f"aggregate '{function}()' cannot be merged across slices"
+        aggregates.append(function)
+    if not aggregates:
+        return None, "summarize has no aggregates"
+    return aggregates, None
+
+
+def plan_slices(query: str) -> Tuple[Optional[SlicePlan], Optional[str]]:
+    """
+    Decide whether a query can run in time slices.
+
+    Args:
+        query (str): The KQL query.
+    Returns:
+        tuple: (plan, None) if sliceable, else (None, reason).
+    """
+    segments = _split_top_level(normalize_kql(query), "|")
+    if ";" in segments[0] or not _TABLE_RE.match(segments[0]):
+        return None, "the query must start with a single table name"
+    for position, segment in enumerate(segments[1:], start=1):
+        match = _OPERATOR_RE.match(segment)
+        operator = match.group(1).lower() if match else segment
+        if operator in ROW_OPERATORS:
+            continue
+        if operator == "summarize":
+            if position != len(segments) - 1:
+                return None, "summarize must be the last operator"
+            aggregates, reason = _plan_summarize(segment)
+            if aggregates is None:
+                return None, reason
+            return SlicePlan("summarize", aggregates), None
+        return None, f"operator '{operator}' cannot be split by time"
+    return SlicePlan("rows"), None
+
+
+def time_slices(
+    end: datetime, window: timedelta, count: int
+) -> List[Tuple[datetime, datetime]]:
+    """
+    Split the window ending at 'end' into adjacent, oldest-first sub-ranges.
+
+    Args:
+        end (datetime): End of the window.
+        window (timedelta): Length of the window.
+        count (int): Number of slices (capped at MAX_SLICES).
+    Returns:
+        list: (start, end) tuples covering the window exactly.
+    """
+    count = max(1, min(count, MAX_SLICES))
+    start = end - window
+    step = window / count
+    bounds = [start + step * idx for idx in range(count)] + [end]
+    return list(zip(bounds[:-1], bounds[1:]))
+
+
+def _hashable(value: Any) -> Hashable:
+    """Return a hashable stand-in for a group key value."""
+    try:
+        hash(value)
+        return value
+    except TypeError:
+        return json.dumps(value, sort_keys=True, default=str)
+
+
+def merge_slice_rows(plan: SlicePlan, slice_rows: List[List[Any]]) -> List[List[Any]]:
+    """
+    Combine per-slice result rows (given oldest slice first).
+
+    Args:
+        plan (SlicePlan): The plan the slices were run with.
+        slice_rows (list): One list of rows per slice.
+    Returns:
+        list: The merged rows.
+    """
+    if plan.mode == "rows":
+        return [list(row) for rows in slice_rows for row in rows]
+    width = len(plan.aggregates)
+    merges = [MERGEABLE_AGGREGATES[name] for name in plan.aggregates]
+    groups: Dict[Tuple, List[Any]] = {}
+    for rows in slice_rows:
+        for row in rows:
+            row = list(row)
+            first = len(row) - width
+            key = tuple(_hashable(value) for value in row[:first])
+            merged = groups.get(key)
+            if merged is None:
+                groups[key] = row
+                continue
+            for offset, merge in enumerate(merges):
+                merged[first + offset] = merge(merged[first + offset], row[first + offset])
+    return list(groups.values())
+
+
+class MergedTable:
+    """
+    Minimal stand-in for a LogsTable holding merged slice results.
+    """
+
+    def __init__(self, columns: List[Any], column_types: List[str], rows: List[List]):
+        self.columns = columns
+        self.column_types = column_types
+        self.rows = rows
@@ -0,0 +1,180 @@
+"""
+FILE: utilities/query_cache.py
+DESCRIPTION:
+    Opt-in result cache for Log Analytics queries.
+
+    Entries are keyed on (workspace ID, normalized KQL, timespan, time
+    bucket). Normalization strips // comments and collapses whitespace
+    outside string literals, so trivially reformatted queries share an
+    entry. The time bucket pins the relative window ("last 1d") to a
+    bucket of the wall clock, so a cached result never describes a window
+    that ended more than one bucket ago.
+
+    Results live in the 'query_results' region of the shared cache manager
+    (utilities/cache.py), bounded by a TTL and an approximate memory budget
+    in bytes; least recently used entries are evicted first. Tunable with
+    MCP_QUERY_CACHE_TTL (seconds, 0 disables), MCP_QUERY_CACHE_BUCKET_SECONDS
+    and MCP_QUERY_CACHE_MAX_BYTES.
+"""
+
+import json
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, Optional, Tuple
+
+from utilities.cache import REGION_QUERY_RESULTS, cache_manager
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_TTL_SECONDS = 300
+DEFAULT_BUCKET_SECONDS = 300
+DEFAULT_MAX_BYTES = 64 * 1024 * 1024
+
+# String literals (kept verbatim) and runs of whitespace and // comments
+_KQL_TOKEN_RE = re.compile(
+    r"""(?P<string>@?"(?:[^"\\\n]|\\.)*"|@?'(?:[^'\\\n]|\\.)*')"""
+    r"""|(?P<space>(?:\s|//[^\n]*)+)"""
+)
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a non-negative integer from the environment, falling back to default."""
+    try:
+        value = int(os.environ.get(name, default))
+        return value if value >= 0 else default
+    except (TypeError, ValueError):
+        logger.warning("Invalid value for %s; using %d", name, default)
+        return default
+
+
+def normalize_kql(query: str) -> str:
+    """
+    Normalize a KQL query for use as a cache key.
+
+    Removes // comments and collapses whitespace to single spaces, leaving
+    string literals untouched.
+
+    Args:
+        query (str): The KQL query.
+    Returns:
+        str: The normalized query.
+    """
+
+    def replace(match):
+        if match.group("string") is not None:
+            return match.group("string")
+        return " "
+
+    return _KQL_TOKEN_RE.sub(replace, query).strip()
+
+
+class QueryResultCache:
+    """
+    Key building and sizing for query results kept in the 'query_results'
+    region of the shared cache manager.
+    """
+
+    def __init__(
+        self,
+        ttl: Optional[int] = None,
+        bucket_seconds: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+    ):
+        """
+        Initialize the cache.
+
+        Args:
+            ttl (int, optional): Seconds an entry stays valid. Defaults to
+                MCP_QUERY_CACHE_TTL or 300; 0 disables the cache.
+            bucket_seconds (int, optional): Width of the time bucket the
+                query window is pinned to. Defaults to
+                MCP_QUERY_CACHE_BUCKET_SECONDS or 300.
+            max_bytes (int, optional): Approximate memory budget. Defaults to
+                MCP_QUERY_CACHE_MAX_BYTES or 64 MiB.
+        """
+        self.bucket_seconds = max(
+            bucket_seconds
+            if bucket_seconds is not None
+            else _env_int("MCP_QUERY_CACHE_BUCKET_SECONDS", DEFAULT_BUCKET_SECONDS),
+            1,
+        )
+        self.region = cache_manager.region(
+            REGION_QUERY_RESULTS,
+            ttl=ttl if ttl is not None else _env_int(
+                "MCP_QUERY_CACHE_TTL", DEFAULT_TTL_SECONDS
+            ),
+            max_bytes=max_bytes if max_bytes is not None else _env_int(
+                "MCP_QUERY_CACHE_MAX_BYTES", DEFAULT_MAX_BYTES
+            ),
+        )
+
+    @property
+    def ttl(self) -> float:
+        """Seconds an entry stays valid."""
+        return self.region.ttl
+
+    @property
+    def max_bytes(self) -> int:
+        """Byte budget of the result region."""
+        return self.region.max_bytes
+
+    @property
+    def enabled(self) -> bool:
+        """True if results may be cached."""
+        return self.ttl > 0 and self.max_bytes > 0
+
+    def make_key(
+        self, workspace_id: str, query: str, timespan: Any, *variant: Any
+    ) -> Tuple:
+        """
+        Build the cache key for a query.
+
+        Args:
+            workspace_id (str): Log Analytics workspace ID.
+            query (str): The KQL query.
+            timespan: The requested time window (as given by the caller).
+            *variant: Extra options that change the cached result's shape
+                (e.g. the result format).
+        Returns:
+            tuple: The cache key.
+        """
+        bucket = int(time.time() // self.bucket_seconds)
+        return (workspace_id, normalize_kql(query), str(timespan), bucket, *variant)
+
+    def get(self, key: Tuple) -> Optional[Tuple[Dict[str, Any], float]]:
+        """
+        Look up a cached result.
+
+        Args:
+            key (tuple): Key from make_key.
+        Returns:
+            Optional[tuple]: (result, age in seconds), or None on a miss.
+        """
+        return self.region.get_entry(key)
+
+    def set(self, key: Tuple, result: Dict[str, Any]) -> None:
+        """
+        Store a result, evicting least recently used entries to stay in budget.
+
+        Results are sized by their JSON length; results larger than the
+        whole budget are not cached.
+
+        Args:
+            key (tuple): Key from make_key.
+            result (dict): JSON-safe tool result.
+        """
+        self.region.set(key, result, size=len(json.dumps(result, default=str)))
+
+    def clear(self) -> None:
+        """Drop all entries."""
+        self.region.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return entry count, memory use and hit/miss counters."""
+        return self.region.stats()
+
+
+# Singleton cache for sentinel_logs_search results
+query_cache = QueryResultCache()
@@ -0,0 +1,266 @@
+"""
+FILE: utilities/query_stats.py
+DESCRIPTION:
+    Cost statistics for Log Analytics queries.
+
+    When a query runs with include_statistics, the service reports the CPU
+    time, data scanned and rows it used. summarize_statistics() reduces that
+    payload to a flat dict of numbers, and QueryStatsStore aggregates the
+    summaries in memory per tool, per query fingerprint and per table, so
+    the queries that consume the most workspace capacity can be found.
+
+    Each grouping keeps at most MAX_ENTRIES keys; the least recently updated
+    key is dropped first.
+"""
+
+import re
+import time
+from collections import OrderedDict
+from threading import Lock
+from typing import Any, Dict, List, Optional
+
+from utilities.kql_fingerprint import fingerprint_kql
+from utilities.query_cache import normalize_kql
+
+MAX_ENTRIES = 500
+GROUPINGS = ("fingerprint", "tool", "table")
+# Summary fields that are totalled per group
+SUMMED_FIELDS = (
+    "cpu_time_ms",
+    "server_time_ms",
+    "rows_scanned",
+    "extents_scanned",
+    "result_rows",
+    "result_bytes",
+)
+SORT_FIELDS = ("count",) + SUMMED_FIELDS
+
+_TIMESPAN_RE = re.compile(r"^(?:(\d+)\.)?(\d+):(\d+):(\d+(?:\.\d+)?)$")
+_IDENT = r"([A-Za-z_]\w*)"
+# Tabular sources: a statement's leading name, union operands, and the
+# right-hand side of join / lookup
+_LEADING_RE = re.compile(r"^(?:let\s+\w+\s*=\s*)?\(?\s*" + _IDENT + r"\s*(?=\||$|\))")
+_UNION_RE = re.compile(
+    r"\bunion\s+(?:\w+\s*=\s*\w+\s+)*((?:[A-Za-z_]\w*\s*,\s*)*[A-Za-z_]\w*)"
+)
+_JOIN_RE = re.compile(
+    r"\b(?:join|lookup)\s+(?:(?:kind|hint\.\w+)\s*=\s*\w+\s+)*\(?\s*" + _IDENT
+)
+_LET_RE = re.compile(r"\blet\s+([A-Za-z_]\w*)\s*=")
+_KEYWORDS = frozenset(
+    {"let", "union", "join", "lookup", "datatable", "print", "range", "kind", "on"}
+)
+
+
+def _timespan_ms(value: Any) -> Optional[float]:
+    """Convert a '[d.]hh:mm:ss[.fffffff]' timespan to milliseconds."""
+    if isinstance(value, (int, float)):
+        return float(value) * 1000
+    match = _TIMESPAN_RE.match(str(value or ""))
+    if not match:
+        return None
+    days, hours, minutes, seconds = match.groups()
+    total = int(days or 0) * 86400 + int(hours) * 3600 + int(minutes) * 60
+    return (total + float(seconds)) * 1000
+
+
+def _number(value: Any) -> Optional[float]:
+    """Return value as a number, or None."""
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def summarize_statistics(raw: Any) -> Dict[str, Any]:
+    """
+    Reduce a Log Analytics statistics payload to flat numeric fields.
+
+    Missing values are left out, since the payload differs between service
+    versions.
+
+    Args:
+        raw (dict): The 'statistics' of a query response.
+    Returns:
+        dict: Any of cpu_time_ms, server_time_ms, rows_scanned,
+        extents_scanned, extents_total, result_rows, result_bytes and
+        peak_memory_bytes.
+    """
+    query = (raw or {}).get("query", raw) or {}
+    usage = query.get("resourceUsage") or {}
+    inputs = query.get("inputDatasetStatistics") or {}
+    datasets = query.get("datasetStatistics") or []
+    execution_time = _number(query.get("executionTime"))
+    summary = {
+        "cpu_time_ms": _timespan_ms((usage.get("cpu") or {}).get("totalCpu")),
+        "server_time_ms": execution_time * 1000 if execution_time is not None else None,
+        "rows_scanned": _number((inputs.get("rows") or {}).get("scanned")),
+        "extents_scanned": _number((inputs.get("extents") or {}).get("scanned")),
+        "extents_total": _number((inputs.get("extents") or {}).get("total")),
+        "result_rows": (
+            sum(_number(d.get("tableRowCount")) or 0 for d in datasets)
+            if datasets
+            else None
+        ),
+        "result_bytes": (
+            sum(_number(d.get("tableSize")) or 0 for d in datasets)
+            if datasets
+            else None
+        ),
+        "peak_memory_bytes": _number((usage.get("memory") or {}).get("peakPerNode")),
+    }
+    return {
+        key: round(value, 3) if isinstance(value, float) else value
+        for key, value in summary.items()
+        if value is not None
+    }
+
+
+def combine_statistics(summaries: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    Combine the summaries of several queries (slices or workspaces) into one.
+
+    Totals are summed; peak memory and server time take the maximum, since
+    the queries ran concurrently.
+    """
+    combined: Dict[str, Any] = {"queries": len(summaries)}
+    for summary in summaries:
+        for key, value in summary.items():
+            if key in ("peak_memory_bytes", "server_time_ms"):
+                combined[key] = max(combined.get(key, 0), value)
+            else:
+                combined[key] = round(combined.get(key, 0) + value, 3)
+    return combined
+
+
+def referenced_tables(query: str) -> List[str]:
+    """
+    Best-effort list of the tables a query reads.
+
+    Names bound by let statements and KQL keywords are excluded.
+
+    Args:
+        query (str): The KQL query.
+    Returns:
+        list: Table names in order of first appearance.
+    """
+    text = normalize_kql(query)
+    bound = set(_LET_RE.findall(text))
+    names: List[str] = []
+    for statement in text.split(";"):
+        match = _LEADING_RE.match(statement.strip())
+        if match:
+            names.append(match.group(1))
+        for match in _UNION_RE.finditer(statement):
+            names.extend(name.strip() for name in match.group(1).split(","))
+        names.extend(_JOIN_RE.findall(statement))
+    tables: List[str] = []
+    for name in names:
+        if name not in bound and name.lower() not in _KEYWORDS and name not in tables:
+            tables.append(name)
+    return tables
+
+
+class QueryStatsStore:
+    """
+    Thread-safe in-memory aggregation of query statistics.
+    """
+
+    def __init__(self, max_entries: int = MAX_ENTRIES):
+        """
+        Initialize the store.
+
+        Args:
+            max_entries (int): Maximum keys kept per grouping.
+        """
+        self.max_entries = max_entries
+        self._groups: Dict[str, "OrderedDict[str, Dict[str, Any]]"] = {
+            grouping: OrderedDict() for grouping in GROUPINGS
+        }
+        self._lock = Lock()
+        self._since = time.time()
+
+    def _update(self, grouping: str, key: str, summary: Dict, sample: str) -> None:
+        """Add one query summary to a group entry (lock held)."""
+        entries = self._groups[grouping]
+        entry = entries.pop(key, None)
+        if entry is None:
+            entry = {grouping: key, "count": 0, "max_cpu_time_ms": 0}
+            entry.update({name: 0 for name in SUMMED_FIELDS})
+            if grouping == "fingerprint":
+                entry["query"] = sample
+        entry["count"] += 1
+        for name in SUMMED_FIELDS:
+            entry[name] = round(entry[name] + summary.get(name, 0), 3)
+        entry["max_cpu_time_ms"] = max(
+            entry["max_cpu_time_ms"], summary.get("cpu_time_ms", 0)
+        )
+        entry["last_seen"] = time.time()
+        entries[key] = entry
+        while len(entries) > self.max_entries:
+            entries.popitem(last=False)
+
+    def record(self, tool: str, query: str, summary: Dict[str, Any]) -> None:
+        """
+        Add the statistics of one executed query.
+
+        Args:
+            tool (str): Name of the tool that ran the query.
+            query (str): The KQL query.
+            summary (dict): Output of summarize_statistics().
+        """
+        fingerprint, template = fingerprint_kql(query)
+        sample = template[:500]
+        tables = referenced_tables(query) or ["(unknown)"]
+        with self._lock:
+            self._update("fingerprint", fingerprint, summary, sample)
+            self._update("tool", tool or "(unknown)", summary, sample)
+            for table in tables:
+                self._update("table", table, summary, sample)
+
+    def top(
+        self,
+        group_by: str = "fingerprint",
+        sort_by: str = "cpu_time_ms",
+        limit: int = 10,
+    ) -> List[Dict[str, Any]]:
+        """
+        Return the heaviest entries of a grouping.
+
+        Args:
+            group_by (str): 'fingerprint', 'tool' or 'table'.
+            sort_by (str): 'count' or a summed field such as 'cpu_time_ms'.
+            limit (int): Maximum entries to return.
+        Returns:
+            list: Entry dicts, heaviest first, with per-query averages.
+        Raises:
+            ValueError: If group_by or sort_by is not supported.
+        """
+        if group_by not in GROUPINGS:
+            raise ValueError(f"group_by must be one of: {', '.join(GROUPINGS)}")
+        if sort_by not in SORT_FIELDS:
+            raise ValueError(f"sort_by must be one of: {', '.join(SORT_FIELDS)}")
+        with self._lock:
+            entries = [dict(entry) for entry in self._groups[group_by].values()]
+        entries.sort(key=lambda entry: entry[sort_by], reverse=True)
+        for entry in entries[:limit]:
+            entry["avg_cpu_time_ms"] = round(entry["cpu_time_ms"] / entry["count"], 3)
+            entry["avg_rows_scanned"] = round(entry["rows_scanned"] / entry["count"], 1)
+        return entries[:limit]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of tracked keys per grouping and the start time."""
+        with self._lock:
+            counts = {name: len(entries) for name, entries in self._groups.items()}
+        return {"tracked": counts, "since": self._since}
+
+    def clear(self) -> None:
+        """Drop all recorded statistics."""
+        with self._lock:
+            for entries in self._groups.values():
+                entries.clear()
+            self._since = time.time()
+
+
+# Shared store for the whole server process
+query_stats = QueryStatsStore()
@@ -0,0 +1,291 @@
+"""
+FILE: utilities/rate_limiter.py
+DESCRIPTION:
+    Client-side adaptive rate limiting per Azure endpoint family.
+
+    Each endpoint family (ARM management, the Log Analytics query API and
+    Microsoft Graph) gets its own token bucket. The bucket's refill rate
+    adapts to what the service reports:
+
+    - A 429 halves the rate (down to a floor) and drains the bucket.
+    - x-ms-ratelimit-remaining-* headers below the low watermark scale the
+      rate down in proportion to the remaining quota.
+    - Healthy responses raise the rate again in small steps up to the
+      configured maximum.
+
+    A burst of tool calls is therefore spread out before it can trip
+    subscription- or tenant-wide throttling shared with other automation.
+    Requests to hosts outside the known families are not limited.
+
+    Tunable through MCP_RATELIMIT_ARM_RPS, MCP_RATELIMIT_LOGANALYTICS_RPS,
+    MCP_RATELIMIT_GRAPH_RPS (0 disables a family) and
+    MCP_RATELIMIT_LOW_WATERMARK.
+"""
+
+import asyncio
+import logging
+import os
+import time
+from threading import Lock
+from typing import Any, Dict, Optional
+from urllib.parse import urlsplit
+
+logger = logging.getLogger(__name__)
+
+# Endpoint families
+ENDPOINT_ARM = "arm"
+ENDPOINT_LOGANALYTICS = "loganalytics"
+ENDPOINT_GRAPH = "graph"
+
+_HOST_FAMILIES = {
+    "management.azure.com": ENDPOINT_ARM,
+    "api.loganalytics.io": ENDPOINT_LOGANALYTICS,
+    "api.loganalytics.azure.com": ENDPOINT_LOGANALYTICS,
+    "graph.microsoft.com": ENDPOINT_GRAPH,
+}
+
+# Default sustained requests per second and burst size per family
+DEFAULT_RATES = {ENDPOINT_ARM: 10.0, ENDPOINT_LOGANALYTICS: 5.0, ENDPOINT_GRAPH: 10.0}
+DEFAULT_BURSTS = {ENDPOINT_ARM: 50, ENDPOINT_LOGANALYTICS: 20, ENDPOINT_GRAPH: 40}
+
+RATELIMIT_HEADER_PREFIX = "x-ms-ratelimit-remaining-"
+
+
+def _env_number(name: str, default: float) -> float:
+    """Read a non-negative number from the environment, falling back to default."""
+    try:
+        value = float(os.environ.get(name, default))
+        return value if value >= 0 else default
+    except (TypeError, ValueError):
+        logger.warning("Invalid value for %s; using %s", name, default)
+        return default
+
+
+def endpoint_family(url: str) -> Optional[str]:
+    """
+    Return the endpoint family for a request URL.
+
+    Args:
+        url (str): Request URL.
+    Returns:
+        Optional[str]: One of the ENDPOINT_* constants, or None if unknown.
+    """
+    host = (urlsplit(url).hostname or "").lower()
+    return _HOST_FAMILIES.get(host)
+
+
+def lowest_remaining_quota(headers: Any) -> Optional[float]:
+    """
+    Return the lowest x-ms-ratelimit-remaining-* value in the headers.
+
+    Args:
+        headers: Response headers (case-insensitive mapping or dict).
+    Returns:
+        Optional[float]: The lowest remaining quota, or None if not reported.
+    """
+    if not headers:
+        return None
+    lowest = None
+    for key, value in headers.items():
+        if not str(key).lower().startswith(RATELIMIT_HEADER_PREFIX):
+            continue
+        try:
+            remaining = float(value)
+        except (TypeError, ValueError):
+            continue
+        lowest = remaining if lowest is None else min(lowest, remaining)
+    return lowest
+
+
+def _on_event_loop() -> bool:
+    """Return True if the calling thread is running an asyncio event loop."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return False
+    return True
+
+
+class AdaptiveTokenBucket:
+    """
+    Thread-safe token bucket whose refill rate adapts to service feedback.
+
+    Callers reserve a token and sleep for the returned wait, so the bucket
+    works from worker threads (acquire) and the event loop (acquire_async)
+    without holding a lock while waiting.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        max_rate: float,
+        burst: int,
+        low_watermark: float,
+        min_rate: float = 0.2,
+    ):
+        """
+        Initialize the bucket.
+
+        Args:
+            name (str): Endpoint family name, used in logs and stats.
+            max_rate (float): Maximum sustained requests per second.
+            burst (int): Bucket capacity (requests allowed back to back).
+            low_watermark (float): Remaining-quota level below which the
+                rate is reduced.
+            min_rate (float): Floor the rate never drops below.
+        """
+        self.name = name
+        self.max_rate = max_rate
+        self.min_rate = min(min_rate, max_rate)
+        self.burst = max(int(burst), 1)
+        self.low_watermark = low_watermark
+        self.rate = max_rate
+        self._tokens = float(self.burst)
+        self._updated = time.monotonic()
+        self._lock = Lock()
+        self._stats = {"requests": 0, "throttled": 0, "delayed": 0, "waited_ms": 0}
+
+    def _reserve(self) -> float:
+        """Take a token (possibly going into debt) and return the wait in seconds."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(
+                float(self.burst), self._tokens + (now - self._updated) * self.rate
+            )
+            self._updated = now
+            self._tokens -= 1
+            self._stats["requests"] += 1
+            if self._tokens >= 0:
+                return 0.0
+            wait = -self._tokens / self.rate
+            self._stats["delayed"] += 1
+            self._stats["waited_ms"] += int(wait * 1000)
+            return wait
+
+    def acquire(self) -> None:
+        """
+        Block the calling worker thread until a request may be sent.
+
+        Only for executor threads: sleeping on the event loop would stall
+        every other request. Called on the loop (a synchronous SDK call made
+        from a coroutine), it logs a warning and returns at once; the token
+        debt it took still delays the callers that follow.
+        """
+        wait = self._reserve()
+        if not wait:
+            return
+        if _on_event_loop():
+            logger.warning(
+                "Rate limit wait of %.2fs for %s skipped on the event loop; "
+                "run the call in an executor or use acquire_async()",
+                wait,
+                self.name,
+            )
+            return
+        time.sleep(wait)
+
+    async def acquire_async(self) -> None:
+        """Wait on the event loop until a request may be sent."""
+        wait = self._reserve()
+        if wait:
+            await asyncio.sleep(wait)
+
+    def record(self, status_code: Optional[int], headers: Any = None) -> None:
+        """
+        Adapt the rate from a response.
+
+        Args:
+            status_code (int, optional): HTTP status of the response.
+            headers: Response headers.
+        """
+        remaining = lowest_remaining_quota(headers)
+        with self._lock:
+            previous = self.rate
+            if status_code == 429:
+                self._stats["throttled"] += 1
+                self.rate = max(self.min_rate, self.rate / 2)
+                self._tokens = min(self._tokens, 0.0)
+            elif remaining is not None and remaining < self.low_watermark:
+                target = self.max_rate * max(remaining, 0) / self.low_watermark
+                self.rate = max(self.min_rate, min(self.rate, target))
+            elif self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.max_rate * 0.05)
+            rate = self.rate
+        if rate < previous:
+            logger.info(
+                "Rate limit for %s lowered to %.2f req/s (status=%s, remaining=%s)",
+                self.name,
+                rate,
+                status_code,
+                remaining,
+            )
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the current rate and request counters."""
+        with self._lock:
+            return {
+                "rate": round(self.rate, 3),
+                "max_rate": self.max_rate,
+                "burst": self.burst,
+                "tokens": round(self._tokens, 2),
+                **self._stats,
+            }
+
+
+class RateLimiterRegistry:
+    """
+    Per-endpoint-family token buckets shared by every outbound Azure call.
+
+    URLs on unknown hosts, and families whose rate is configured as 0, pass
+    through unlimited.
+    """
+
+    def __init__(self):
+        low_watermark = _env_number("MCP_RATELIMIT_LOW_WATERMARK", 10)
+        self._buckets: Dict[str, AdaptiveTokenBucket] = {}
+        for family, default_rate in DEFAULT_RATES.items():
+            rate = _env_number(f"MCP_RATELIMIT_{family.upper()}_RPS", default_rate)
+            if rate <= 0:
+                logger.info("Client-side rate limiting disabled for %s", family)
+                continue
+            self._buckets[family] = AdaptiveTokenBucket(
+                family, rate, DEFAULT_BURSTS[family], low_watermark
+            )
+
+    def for_url(self, url: str) -> Optional[AdaptiveTokenBucket]:
+        """
+        Return the bucket governing a request URL.
+
+        Args:
+            url (str): Request URL.
+        Returns:
+            Optional[AdaptiveTokenBucket]: The bucket, or None if unlimited.
+        """
+        family = endpoint_family(url)
+        return self._buckets.get(family) if family else None
+
+    def acquire(self, url: str) -> None:
+        """Block a worker thread until a request to the URL may be sent."""
+        bucket = self.for_url(url)
+        if bucket is not None:
+            bucket.acquire()
+
+    async def acquire_async(self, url: str) -> None:
+        """Wait on the event loop until a request to the URL may be sent."""
+        bucket = self.for_url(url)
+        if bucket is not None:
+            await bucket.acquire_async()
+
+    def record(self, url: str, status_code: Optional[int], headers: Any = None) -> None:
+        """Feed a response for the URL back into its bucket."""
+        bucket = self.for_url(url)
+        if bucket is not None:
+            bucket.record(status_code, headers)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return stats for every configured endpoint family."""
+        return {family: bucket.stats() for family, bucket in self._buckets.items()}
+
+
+# Singleton limiter shared by REST and SDK clients
+rate_limiters = RateLimiterRegistry()
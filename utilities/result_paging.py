@@ -0,0 +1,194 @@
+"""
+FILE: utilities/result_paging.py
+DESCRIPTION:
+    Result size budget and continuation cursors for log searches.
+
+    Query results are cut off at a row budget (MCP_RESULT_MAX_ROWS) and an
+    approximate serialized size budget (MCP_RESULT_MAX_BYTES), whichever is
+    reached first, so one unbounded query cannot flood the response. The
+    row budget is pushed into the query itself (one extra row tells whether
+    more follow), so oversized results never leave the service.
+
+    A truncated result carries an opaque cursor. The cursor pins the query,
+    the absolute time window and the row offset; the next page is fetched by
+    re-running the query with row_number() windowing so that only the
+    requested page leaves the service.
+"""
+
+import base64
+import binascii
+import json
+import logging
+import os
+from datetime import datetime
+from typing import Any, List, Optional, Sequence, Tuple
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_MAX_ROWS = 5000
+DEFAULT_MAX_BYTES = 4 * 1024 * 1024
+CURSOR_VERSION = 1
+# Row number column added by the paging query
+ROW_NUMBER_COLUMN = "_rn"
+
+
+def _env_int(name: str, default: int) -> int:
+    """Read a non-negative integer from the environment, falling back to default."""
+    try:
+        value = int(os.environ.get(name, default))
+        return value if value >= 0 else default
+    except (TypeError, ValueError):
+        logger.warning("Invalid value for %s; using %d", name, default)
+        return default
+
+
+def result_limits() -> Tuple[int, int]:
+    """
+    Return the configured (max rows, max bytes) budget; 0 means unlimited.
+    """
+    return (
+        _env_int("MCP_RESULT_MAX_ROWS", DEFAULT_MAX_ROWS),
+        _env_int("MCP_RESULT_MAX_BYTES", DEFAULT_MAX_BYTES),
+    )
+
+
+def rows_within_budget(
+    rows: Sequence[Sequence[Any]],
+    max_rows: int,
+    max_bytes: int,
+    row_overhead: int = 0,
+) -> Tuple[int, Optional[str]]:
+    """
+    Count how many leading rows fit the row and byte budget.
+
+    Row sizes are measured as compact JSON; row_overhead is added per row
+    for layouts that repeat column names. The first row is always kept so
+    that paging makes progress even if a single row exceeds the budget.
+
+    Args:
+        rows: Result rows (sequences of cell values).
+        max_rows (int): Maximum rows (0 for no limit).
+        max_bytes (int): Maximum approximate serialized bytes (0 for no limit).
+        row_overhead (int): Extra bytes counted for every row.
+    Returns:
+        tuple: (number of rows kept, reason if rows were cut off, else None).
+    """
+    limit = len(rows) if not max_rows else min(len(rows), max_rows)
+    if max_bytes:
+        used = 0
+        for idx in range(limit):
+            used += len(json.dumps(rows[idx], default=str)) + row_overhead
+            if used > max_bytes and idx > 0:
+                return idx, f"byte budget of {max_bytes} bytes"
+    if limit < len(rows):
+        return limit, f"row budget of {limit} rows"
+    return limit, None
+
+
+def page_query(query: str, offset: int, limit: int) -> str:
+    """
+    Wrap a query so that only rows offset+1 .. offset+limit are returned.
+
+    The query's final tabular expression is serialized and numbered; the
+    numbering column is dropped from the output. Rows only page stably if
+    the query itself orders them (e.g. ends with 'sort by').
+
+    Args:
+        query (str): The original KQL query.
+        offset (int): Number of rows already returned.
+        limit (int): Maximum rows in the page.
+    Returns:
+        str: The paging query.
+    """
+    # A newline keeps a trailing // comment from swallowing the suffix
+    return (
+        f"{query.rstrip().rstrip(';')}\n"
+        f"| serialize | extend {ROW_NUMBER_COLUMN} = row_number()\n"
+        f"| where {ROW_NUMBER_COLUMN} > {offset} "
+        f"and {ROW_NUMBER_COLUMN} <= {offset + limit}\n"
+        f"| project-away {ROW_NUMBER_COLUMN}"
+    )
+
+
+def cap_query(query: str, limit: int) -> str:
+    """
+    Append a row limit to a query so the service stops after limit rows.
+
+    Args:
+        query (str): The original KQL query.
+        limit (int): Maximum rows to return.
+    Returns:
+        str: The capped query.
+    """
+    return f"{query.rstrip().rstrip(';')}\n| take {limit}"
+
+
+class ResultCursor:
+    """
+    Position in a paged query result.
+
+    Attributes:
+        query (str): The original KQL query.
+        start (datetime): Start of the pinned time window.
+        end (datetime): End of the pinned time window.
+        offset (int): Rows already returned.
+    """
+
+    def __init__(self, query: str, start: datetime, end: datetime, offset: int):
+        self.query = query
+        self.start = start
+        self.end = end
+        self.offset = offset
+
+    @property
+    def timespan(self) -> Tuple[datetime, datetime]:
+        """The pinned window as a (start, end) tuple for the SDK."""
+        return (self.start, self.end)
+
+    def encode(self) -> str:
+        """Serialize the cursor to an opaque URL-safe string."""
+        payload = {
+            "v": CURSOR_VERSION,
+            "q": self.query,
+            "s": self.start.isoformat(),
+            "e": self.end.isoformat(),
+            "o": self.offset,
+        }
+        raw = json.dumps(payload, separators=(",", ":")).encode("utf-8")
+        return base64.urlsafe_b64encode(raw).decode("ascii")
+
+    @classmethod
+    def decode(cls, token: str) -> "ResultCursor":
+        """
+        Parse a cursor produced by encode().
+
+        Raises:
+            ValueError: If the token is malformed or from another version.
+        """
+        try:
+            payload = json.loads(base64.urlsafe_b64decode(token.encode("ascii")))
+            if payload.get("v") != CURSOR_VERSION:
+                raise ValueError("unsupported cursor version")
+            cursor = cls(
+                payload["q"],
+                datetime.fromisoformat(payload["s"]),
+                datetime.fromisoformat(payload["e"]),
+                int(payload["o"]),
+            )
+        except (
+            AttributeError,
+            binascii.Error,
+            KeyError,
+            TypeError,
+            UnicodeError,
+            json.JSONDecodeError,
+        ) as e:
+            raise ValueError(f"malformed cursor ({e})") from e
+        if cursor.offset < 0 or cursor.start > cursor.end:
+            raise ValueError("malformed cursor")
+        return cursor
+
+
+def column_name_overhead(names: List[Any]) -> int:
+    """Bytes a 'rows' layout adds per row by repeating the column names."""
+    return sum(len(json.dumps(str(name))) + 2 for name in names)
@@ -0,0 +1,481 @@
+"""
+FILE: utilities/retry.py
+DESCRIPTION:
+    Throttling-aware retry engine shared by REST and Azure SDK calls.
+
+    - Jittered exponential backoff for throttling (429), transient server
+      errors (5xx) and connection/timeouts.
+    - Honors Retry-After / retry-after-ms headers from ARM, Log Analytics
+      and Microsoft Graph.
+    - Requests are only replayed after a 5xx, 408 or timeout when that is
+      safe: idempotent methods and read-only Log Analytics query POSTs.
+      Throttled (429) requests are retried whatever their method.
+    - Caps the total time spent retrying per tool call: MCPToolBase starts
+      a retry budget for each call, which follows the call into worker
+      threads through contextvars.
+
+    REST calls use retry_call / retry_async directly. Azure SDK clients get
+    the same behavior by installing AzureSdkRetryPolicy as their pipeline
+    retry policy (see sdk_client_kwargs); it also sends every SDK attempt
+    through the per-endpoint rate limiter (utilities/rate_limiter.py).
+
+    Tunable through MCP_RETRY_MAX_ATTEMPTS, MCP_RETRY_BASE_DELAY,
+    MCP_RETRY_MAX_DELAY and MCP_RETRY_BUDGET_SECONDS.
+"""
+
+import asyncio
+import contextvars
+import email.utils
+import logging
+import os
+import random
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional, TypeVar
+
+import httpx
+import requests
+from azure.core.exceptions import ServiceRequestError, ServiceResponseError
+from azure.core.pipeline.policies import HTTPPolicy
+
+from utilities.rate_limiter import ENDPOINT_LOGANALYTICS, endpoint_family, rate_limiters
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS_CODES = frozenset({408, 429, 500, 502, 503, 504})
+# Methods that may be replayed after the service may already have acted on them
+IDEMPOTENT_METHODS = frozenset({"GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"})
+
+# Errors raised before an HTTP status is available (DNS, connect, read timeouts)
+TRANSIENT_ERRORS = (
+    requests.exceptions.ConnectionError,
+    requests.exceptions.Timeout,
+    httpx.TransportError,
+    ServiceRequestError,
+    ServiceResponseError,
+)
+# Transient errors raised before the request reached the service
+UNSENT_ERRORS = (
+    requests.exceptions.ConnectTimeout,
+    httpx.ConnectError,
+    httpx.ConnectTimeout,
+    httpx.PoolTimeout,
+    ServiceRequestError,
+)
+
+
+def _env_number(name: str, default: float) -> float:
+    """Read a non-negative number from the environment, falling back to default."""
+    try:
+        value = float(os.environ.get(name, default))
+        return value if value >= 0 else default
+    except (TypeError, ValueError):
+        logger.warning("Invalid value for %s; using %s", name, default)
+        return default
+
+
+def get_status_code(error: BaseException) -> Optional[int]:
+    """
+    Return the HTTP status code carried by a requests, httpx or Azure SDK error.
+
+    Args:
+        error (BaseException): The raised error.
+    Returns:
+        Optional[int]: The status code, or None if not an HTTP status error.
+    """
+    status = getattr(error, "status_code", None)
+    if status is None:
+        status = getattr(getattr(error, "response", None), "status_code", None)
+    return status if isinstance(status, int) else None
+
+
+def get_headers(error_or_response: Any) -> Dict[str, str]:
+    """
+    Return response headers from an error or response object, if any.
+
+    Args:
+        error_or_response: A requests/httpx/azure-core error or response.
+    Returns:
+        dict: The headers (possibly empty).
+    """
+    headers = getattr(error_or_response, "headers", None)
+    if headers is None:
+        headers = getattr(getattr(error_or_response, "response", None), "headers", None)
+    return headers if headers is not None else {}
+
+
+def parse_retry_after(headers: Any) -> Optional[float]:
+    """
+    Parse the delay requested by the service, in seconds.
+
+    Supports retry-after-ms, x-ms-retry-after-ms and Retry-After (seconds or
+    HTTP date).
+
+    Args:
+        headers: Response headers (case-insensitive mapping or dict).
+    Returns:
+        Optional[float]: Seconds to wait, or None if no hint was given.
+    """
+    if not headers:
+        return None
+    lowered = {str(k).lower(): v for k, v in headers.items()}
+    for key in ("retry-after-ms", "x-ms-retry-after-ms"):
+        if key in lowered:
+            try:
+                return max(float(lowered[key]) / 1000.0, 0.0)
+            except (TypeError, ValueError):
+                pass
+    value = lowered.get("retry-after")
+    if value is None:
+        return None
+    try:
+        return max(float(value), 0.0)
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = email.utils.parsedate_to_datetime(value)
+        return max(retry_at.timestamp() - time.time(), 0.0)
+    except (TypeError, ValueError):
+        return None
+
+
+def is_replay_safe(method: str, url: str = "") -> bool:
+    """
+    Return True if a request may be sent again after a 5xx, 408 or timeout.
+
+    Idempotent methods may always be replayed. POSTs to the Log Analytics
+    query API are too: they only run KQL queries, which read data and
+    cannot change it, so a replay costs query time but has no side effect.
+    Other POST and PATCH requests are only retried when the service clearly
+    did not process them (429, or a connection that failed before the
+    request was sent).
+
+    Args:
+        method (str): HTTP method.
+        url (str): Request URL.
+    Returns:
+        bool: Whether replaying the request is safe.
+    """
+    if method.upper() in IDEMPOTENT_METHODS:
+        return True
+    return bool(url) and endpoint_family(url) == ENDPOINT_LOGANALYTICS
+
+
+def is_retryable(error: BaseException, replay_safe: bool = True) -> bool:
+    """
+    Return True if the error is worth retrying (throttling or transient).
+
+    Args:
+        error (BaseException): The raised error.
+        replay_safe (bool): Whether the failed request may be replayed after
+            the service may have acted on it (see is_replay_safe). When
+            False, only throttling and errors raised before the request
+            was sent are retryable.
+    Returns:
+        bool: Whether the call may be retried.
+    """
+    status = get_status_code(error)
+    if status is not None:
+        if status == 429:
+            return True
+        return replay_safe and status in RETRYABLE_STATUS_CODES
+    return isinstance(error, TRANSIENT_ERRORS if replay_safe else UNSENT_ERRORS)
+
+
+# Absolute monotonic deadline for retries within the current tool call
+_retry_deadline: contextvars.ContextVar[Optional[float]] = contextvars.ContextVar(
+    "retry_deadline", default=None
+)
+
+
+def start_retry_budget(seconds: Optional[float] = None) -> contextvars.Token:
+    """
+    Start a retry budget for the current tool call.
+
+    The budget is a wall-clock deadline, counted from now: attempts and the
+    sleeps between them both use it up. A retry is only scheduled if its
+    backoff sleep ends before the deadline; the final attempt itself is not
+    cut short.
+
+    Args:
+        seconds (float, optional): Seconds from now after which no further
+            retry is started. Defaults to MCP_RETRY_BUDGET_SECONDS or 60.
+    Returns:
+        contextvars.Token: Pass to reset_retry_budget when the call ends.
+    """
+    if seconds is None:
+        seconds = _env_number("MCP_RETRY_BUDGET_SECONDS", 60.0)
+    return _retry_deadline.set(time.monotonic() + seconds)
+
+
+def reset_retry_budget(token: contextvars.Token) -> None:
+    """End the retry budget started by start_retry_budget."""
+    _retry_deadline.reset(token)
+
+
+def remaining_retry_budget() -> Optional[float]:
+    """Return seconds left in the current retry budget, or None if unbounded."""
+    deadline = _retry_deadline.get()
+    if deadline is None:
+        return None
+    return max(deadline - time.monotonic(), 0.0)
+
+
+class RetryPolicy:
+    """
+    Retry decisions shared by all call paths.
+
+    Attributes:
+        max_attempts (int): Total attempts including the first one.
+        base_delay (float): Backoff base in seconds.
+        max_delay (float): Upper bound for a single backoff sleep.
+    """
+
+    def __init__(
+        self,
+        max_attempts: Optional[int] = None,
+        base_delay: Optional[float] = None,
+        max_delay: Optional[float] = None,
+    ):
+        self.max_attempts = max(
+            int(
+                max_attempts
+                if max_attempts is not None
+                else _env_number("MCP_RETRY_MAX_ATTEMPTS", 4)
+            ),
+            1,
+        )
+        self.base_delay = (
+            base_delay
+            if base_delay is not None
+            else _env_number("MCP_RETRY_BASE_DELAY", 1.0)
+        )
+        self.max_delay = (
+            max_delay
+            if max_delay is not None
+            else _env_number("MCP_RETRY_MAX_DELAY", 30.0)
+        )
+
+    def backoff(self, attempt: int) -> float:
+        """
+        Jittered exponential backoff for the given (1-based) attempt.
+
+        Args:
+            attempt (int): The attempt that just failed.
+        Returns:
+            float: Seconds to sleep.
+        """
+        ceiling = min(self.max_delay, self.base_delay * (2 ** (attempt - 1)))
+        return random.uniform(ceiling / 2, ceiling)
+
+    def next_delay(self, attempt: int, headers: Any = None) -> Optional[float]:
+        """
+        Decide whether to retry after a failed attempt and for how long to wait.
+
+        A Retry-After hint from the service takes precedence over backoff.
+        Returns None when attempts or the per-call retry budget are exhausted.
+
+        Args:
+            attempt (int): The attempt that just failed (1-based).
+            headers: Response headers from the failed attempt, if any.
+        Returns:
+            Optional[float]: Seconds to sleep before retrying, or None to give up.
+        """
+        if attempt >= self.max_attempts:
+            return None
+        retry_after = parse_retry_after(headers)
+        delay = retry_after if retry_after is not None else self.backoff(attempt)
+        remaining = remaining_retry_budget()
+        if remaining is not None and delay > remaining:
+            logger.warning(
+                "Retry budget exhausted (need %.1fs, %.1fs left)", delay, remaining
+            )
+            return None
+        return delay
+
+
+default_retry_policy = RetryPolicy()
+
+
+def _log_retry(name: str, error: Any, attempt: int, policy: RetryPolicy, delay: float):
+    logger.warning(
+        "Retrying %s after %s (attempt %d/%d, sleeping %.1fs)",
+        name,
+        error,
+        attempt,
+        policy.max_attempts,
+        delay,
+    )
+
+
+def retry_call(
+    func: Callable[..., T],
+    *args: Any,
+    name: Optional[str] = None,
+    policy: Optional[RetryPolicy] = None,
+    replay_safe: bool = True,
+    **kwargs: Any,
+) -> T:
+    """
+    Call a blocking function, retrying throttled and transient failures.
+
+    Intended to run in a worker thread (it sleeps with time.sleep).
+
+    Args:
+        func: The blocking callable.
+        *args: Positional arguments for func.
+        name (str, optional): Name used in log messages.
+        policy (RetryPolicy, optional): Policy to use (default: shared policy).
+        replay_safe (bool): Whether func may be replayed after a 5xx, 408 or
+            timeout; pass is_replay_safe(method, url) for HTTP requests.
+        **kwargs: Keyword arguments for func.
+    Returns:
+        The result of func.
+    Raises:
+        Exception: The last error once retries are exhausted or not allowed.
+    """
+    policy = policy or default_retry_policy
+    name = name or getattr(func, "__name__", "call")
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return func(*args, **kwargs)
+        except Exception as e:
+            if not is_retryable(e, replay_safe):
+                raise
+            headers = get_headers(e)
+            delay = policy.next_delay(attempt, headers)
+            if delay is None:
+                raise
+            _log_retry(name, e, attempt, policy, delay)
+            time.sleep(delay)
+
+
+async def retry_async(
+    call: Callable[[], Awaitable[T]],
+    name: Optional[str] = None,
+    policy: Optional[RetryPolicy] = None,
+    replay_safe: bool = True,
+) -> T:
+    """
+    Await a coroutine factory, retrying throttled and transient failures.
+
+    Args:
+        call: Zero-argument callable returning a new awaitable per attempt.
+        name (str, optional): Name used in log messages.
+        policy (RetryPolicy, optional): Policy to use (default: shared policy).
+        replay_safe (bool): Whether the call may be replayed after a 5xx, 408
+            or timeout; pass is_replay_safe(method, url) for HTTP requests.
+    Returns:
+        The awaited result.
+    Raises:
+        Exception: The last error once retries are exhausted or not allowed.
+    """
+    policy = policy or default_retry_policy
+    name = name or "async call"
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            return await call()
+        except Exception as e:
+            if not is_retryable(e, replay_safe):
+                raise
+            headers = get_headers(e)
+            delay = policy.next_delay(attempt, headers)
+            if delay is None:
+                raise
+            _log_retry(name, e, attempt, policy, delay)
+            await asyncio.sleep(delay)
+
+
+class AzureSdkRetryPolicy(HTTPPolicy):
+    """
+    azure-core pipeline policy applying the shared retry engine to SDK clients.
+
+    Installed in place of the SDK's default RetryPolicy, so management and
+    Log Analytics query clients honor the same backoff, Retry-After,
+    per-endpoint rate limits and per-call retry budget as REST calls.
+    """
+
+    def __init__(self, policy: Optional[RetryPolicy] = None):
+        super().__init__()
+        self.policy = policy or default_retry_policy
+
+    @staticmethod
+    def replay_safe(http_request) -> bool:
+        """
+        Return True if a request may be sent again after a 5xx or timeout.
+
+        Args:
+            http_request: The azure-core HttpRequest.
+        Returns:
+            bool: Whether replaying the request is safe (see is_replay_safe).
+        """
+        return is_replay_safe(http_request.method, http_request.url)
+
+    def send(self, request):
+        """
+        Send the request down the pipeline, retrying retryable outcomes.
+
+        See replay_safe() for which requests are retried after a 5xx, a 408
+        or a failure while reading the response.
+
+        Args:
+            request: The azure-core PipelineRequest.
+        Returns:
+            PipelineResponse: The final response (errors are raised by the SDK).
+        """
+        url = request.http_request.url
+        name = f"{request.http_request.method} {url.split('?')[0]}"
+        replay_safe = self.replay_safe(request.http_request)
+        attempt = 0
+        while True:
+            attempt += 1
+            rate_limiters.acquire(url)
+            try:
+                response = self.next.send(request)
+            except TRANSIENT_ERRORS as e:
+                # The request may have reached the service before this failed
+                if isinstance(e, ServiceResponseError) and not replay_safe:
+                    raise
+                delay = self.policy.next_delay(attempt)
+                if delay is None:
+                    raise
+                _log_retry(name, e, attempt, self.policy, delay)
+                time.sleep(delay)
+                continue
+            http_response = response.http_response
+            rate_limiters.record(
+                url, http_response.status_code, http_response.headers
+            )
+            if http_response.status_code not in RETRYABLE_STATUS_CODES:
+                return response
+            if http_response.status_code != 429 and not replay_safe:
+                return response
+            delay = self.policy.next_delay(attempt, http_response.headers)
+            if delay is None:
+                return response
+            _log_retry(
+                name,
+                f"HTTP {http_response.status_code}",
+                attempt,
+                self.policy,
+                delay,
+            )
+            time.sleep(delay)
+
+
+def sdk_client_kwargs() -> Dict[str, Any]:
+    """
+    Return keyword arguments that install the shared retry engine on an SDK client.
+
+    A new policy instance is created per client, as azure-core chains policies
+    per pipeline.
+
+    Returns:
+        dict: Keyword arguments for Azure SDK client constructors.
+    """
+    return {"retry_policy": AzureSdkRetryPolicy()}
@@ -0,0 +1,93 @@
+"""
+FILE: utilities/single_flight.py
+DESCRIPTION:
+    Coalesces identical concurrent async calls into one upstream call.
+
+    The first caller for a key starts the work; callers arriving while it
+    is still in flight await the same task and receive the same result (or
+    exception). The key is forgotten as soon as the call completes, so this
+    de-duplicates in-flight work only and never serves stale results.
+
+    The shared call outlives any single cancelled caller, but is cancelled
+    once every caller waiting on it has been cancelled, so abandoned work
+    does not keep running for nobody.
+"""
+
+import asyncio
+import logging
+from typing import Any, Awaitable, Callable, Dict, Hashable, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class SingleFlight:
+    """
+    Per-key de-duplication of in-flight coroutines on the event loop.
+    """
+
+    def __init__(self, name: str):
+        """
+        Initialize the group.
+
+        Args:
+            name (str): Name used in log messages.
+        """
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Future] = {}
+        self._waiters: Dict[asyncio.Future, int] = {}
+        self._stats = {"calls": 0, "shared": 0, "abandoned": 0}
+
+    async def do(self, key: Hashable, call: Callable[[], Awaitable[T]]) -> T:
+        """
+        Run call() for the key, or join the identical call already in flight.
+
+        A waiter being cancelled does not cancel the shared call for the
+        other waiters; the last waiter being cancelled does.
+
+        Args:
+            key: Hashable identity of the call.
+            call: Zero-argument callable returning the awaitable to run.
+        Returns:
+            The shared result.
+        Raises:
+            Exception: The exception raised by the shared call.
+        """
+        self._stats["calls"] += 1
+        future = self._inflight.get(key)
+        if future is None or future.done():
+            future = asyncio.ensure_future(call())
+            self._inflight[key] = future
+            future.add_done_callback(lambda f: self._forget(key, f))
+        else:
+            self._stats["shared"] += 1
+            logger.debug("%s: joining in-flight call for %s", self.name, key)
+        self._waiters[future] = self._waiters.get(future, 0) + 1
+        try:
+            return await asyncio.shield(future)
+        except asyncio.CancelledError:
+            if self._waiters[future] == 1 and not future.done():
+                self._stats["abandoned"] += 1
+                logger.info("%s: cancelling abandoned call for %s", self.name, key)
+                future.cancel()
+            raise
+        finally:
+            self._waiters[future] -= 1
+            if not self._waiters[future]:
+                del self._waiters[future]
+
+    def _forget(self, key: Hashable, future: asyncio.Future) -> None:
+        """Drop a completed call and mark its exception as retrieved."""
+        if self._inflight.get(key) is future:
+            del self._inflight[key]
+        if not future.cancelled():
+            future.exception()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return call counters and the number of calls in flight."""
+        return {**self._stats, "in_flight": len(self._inflight)}
+
+
+# Shared group for Log Analytics query_workspace calls
+query_single_flight = SingleFlight("query_workspace")
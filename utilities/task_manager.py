@@ -2,12 +2,33 @@
 FILE: utilities/task_manager.py
 DESCRIPTION:
     Provides utilities for managing asynchronous tasks across the application.
+
+    Every tracked task is recorded in the process-wide task_registry with its
+    name, operation, start time, time spent waiting for an executor thread,
+    run time and outcome. Running tasks and a bounded history of finished
+    ones can be listed, along with per-operation latency histograms, to see
+    which upstream call is slow or stuck.
 """
 
 import asyncio
 import sys
 import logging
-from typing import Set, Callable, TypeVar, Any, Optional, Coroutine
+import time
+from collections import deque
+from threading import Lock
+from typing import (
+    Any,
+    Callable,
+    Coroutine,
+    Deque,
+    Dict,
+    List,
+    Optional,
+    Set,
+    TypeVar,
+)
+
+from utilities.executors import EXECUTOR_ARM, PRIORITY_NORMAL, run_in_executor
 
 # Configure logging to stderr
 logger = logging.getLogger(__name__)
@@ -24,11 +45,284 @@ R = TypeVar("R")
 # Global set to track all active tasks
 active_tasks: Set[asyncio.Task] = set()
 
+# Finished tasks kept for inspection
+TASK_HISTORY = 200
+# Upper bounds (ms) of the latency histogram buckets; slower goes to the last
+LATENCY_BUCKETS_MS = (10, 50, 100, 250, 500, 1000, 2500, 5000, 10000, 30000, 60000)
+TASK_OUTCOMES = ("ok", "error", "timeout", "cancelled")
+
+
+def _bucket_label(ms: float) -> str:
+    """Return the histogram bucket label for a latency."""
+    for bound in LATENCY_BUCKETS_MS:
+        if ms <= bound:
+            return f"<={bound}"
+    return f">{LATENCY_BUCKETS_MS[-1]}"
+
+
+def _operation_name(target: Any) -> str:
+    """Name a callable or coroutine for grouping, e.g. 'LogsQueryClient.query'."""
+    return getattr(target, "__qualname__", None) or type(target).__name__
+
+
+def _ms(start: Optional[float], end: Optional[float]) -> Optional[float]:
+    """Milliseconds between two perf_counter readings, if both are set."""
+    if start is None or end is None:
+        return None
+    return round((end - start) * 1000, 1)
+
+
+class TaskRecord:
+    """
+    Timing and outcome of one tracked task.
+
+    For work run on an executor, thread_started and thread_finished are set
+    from the worker thread. A task can finish (timeout, cancellation) while
+    its thread keeps running; such a record stays listed as 'orphaned' until
+    the thread returns.
+    """
+
+    __slots__ = (
+        "id",
+        "name",
+        "operation",
+        "executor",
+        "started_at",
+        "created",
+        "thread_started",
+        "thread_finished",
+        "finished",
+        "outcome",
+        "error",
+    )
+
+    def __init__(
+        self, task_id: int, name: str, operation: str, executor: Optional[str]
+    ):
+        self.id = task_id
+        self.name = name
+        self.operation = operation
+        self.executor = executor
+        self.started_at = time.time()
+        self.created = time.perf_counter()
+        self.thread_started: Optional[float] = None
+        self.thread_finished: Optional[float] = None
+        self.finished: Optional[float] = None
+        self.outcome: Optional[str] = None
+        self.error: Optional[str] = None
+
+    @property
+    def state(self) -> str:
+        """'queued', 'running', 'orphaned' or 'done'."""
+        thread_busy = (
+            self.thread_started is not None and self.thread_finished is None
+        )
+        if self.finished is not None:
+            return "orphaned" if thread_busy else "done"
+        if self.executor and self.thread_started is None:
+            return "queued"
+        return "running"
+
+    def queue_wait_ms(self, now: float) -> Optional[float]:
+        """Time spent waiting for an executor thread (so far, if still queued)."""
+        if not self.executor:
+            return None
+        return _ms(self.created, self.thread_started or self.finished or now)
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        """Report the record; times of unfinished work are measured up to now."""
+        return {
+            "id": self.id,
+            "name": self.name,
+            "operation": self.operation,
+            "executor": self.executor,
+            "state": self.state,
+            "started_at": self.started_at,
+            "elapsed_ms": _ms(self.created, self.finished or now),
+            "queue_wait_ms": self.queue_wait_ms(now),
+            "run_ms": _ms(
+                self.thread_started,
+                self.thread_finished or (now if self.thread_started else None),
+            ),
+            "outcome": self.outcome,
+            "error": self.error,
+        }
+
+
+class TaskRegistry:
+    """
+    Thread-safe registry of running and recently finished tasks.
+    """
+
+    def __init__(self, history: int = TASK_HISTORY):
+        """
+        Initialize the registry.
+
+        Args:
+            history (int): Number of finished tasks kept.
+        """
+        self._lock = Lock()
+        self._next_id = 1
+        self._records: Dict[asyncio.Task, TaskRecord] = {}
+        self._running: Dict[int, TaskRecord] = {}
+        self._recent: Deque[TaskRecord] = deque(maxlen=history)
+        self._operations: Dict[str, Dict[str, Any]] = {}
+        self._since = time.time()
+
+    def track(
+        self,
+        task: asyncio.Task,
+        name: str,
+        operation: str,
+        executor: Optional[str] = None,
+    ) -> TaskRecord:
+        """
+        Start recording a task; the record is closed when the task is done.
+
+        Args:
+            task (asyncio.Task): The task.
+            name (str): The task's name.
+            operation (str): Grouping key for histograms.
+            executor (str, optional): Executor the task's work runs on.
+        Returns:
+            TaskRecord: The new record.
+        """
+        with self._lock:
+            record = TaskRecord(self._next_id, name, operation, executor)
+            self._next_id += 1
+            self._records[task] = record
+            self._running[record.id] = record
+        task.add_done_callback(self._finish)
+        return record
+
+    def record_for(self, task: asyncio.Task) -> Optional[TaskRecord]:
+        """Return the record of a running task, if it is tracked."""
+        return self._records.get(task)
+
+    def thread_started(self, record: TaskRecord) -> None:
+        """Mark that a worker thread picked up the record's work."""
+        with self._lock:
+            record.thread_started = time.perf_counter()
+
+    def thread_finished(self, record: TaskRecord) -> None:
+        """Mark that the worker thread returned; releases orphaned records."""
+        with self._lock:
+            record.thread_finished = time.perf_counter()
+            if record.finished is not None:
+                self._running.pop(record.id, None)
+
+    def _finish(self, task: asyncio.Task) -> None:
+        """Close a task's record and add it to the histograms."""
+        if task.cancelled():
+            outcome, error = "cancelled", None
+        else:
+            exc = task.exception()
+            if exc is None:
+                outcome, error = "ok", None
+            elif isinstance(exc, (TimeoutError, asyncio.TimeoutError)):
+                outcome, error = "timeout", None
+            else:
+                outcome, error = "error", (str(exc) or type(exc).__name__)[:300]
+        with self._lock:
+            record = self._records.pop(task, None)
+            if record is None:
+                return
+            record.finished = time.perf_counter()
+            record.outcome = outcome
+            record.error = error
+            if record.state == "done":
+                self._running.pop(record.id, None)
+            self._recent.append(record)
+            self._add_to_histograms(record)
+
+    def _add_to_histograms(self, record: TaskRecord) -> None:
+        """Count a finished record in its operation's histograms (lock held)."""
+        entry = self._operations.get(record.operation)
+        if entry is None:
+            entry = self._operations[record.operation] = {
+                "count": 0,
+                "outcomes": {outcome: 0 for outcome in TASK_OUTCOMES},
+                "total_ms": 0.0,
+                "max_ms": 0.0,
+                "latency_ms": {},
+                "queue_wait_ms": {},
+            }
+        elapsed = _ms(record.created, record.finished)
+        entry["count"] += 1
+        entry["outcomes"][record.outcome] += 1
+        entry["total_ms"] = round(entry["total_ms"] + elapsed, 1)
+        entry["max_ms"] = max(entry["max_ms"], elapsed)
+        label = _bucket_label(elapsed)
+        entry["latency_ms"][label] = entry["latency_ms"].get(label, 0) + 1
+        wait = record.queue_wait_ms(record.finished)
+        if wait is not None:
+            label = _bucket_label(wait)
+            entry["queue_wait_ms"][label] = entry["queue_wait_ms"].get(label, 0) + 1
+
+    def running(self) -> List[Dict[str, Any]]:
+        """Return unfinished and orphaned tasks, longest running first."""
+        now = time.perf_counter()
+        with self._lock:
+            records = [record.to_dict(now) for record in self._running.values()]
+        records.sort(key=lambda record: record["elapsed_ms"] or 0, reverse=True)
+        return records
+
+    def recent(self, limit: int = 20) -> List[Dict[str, Any]]:
+        """Return the most recently finished tasks, newest first."""
+        now = time.perf_counter()
+        with self._lock:
+            records = list(self._recent)[-limit:] if limit > 0 else []
+            return [record.to_dict(now) for record in reversed(records)]
+
+    def histograms(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-operation counts, outcomes and latency histograms."""
+        with self._lock:
+            report = {}
+            for operation, entry in self._operations.items():
+                report[operation] = {
+                    **entry,
+                    "outcomes": dict(entry["outcomes"]),
+                    "avg_ms": round(entry["total_ms"] / entry["count"], 1),
+                    "latency_ms": self._ordered(entry["latency_ms"]),
+                    "queue_wait_ms": self._ordered(entry["queue_wait_ms"]),
+                }
+            return report
+
+    @staticmethod
+    def _ordered(histogram: Dict[str, int]) -> Dict[str, int]:
+        """Order histogram buckets from fastest to slowest."""
+        labels = [f"<={bound}" for bound in LATENCY_BUCKETS_MS]
+        labels.append(f">{LATENCY_BUCKETS_MS[-1]}")
+        return {label: histogram[label] for label in labels if label in histogram}
+
+    def stats(self) -> Dict[str, Any]:
+        """Return the number of running and remembered tasks."""
+        with self._lock:
+            return {
+                "running_count": len(self._running),
+                "recent_count": len(self._recent),
+                "tracked_total": self._next_id - 1,
+                "since": self._since,
+            }
+
+    def clear(self) -> None:
+        """Forget finished tasks and histograms; running tasks stay listed."""
+        with self._lock:
+            self._recent.clear()
+            self._operations.clear()
+            self._since = time.time()
+
+
+# Shared registry for the whole server process
+task_registry = TaskRegistry()
+
 
 def create_tracked_task(
     coro: Coroutine[Any, Any, T],
     timeout: Optional[float] = 60.0,
     name: Optional[str] = None,
+    operation: Optional[str] = None,
+    executor: Optional[str] = None,
 ) -> asyncio.Task[T]:
     """
     Create and track an asyncio task with timeout.
@@ -37,10 +331,15 @@ def create_tracked_task(
         coro: The coroutine to run as a task
         timeout: Optional timeout in seconds (default: 60s)
         name: Optional name for the task for better debugging
+        operation: Optional grouping key for the task registry's histograms
+            (default: the coroutine's qualified name)
+        executor: Executor the task's blocking work runs on, if any
 
     Returns:
         The created task object
     """
+    operation = operation or _operation_name(coro)
+
     # Apply timeout if specified
     if timeout:
         coro = asyncio.wait_for(coro, timeout)
@@ -51,6 +350,7 @@ def create_tracked_task(
     # Register the task for tracking
     active_tasks.add(task)
     task.add_done_callback(active_tasks.discard)
+    task_registry.track(task, task.get_name(), operation, executor)
 
     return task
 
@@ -60,16 +360,24 @@ async def run_in_thread(
     *args: Any,
     timeout: Optional[float] = 60.0,
     name: Optional[str] = None,
+    executor: str = EXECUTOR_ARM,
+    priority: int = PRIORITY_NORMAL,
     **kwargs: Any,
 ) -> R:
     """
-    Run a blocking function in a thread pool with task tracking.
+    Run a blocking function on a named executor with task tracking.
+
+    The task registry records how long the call waited for a thread and how
+    long the thread ran it.
 
     Args:
         func: The blocking function to run
         *args: Positional arguments to pass to the function
         timeout: Optional timeout in seconds (default: 60s)
         name: Optional name for the task for better debugging
+        executor: Executor to run on: 'query', 'arm', 'graph' or 'cpu'
+            (default: 'arm')
+        priority: Queue priority, lower runs first (default: PRIORITY_NORMAL)
         **kwargs: Keyword arguments to pass to the function
 
     Returns:
@@ -77,12 +385,22 @@ async def run_in_thread(
 
     Raises:
         asyncio.TimeoutError: If the operation times out
+        ExecutorBusyError: If the executor's queue is full
         Exception: Any exception raised by the function
     """
+    record: Optional[TaskRecord] = None
+
+    def timed_call():
+        # Runs in the worker thread, after the task below has been created
+        task_registry.thread_started(record)
+        try:
+            return func(*args, **kwargs)
+        finally:
+            task_registry.thread_finished(record)
 
     async def thread_task():
         try:
-            return await asyncio.to_thread(func, *args, **kwargs)
+            return await run_in_executor(executor, timed_call, priority=priority)
         except asyncio.CancelledError:
             logger.warning("Thread operation '%s' was cancelled", name)
             raise
@@ -90,7 +408,14 @@ async def run_in_thread(
             logger.error("Error in thread operation '%s': %s", name, str(e))
             raise
 
-    task = create_tracked_task(thread_task(), timeout=timeout, name=name)
+    task = create_tracked_task(
+        thread_task(),
+        timeout=timeout,
+        name=name,
+        operation=_operation_name(func),
+        executor=executor,
+    )
+    record = task_registry.record_for(task)
     return await task
 
 
@@ -0,0 +1,155 @@
+"""
+FILE: utilities/timespan.py
+DESCRIPTION:
+    Timespan parsing for query tools.
+
+    Accepted forms (case-insensitive, surrounding whitespace ignored):
+
+    - Relative shorthand, optionally compound: '30m', '12h', '7d', '2w',
+      '1d12h', '1h30m15s'.
+    - ISO 8601 durations without calendar units: 'PT6H', 'P1DT12H', 'P2W'.
+    - Absolute ranges 'start/end' with ISO 8601 timestamps, or 'start/duration'
+      and 'duration/end' with either duration form above. Timestamps
+      without an offset are taken as UTC.
+
+    Relative forms parse to a timedelta (a window ending now) and ranges to
+    a (start, end) tuple of aware datetimes, both accepted by the Azure
+    Monitor query SDK. Parsed values are memoized in an LRU cache, since the
+    same handful of timespans is used over and over.
+"""
+
+import re
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Tuple, Union
+
+Timespan = Union[timedelta, Tuple[datetime, datetime]]
+
+# Log Analytics retains at most 12 years of data; longer windows are typos
+MAX_WINDOW = timedelta(days=12 * 366)
+
+_UNIT_SECONDS = {"w": 604800, "d": 86400, "h": 3600, "m": 60, "s": 1}
+_SHORTHAND_RE = re.compile(r"^(?:\d+[wdhms])+$")
+_SHORTHAND_PART_RE = re.compile(r"(\d+)([wdhms])")
+_ISO_DURATION_RE = re.compile(
+    r"^P(?:(?P<w>\d+)W)?(?:(?P<d>\d+)D)?"
+    r"(?:T(?:(?P<h>\d+(?:\.\d+)?)H)?(?:(?P<m>\d+(?:\.\d+)?)M)?"
+    r"(?:(?P<s>\d+(?:\.\d+)?)S)?)?$"
+)
+_ISO_CALENDAR_RE = re.compile(r"^P(?:\d+Y)|^P(?:\d+Y)?\d+M")
+
+
+def _parse_duration(text: str) -> timedelta:
+    """Parse shorthand or ISO 8601 duration text (already lower-cased)."""
+    if _SHORTHAND_RE.match(text):
+        seconds = sum(
+            int(value) * _UNIT_SECONDS[unit]
+            for value, unit in _SHORTHAND_PART_RE.findall(text)
+        )
+        return timedelta(seconds=seconds)
+    upper = text.upper()
+    if _ISO_CALENDAR_RE.match(upper):
+        raise ValueError(
+            "year and month durations are ambiguous; use days or weeks instead"
+        )
+    match = _ISO_DURATION_RE.match(upper)
+    if match and upper not in ("P", "PT") and not upper.endswith("T"):
+        parts = {unit: float(value or 0) for unit, value in match.groupdict().items()}
+        return timedelta(
+            weeks=parts["w"],
+            days=parts["d"],
+            hours=parts["h"],
+            minutes=parts["m"],
+            seconds=parts["s"],
+        )
+    raise ValueError(f"unrecognized duration '{text}'")
+
+
+def _parse_timestamp(text: str) -> datetime:
+    """Parse an ISO 8601 timestamp, defaulting to UTC."""
+    try:
+        # fromisoformat() before Python 3.11 does not accept a 'Z' suffix
+        value = datetime.fromisoformat(re.sub(r"[zZ]$", "+00:00", text))
+    except ValueError:
+        raise ValueError(f"unrecognized timestamp '{text}'") from None
+    return value if value.tzinfo else value.replace(tzinfo=timezone.utc)
+
+
+@lru_cache(maxsize=256)
+def _parse(text: str) -> Timespan:
+    """Parse normalized timespan text; see parse_timespan."""
+    if "/" in text:
+        left, _, right = text.partition("/")
+        left, right = left.strip(), right.strip()
+        if left.startswith("p"):
+            end = _parse_timestamp(right)
+            start = end - _parse_duration(left)
+        else:
+            start = _parse_timestamp(left)
+            if right.startswith("p") or _SHORTHAND_RE.match(right):
+                end = start + _parse_duration(right)
+            else:
+                end = _parse_timestamp(right)
+        if end <= start:
+            raise ValueError("the range end must be after its start")
+        if end - start > MAX_WINDOW:
+            raise ValueError("the range is longer than the retention limit")
+        return (start, end)
+    window = _parse_duration(text)
+    if window <= timedelta(0):
+        raise ValueError("the window must be longer than zero")
+    if window > MAX_WINDOW:
+        raise ValueError("the window is longer than the retention limit")
+    return window
+
+
+def parse_timespan(text: str) -> Timespan:
+    """
+    Parse a timespan parameter.
+
+    Args:
+        text (str): e.g. '1d', '1d12h', 'PT6H' or
+            '2026-01-01T00:00:00Z/2026-01-02T00:00:00Z'.
+    Returns:
+        timedelta or tuple: A relative window, or a (start, end) range.
+    Raises:
+        ValueError: If the text is not a valid timespan.
+    """
+    if not isinstance(text, str) or not text.strip():
+        raise ValueError("timespan must be a non-empty string")
+    return _parse(text.strip().lower())
+
+
+def timespan_window(timespan: Timespan) -> timedelta:
+    """Return the length of a parsed timespan."""
+    if isinstance(timespan, tuple):
+        return timespan[1] - timespan[0]
+    return timespan
+
+
+def describe_timespan(timespan: Timespan) -> str:
+    """
+    Describe a parsed timespan for messages.
+
+    Returns:
+        str: e.g. 'in the last 30 days', 'in the last 1 day 12 hours' or
+        'between 2026-01-01T00:00:00+00:00 and 2026-01-02T00:00:00+00:00'.
+    """
+    if isinstance(timespan, tuple):
+        return f"between {timespan[0].isoformat()} and {timespan[1].isoformat()}"
+    remaining = int(timespan.total_seconds())
+    parts = []
+    for name, seconds in (("day", 86400), ("hour", 3600), ("minute", 60)):
+        count, remaining = divmod(remaining, seconds)
+        if count:
+            parts.append(f"{count} {name}{'s' if count != 1 else ''}")
+    if remaining or not parts:
+        parts.append(f"{remaining} second{'s' if remaining != 1 else ''}")
+    return f"in the last {' '.join(parts)}"
+
+
+def timespan_bounds(timespan: Timespan, now: datetime) -> Tuple[datetime, datetime]:
+    """Return the (start, end) range of a parsed timespan as seen at 'now'."""
+    if isinstance(timespan, tuple):
+        return timespan
+    return (now - timespan, now)
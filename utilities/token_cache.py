@@ -0,0 +1,192 @@
+"""
+FILE: utilities/token_cache.py
+DESCRIPTION:
+    Expiry-aware, scope-keyed bearer token cache for Azure credentials.
+
+    Tokens are cached per credential and scope (ARM, Microsoft Graph, ...).
+    A token that is close to expiry is still served while a single
+    background thread refreshes it, so callers only block when no usable
+    token exists. Concurrent callers for the same scope share one upstream
+    token request (single-flight).
+"""
+
+import logging
+import threading
+import time
+import weakref
+from typing import Any, Dict, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+# Refresh proactively when a token has less than this many seconds left
+REFRESH_MARGIN_SECONDS = 300
+# Never hand out a token with less than this many seconds left
+MIN_VALIDITY_SECONDS = 30
+
+
+class TokenCache:
+    """
+    Thread-safe token cache for a single credential.
+
+    Use get_token() from worker threads. On the event loop, peek() returns a
+    usable cached token without blocking, so only a real fetch needs a thread.
+    """
+
+    def __init__(self, credential, refresh_margin: int = REFRESH_MARGIN_SECONDS):
+        """
+        Initialize the token cache.
+
+        Args:
+            credential: An azure-identity credential exposing get_token(scope).
+            refresh_margin (int): Seconds before expiry at which a background
+                refresh is started.
+        """
+        # Weak, so that the cache does not keep its own registry key alive
+        self._credential = weakref.ref(credential)
+        self.refresh_margin = refresh_margin
+        self._lock = threading.Lock()
+        self._entries: Dict[str, Any] = {}
+        self._scope_locks: Dict[str, threading.Lock] = {}
+        self._refreshing: Set[str] = set()
+        self._stats = {"hits": 0, "fetches": 0, "background_refreshes": 0}
+
+    @property
+    def credential(self):
+        """The credential tokens are fetched from (None once it is collected)."""
+        return self._credential()
+
+    def _scope_lock(self, scope: str) -> threading.Lock:
+        with self._lock:
+            lock = self._scope_locks.get(scope)
+            if lock is None:
+                lock = threading.Lock()
+                self._scope_locks[scope] = lock
+            return lock
+
+    def _usable(self, scope: str) -> Optional[str]:
+        """
+        Return a cached token that can be served right now, or None.
+
+        Schedules a background refresh when the token is inside the refresh
+        margin but still valid.
+        """
+        entry = self._entries.get(scope)
+        if entry is None:
+            return None
+        remaining = entry.expires_on - time.time()
+        if remaining <= MIN_VALIDITY_SECONDS:
+            return None
+        if remaining <= self.refresh_margin:
+            self._refresh_in_background(scope)
+        with self._lock:
+            self._stats["hits"] += 1
+        return entry.token
+
+    def _fetch(self, scope: str) -> str:
+        """Fetch a token upstream and store it (caller holds the scope lock)."""
+        credential = self.credential
+        if credential is None:
+            raise RuntimeError("Credential for this token cache has been released")
+        access_token = credential.get_token(scope)
+        self._entries[scope] = access_token
+        with self._lock:
+            self._stats["fetches"] += 1
+        logger.debug(
+            "Acquired token for %s (expires in %ds)",
+            scope,
+            int(access_token.expires_on - time.time()),
+        )
+        return access_token.token
+
+    def _refresh_in_background(self, scope: str) -> None:
+        """Start one background refresh for the scope if none is running."""
+        with self._lock:
+            if scope in self._refreshing:
+                return
+            self._refreshing.add(scope)
+            self._stats["background_refreshes"] += 1
+
+        def refresh():
+            try:
+                with self._scope_lock(scope):
+                    entry = self._entries.get(scope)
+                    if (
+                        entry is None
+                        or entry.expires_on - time.time() <= self.refresh_margin
+                    ):
+                        self._fetch(scope)
+            except Exception as e:
+                # The current token is still valid; the next caller will retry
+                logger.warning("Background token refresh for %s failed: %s", scope, e)
+            finally:
+                with self._lock:
+                    self._refreshing.discard(scope)
+
+        threading.Thread(
+            target=refresh, name=f"token-refresh-{scope}", daemon=True
+        ).start()
+
+    def peek(self, scope: str) -> Optional[str]:
+        """
+        Return a usable cached token without ever contacting the credential.
+
+        Args:
+            scope (str): The token scope.
+        Returns:
+            Optional[str]: The cached token, or None if a fetch is required.
+        """
+        return self._usable(scope)
+
+    def get_token(self, scope: str) -> str:
+        """
+        Return a valid token for the scope, fetching it only if necessary.
+
+        Concurrent callers for the same scope wait for a single fetch.
+
+        Args:
+            scope (str): The token scope.
+        Returns:
+            str: The bearer token.
+        """
+        token = self._usable(scope)
+        if token:
+            return token
+        with self._scope_lock(scope):
+            # Another caller may have fetched it while we were waiting
+            token = self._usable(scope)
+            if token:
+                return token
+            return self._fetch(scope)
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/fetch counters and remaining lifetime per scope."""
+        now = time.time()
+        with self._lock:
+            stats = dict(self._stats)
+        stats["scopes"] = {
+            scope: int(entry.expires_on - now) for scope, entry in self._entries.items()
+        }
+        return stats
+
+
+# Keyed by the credential itself and dropped with it, so a released
+# credential's tokens can never be served for a new object at the same id()
+_caches: "weakref.WeakKeyDictionary[Any, TokenCache]" = weakref.WeakKeyDictionary()
+_caches_lock = threading.Lock()
+
+
+def token_cache_for(credential) -> TokenCache:
+    """
+    Return the process-wide TokenCache for a credential.
+
+    Args:
+        credential: An azure-identity credential.
+    Returns:
+        TokenCache: The cache shared by all clients using this credential.
+    """
+    with _caches_lock:
+        cache = _caches.get(credential)
+        if cache is None:
+            cache = TokenCache(credential)
+            _caches[credential] = cache
+        return cache
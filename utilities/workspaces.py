@@ -0,0 +1,119 @@
+"""
+FILE: utilities/workspaces.py
+DESCRIPTION:
+    Configuration and result merging for multi-workspace (fan-out) queries.
+
+    The primary workspace comes from AZURE_WORKSPACE_ID. Additional
+    workspaces are listed in AZURE_WORKSPACE_IDS as comma-separated
+    entries, each either a workspace ID or 'alias=workspace-id'. Queries
+    can then run against several workspaces concurrently and their rows
+    are merged, each tagged with the alias of its source workspace.
+"""
+
+from typing import Any, Dict, List, Tuple
+
+from utilities.kql_slicing import MergedTable
+
+# Column added to fan-out results naming the row's source workspace
+WORKSPACE_COLUMN = "_workspace"
+
+
+def parse_workspaces(
+    primary_id: str, primary_name: str = "", extra: str = ""
+) -> Dict[str, str]:
+    """
+    Build the alias -> workspace ID map of queryable workspaces.
+
+    Args:
+        primary_id (str): The primary workspace ID (AZURE_WORKSPACE_ID).
+        primary_name (str): Alias for the primary workspace (its name);
+            'primary' if empty.
+        extra (str): Additional workspaces (AZURE_WORKSPACE_IDS), comma
+            separated, each 'workspace-id' or 'alias=workspace-id'.
+    Returns:
+        dict: Workspace aliases mapped to IDs, primary first.
+    """
+    workspaces: Dict[str, str] = {}
+    if primary_id:
+        workspaces[primary_name or "primary"] = primary_id
+    for entry in (extra or "").split(","):
+        entry = entry.strip()
+        if not entry:
+            continue
+        alias, _, workspace_id = entry.rpartition("=")
+        alias, workspace_id = alias.strip(), workspace_id.strip()
+        if workspace_id in workspaces.values():
+            continue
+        workspaces[alias or workspace_id] = workspace_id
+    return workspaces
+
+
+def resolve_workspaces(
+    requested: Any, configured: Dict[str, str]
+) -> List[Tuple[str, str]]:
+    """
+    Resolve a 'workspaces' tool parameter against the configured workspaces.
+
+    Args:
+        requested: 'all', a comma-separated string or a list of aliases or IDs.
+        configured (dict): Alias -> workspace ID map from parse_workspaces.
+    Returns:
+        list: (alias, workspace ID) pairs, without duplicates.
+    Raises:
+        ValueError: If a requested workspace is not configured.
+    """
+    if isinstance(requested, str):
+        if requested.strip().lower() == "all":
+            return list(configured.items())
+        requested = requested.split(",")
+    by_id = {workspace_id: alias for alias, workspace_id in configured.items()}
+    targets: List[Tuple[str, str]] = []
+    for item in requested or []:
+        item = str(item).strip()
+        if item in configured:
+            target = (item, configured[item])
+        elif item in by_id:
+            target = (by_id[item], item)
+        else:
+            raise ValueError(
+                f"Unknown workspace '{item}'. Configured workspaces: "
+                f"{', '.join(configured) or 'none'}"
+            )
+        if target not in targets:
+            targets.append(target)
+    return targets
+
+
+def merge_workspace_tables(tagged: List[Tuple[str, Any]]) -> MergedTable:
+    """
+    Merge per-workspace result tables, tagging each row with its workspace.
+
+    Columns are matched by name; a column missing from one workspace's
+    result is null in that workspace's rows.
+
+    Args:
+        tagged (list): (alias, LogsTable) pairs in workspace order.
+    Returns:
+        MergedTable: The merged table with WORKSPACE_COLUMN first.
+    """
+    names: List[Any] = [WORKSPACE_COLUMN]
+    types: List[str] = ["string"]
+    index: Dict[Any, int] = {}
+    for _, table in tagged:
+        column_types = getattr(table, "column_types", None) or []
+        for idx, col in enumerate(table.columns):
+            name = getattr(col, "name", col)
+            if name not in index:
+                index[name] = len(names)
+                names.append(name)
+                types.append(column_types[idx] if idx < len(column_types) else "string")
+    rows = []
+    for alias, table in tagged:
+        positions = [index[getattr(col, "name", col)] for col in table.columns]
+        for row in table.rows:
+            merged = [None] * len(names)
+            merged[0] = alias
+            for position, value in zip(positions, row):
+                merged[position] = value
+            rows.append(merged)
+    return MergedTable(names, types, rows)